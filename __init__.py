@@ -16,11 +16,43 @@ bl_info = {
 # 模块列表
 modules_to_load = [
     ".config.bone_config",
+    ".config.settings",
+    ".config.node_groups",
+    ".config.spring_config",
+    ".config.retarget_config",
+    ".utils.curve_shapes",
+    ".utils.bone_rules",
+    ".utils.bone_resolver",
+    ".utils.pose_math",
+    ".utils.profiling",
+    ".utils.display_state",
+    ".utils.playback_mode",
+    ".utils.node_builder",
+    ".utils.texture_slots",
+    ".utils.keyframes",
+    ".utils.expression_index",
+    ".utils.atlas_cells",
+    ".utils.spring_bake",
+    ".utils.visual_bake",
+    ".utils.retarget",
+    ".utils.pose_store",
+    ".utils.asset_library",
     ".operators.generate_controllers",
     ".operators.optimize_skeleton_display",
     ".operators.revert_skeleton_display",
+    ".operators.display_presets",
+    ".operators.profile_playback",
     ".operators.create_shader_nodes",
+    ".operators.apply_position_nodes",
+    ".operators.expression_index",
+    ".operators.atlas_picker",
+    ".operators.bake_springs",
+    ".operators.bake_visual",
+    ".operators.retarget",
+    ".operators.pose_library",
+    ".operators.asset_library",
     ".ui.main_panel",
+    ".ui.atlas_picker_panel",
 ]
 
 loaded_modules = []
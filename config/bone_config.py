@@ -14,6 +14,26 @@ ControllerConfig = namedtuple(
 
 ROAT_90 = 1.5708
 
+# 按骨骼所在一侧使用的颜色
+BONE_SIDE_COLORS = {
+    "Left": (0.0, 1.0, 1.0),  # Cyan
+    "Right": (1.0, 1.0, 0.0),  # Yellow
+    "Center": (1.0, 0.0, 1.0),  # Magenta
+}
+ACTIVE_BONE_COLOR = (1.0, 0.0, 0.0)  # Red
+
+# 优化骨骼显示时隐藏的骨骼：所有以此结尾的骨骼，以及下面列出的耳朵骨骼
+HIDDEN_BONE_SUFFIX = "_Handle"
+HIDDEN_BONE_NAMES = [
+    "Sp_He_Ear0_R_01",
+    "Sp_He_Ear0_R_02",
+    "Sp_He_Ear0_L_01",
+    "Sp_He_Ear0_L_02",
+]
+
+# bone_name 可以是精确的骨骼名（_R/_L 同时匹配 .R/.L），
+# 也可以是通配符（如 "Sp_Hi_Tail0_*"）或以 "re:" 开头的正则表达式。
+# 精确名称优先于模式；多个模式都匹配时使用排在前面的配置。
 BONE_CONFIGS = [
     ControllerConfig(
         bone_name="Head",
@@ -320,15 +340,3 @@ BONE_CONFIGS = [
         shape_rotation_euler=(ROAT_90, 0, 0),
     ),
 ]
-
-# Adapt to bones ending with .R/.L instead of _R/_L
-new_configs = []
-for config in BONE_CONFIGS:
-    if config.bone_name.endswith("_R"):
-        new_name = config.bone_name[:-2] + ".R"
-        new_configs.append(config._replace(bone_name=new_name))
-    elif config.bone_name.endswith("_L"):
-        new_name = config.bone_name[:-2] + ".L"
-        new_configs.append(config._replace(bone_name=new_name))
-
-BONE_CONFIGS.extend(new_configs)
@@ -0,0 +1,213 @@
+from collections import namedtuple
+
+# 节点组接口上的一个插槽
+SocketSpec = namedtuple(
+    "SocketSpec", ["name", "in_out", "socket_type", "default"], defaults=[None]
+)
+
+# 一个节点；inputs 把输入插槽的索引或名称映射到默认值，
+# properties 是需要设置的节点属性（例如 operation）
+NodeSpec = namedtuple(
+    "NodeSpec",
+    ["key", "type", "label", "location", "properties", "inputs"],
+    defaults=["", (0, 0), {}, {}],
+)
+
+# 一条连线：(起点节点, 输出插槽, 终点节点, 输入插槽)
+LinkSpec = namedtuple("LinkSpec", ["from_node", "from_socket", "to_node", "to_socket"])
+
+NodeGroupSpec = namedtuple("NodeGroupSpec", ["name", "sockets", "nodes", "links"])
+
+
+def position_group_spec(name: str, y_offset: float) -> NodeGroupSpec:
+    """按编号在 4 列图集中偏移 UV 的节点组"""
+    return NodeGroupSpec(
+        name=name,
+        sockets=[
+            SocketSpec("编号", "INPUT", "NodeSocketInt", 1),
+            SocketSpec("矢量", "INPUT", "NodeSocketVector"),
+            SocketSpec("矢量", "OUTPUT", "NodeSocketVector"),
+        ],
+        nodes=[
+            NodeSpec("input", "NodeGroupInput", location=(-800, 0)),
+            NodeSpec("output", "NodeGroupOutput", location=(600, 0)),
+            NodeSpec(
+                "相减",
+                "ShaderNodeMath",
+                "相减",
+                (-600, 100),
+                {"operation": "SUBTRACT"},
+                {1: 1.0},
+            ),
+            NodeSpec(
+                "列号",
+                "ShaderNodeMath",
+                "列号",
+                (-400, 200),
+                {"operation": "MODULO"},
+                {1: 4.0},
+            ),
+            NodeSpec(
+                "行号",
+                "ShaderNodeMath",
+                "行号",
+                (-400, 0),
+                {"operation": "DIVIDE"},
+                {1: 4.0},
+            ),
+            NodeSpec(
+                "向下取整",
+                "ShaderNodeMath",
+                "向下取整",
+                (-200, 0),
+                {"operation": "FLOOR"},
+            ),
+            NodeSpec(
+                "X偏移",
+                "ShaderNodeMath",
+                "X偏移",
+                (-200, 200),
+                {"operation": "MULTIPLY"},
+                {1: 0.25},
+            ),
+            NodeSpec(
+                "Y偏移",
+                "ShaderNodeMath",
+                "Y偏移",
+                (0, 0),
+                {"operation": "MULTIPLY"},
+                {1: y_offset},
+            ),
+            NodeSpec(
+                "合并XYZ",
+                "ShaderNodeCombineXYZ",
+                "合并XYZ",
+                (200, 100),
+                inputs={2: 0.0},
+            ),
+            NodeSpec("映射", "ShaderNodeMapping", location=(400, 100)),
+        ],
+        links=[
+            LinkSpec("input", "编号", "相减", 0),
+            LinkSpec("相减", "Value", "列号", 0),
+            LinkSpec("相减", "Value", "行号", 0),
+            LinkSpec("行号", "Value", "向下取整", 0),
+            LinkSpec("列号", "Value", "X偏移", 0),
+            LinkSpec("向下取整", "Value", "Y偏移", 0),
+            LinkSpec("X偏移", "Value", "合并XYZ", "X"),
+            LinkSpec("Y偏移", "Value", "合并XYZ", "Y"),
+            LinkSpec("input", "矢量", "映射", "Vector"),
+            LinkSpec("合并XYZ", "Vector", "映射", "Location"),
+            LinkSpec("映射", "Vector", "output", "矢量"),
+        ],
+    )
+
+
+def compact_position_group_spec(name: str, y_offset: float) -> NodeGroupSpec:
+    """与 position_group_spec 结果相同（编号 >= 1），但只用 4 个矢量运算节点
+
+    设 u = (编号 - 1) / 4，则列偏移 0.25 * 列号 = u - floor(u)，行偏移为
+    y_offset * floor(u)。编号接入矢量插槽时自动扩展为 (编号, 编号, 编号)：
+        A = 编号 * (0.25, 0.25, 0) + (-0.25, -0.25, 0) = (u, u, 0)
+        B = floor(A) = (floor(u), floor(u), 0)
+        C = B * (-1, y_offset, 0) + 矢量
+        输出 = A * (1, 0, 0) + C
+    """
+    return NodeGroupSpec(
+        name=name,
+        sockets=[
+            SocketSpec("编号", "INPUT", "NodeSocketInt", 1),
+            SocketSpec("矢量", "INPUT", "NodeSocketVector"),
+            SocketSpec("矢量", "OUTPUT", "NodeSocketVector"),
+        ],
+        nodes=[
+            NodeSpec("input", "NodeGroupInput", location=(-600, 0)),
+            NodeSpec("output", "NodeGroupOutput", location=(400, 0)),
+            NodeSpec(
+                "行列",
+                "ShaderNodeVectorMath",
+                "行列",
+                (-400, 100),
+                {"operation": "MULTIPLY_ADD"},
+                {1: (0.25, 0.25, 0.0), 2: (-0.25, -0.25, 0.0)},
+            ),
+            NodeSpec(
+                "向下取整",
+                "ShaderNodeVectorMath",
+                "向下取整",
+                (-200, 100),
+                {"operation": "FLOOR"},
+            ),
+            NodeSpec(
+                "行偏移",
+                "ShaderNodeVectorMath",
+                "行偏移",
+                (0, 0),
+                {"operation": "MULTIPLY_ADD"},
+                {1: (-1.0, y_offset, 0.0)},
+            ),
+            NodeSpec(
+                "列偏移",
+                "ShaderNodeVectorMath",
+                "列偏移",
+                (200, 0),
+                {"operation": "MULTIPLY_ADD"},
+                {1: (1.0, 0.0, 0.0)},
+            ),
+        ],
+        links=[
+            LinkSpec("input", "编号", "行列", 0),
+            LinkSpec("行列", "Vector", "向下取整", 0),
+            LinkSpec("向下取整", "Vector", "行偏移", 0),
+            LinkSpec("input", "矢量", "行偏移", 2),
+            LinkSpec("行列", "Vector", "列偏移", 0),
+            LinkSpec("行偏移", "Vector", "列偏移", 2),
+            LinkSpec("列偏移", "Vector", "output", "矢量"),
+        ],
+    )
+
+
+# (名称, 每行的 V 偏移)
+EYE_OR_MOUTH_POSITION = ("眼睛/嘴巴位置", -0.125)
+EYELASH_POSITION = ("睫毛位置", -0.25)
+
+# 图集固定为 4 列，行数由每行的 V 偏移决定；编号 1 是左上角的格子
+ATLAS_COLUMNS = 4
+ATLAS_ROWS = {
+    name: round(-1 / y_offset)
+    for name, y_offset in (EYE_OR_MOUTH_POSITION, EYELASH_POSITION)
+}
+
+EYE_OR_MOUTH_POSITION_GROUP = position_group_spec(*EYE_OR_MOUTH_POSITION)
+EYELASH_POSITION_GROUP = position_group_spec(*EYELASH_POSITION)
+
+NODE_GROUP_SPECS = [EYE_OR_MOUTH_POSITION_GROUP, EYELASH_POSITION_GROUP]
+
+# 同名、同接口的精简版本，切换版本时节点组按哈希原地重建。目前只有
+# scripts/benchmark_shader_compile.py 使用；测得 EEVEE 编译和首帧渲染确有
+# 提升之前不在界面或批处理中提供选项
+COMPACT_EYE_OR_MOUTH_POSITION_GROUP = compact_position_group_spec(
+    *EYE_OR_MOUTH_POSITION
+)
+COMPACT_EYELASH_POSITION_GROUP = compact_position_group_spec(*EYELASH_POSITION)
+
+COMPACT_NODE_GROUP_SPECS = [
+    COMPACT_EYE_OR_MOUTH_POSITION_GROUP,
+    COMPACT_EYELASH_POSITION_GROUP,
+]
+
+
+def position_group_specs(compact: bool = False) -> list:
+    """返回 [眼睛/嘴巴, 睫毛] 两个位置节点组规格"""
+    return COMPACT_NODE_GROUP_SPECS if compact else NODE_GROUP_SPECS
+
+
+# 图像纹理节点所属的面部贴图槽：(槽位, 位置节点组名, 关键字)
+# 按顺序检查，先匹配的槽位优先。关键字是正则表达式，不区分大小写，只匹配
+# 节点名、标签、图像名和图像文件名中以 _ - . 空格分隔的独立片段，
+# 因此 eyebrow、eyehi00（眼睛高光）等贴图不会被识别为眼睛。
+FACE_TEXTURE_SLOTS = [
+    ("EYELASH", EYELASH_POSITION[0], (r"eyelash\d*", "睫毛")),
+    ("EYE", EYE_OR_MOUTH_POSITION[0], (r"eye\d*", r"眼睛?\d*")),
+    ("MOUTH", EYE_OR_MOUTH_POSITION[0], (r"mouth\d*", r"嘴巴?\d*")),
+]
@@ -0,0 +1,78 @@
+# 动作重定向的骨骼映射表：源骨骼名 -> 赛马娘骨骼名
+# 赛马娘骨骼名按 _R/_L 书写，目标骨架使用 .R/.L 时会自动匹配。
+# 源骨骼名中 ":" 之前的前缀（例如 "mixamorig:"）会被忽略。
+
+# 根骨骼：它的位移按腿长比例缩放后一起重定向
+RETARGET_ROOT_BONE = "Hip"
+
+_MMD_CENTER = {
+    "下半身": "Hip",
+    "上半身": "Spine",
+    "上半身2": "Chest",
+    "首": "Neck",
+    "頭": "Head",
+}
+_MMD_SIDE = {
+    "肩": "Shoulder",
+    "腕": "Arm",
+    "ひじ": "Elbow",
+    "手首": "Wrist",
+    "親指０": "Thumb_01",
+    "親指１": "Thumb_02",
+    "親指２": "Thumb_03",
+    "人指１": "Index_01",
+    "人指２": "Index_02",
+    "人指３": "Index_03",
+    "薬指１": "Ring_01",
+    "薬指２": "Ring_02",
+    "薬指３": "Ring_03",
+    "足": "Thigh",
+    "ひざ": "Knee",
+    "足首": "Ankle",
+}
+
+_MIXAMO_CENTER = {
+    "Hips": "Hip",
+    "Spine": "Waist",
+    "Spine1": "Spine",
+    "Spine2": "Chest",
+    "Neck": "Neck",
+    "Head": "Head",
+}
+_MIXAMO_SIDE = {
+    "Shoulder": "Shoulder",
+    "Arm": "Arm",
+    "ForeArm": "Elbow",
+    "Hand": "Wrist",
+    "HandThumb1": "Thumb_01",
+    "HandThumb2": "Thumb_02",
+    "HandThumb3": "Thumb_03",
+    "HandIndex1": "Index_01",
+    "HandIndex2": "Index_02",
+    "HandIndex3": "Index_03",
+    "HandRing1": "Ring_01",
+    "HandRing2": "Ring_02",
+    "HandRing3": "Ring_03",
+    "UpLeg": "Thigh",
+    "Leg": "Knee",
+    "Foot": "Ankle",
+}
+
+RETARGET_MAPS = {
+    "MMD": {
+        **_MMD_CENTER,
+        **{
+            f"{side}{name}": f"{target}{suffix}"
+            for side, suffix in (("右", "_R"), ("左", "_L"))
+            for name, target in _MMD_SIDE.items()
+        },
+    },
+    "MIXAMO": {
+        **_MIXAMO_CENTER,
+        **{
+            f"{side}{name}": f"{target}{suffix}"
+            for side, suffix in (("Right", "_R"), ("Left", "_L"))
+            for name, target in _MIXAMO_SIDE.items()
+        },
+    },
+}
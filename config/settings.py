@@ -0,0 +1,51 @@
+import bpy
+
+
+class UMA_TOOL_PG_settings(bpy.types.PropertyGroup):
+    """赛马娘工具的场景设置"""
+
+    profiling_enabled: bpy.props.BoolProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="记录耗时",
+        description="在信息栏报告每个操作符各阶段的耗时",
+        default=False,
+    )
+    profiling_log_path: bpy.props.StringProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="日志文件",
+        description="以 JSONL 格式追加耗时记录，留空则不写入",
+        subtype="FILE_PATH",
+    )
+    profiling_use_cprofile: bpy.props.BoolProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="cProfile",
+        description="用 cProfile 运行操作符并保存 .prof 文件",
+        default=False,
+    )
+    profiling_output_dir: bpy.props.StringProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="分析输出目录",
+        description=".prof 文件的保存目录，留空则保存到临时目录",
+        subtype="DIR_PATH",
+    )
+    asset_library_dir: bpy.props.StringProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="共享资产库",
+        description=(
+            "位置节点组和控制器形状只生成一次保存到此目录的 .blend 中，"
+            "各文件链接使用；留空则在每个文件中创建本地副本"
+        ),
+        subtype="DIR_PATH",
+    )
+
+
+def get_settings(context):
+    """返回场景设置，插件未注册（例如后台批处理）时返回 None"""
+    return getattr(context.scene, "uma_tool_settings", None)
+
+
+def register():
+    bpy.utils.register_class(UMA_TOOL_PG_settings)
+    bpy.types.Scene.uma_tool_settings = bpy.props.PointerProperty(  # pyright: ignore[reportAttributeAccessIssue]
+        type=UMA_TOOL_PG_settings
+    )
+
+
+def unregister():
+    del bpy.types.Scene.uma_tool_settings  # pyright: ignore[reportAttributeAccessIssue]
+    bpy.utils.unregister_class(UMA_TOOL_PG_settings)
@@ -0,0 +1,21 @@
+from collections import namedtuple
+
+SpringConfig = namedtuple(
+    "SpringConfig",
+    [
+        "bone_name",  # 骨骼名、通配符或以 "re:" 开头的正则表达式
+        "stiffness",  # 每秒拉回动画姿态尾端的比例（1/秒），乘以帧间隔后不超过 1
+        "drag",  # 每帧速度衰减比例，0~1
+        "gravity",  # 沿世界 -Z 每秒下垂的距离（米/秒）
+    ],
+)
+
+# 烘焙动态骨骼时使用的链参数，按顺序匹配，前面的配置优先
+SPRING_CONFIGS = [
+    SpringConfig(bone_name="Sp_He_Ear*", stiffness=18.0, drag=0.6, gravity=0.0),
+    SpringConfig(bone_name="Sp_Hi_Tail*", stiffness=6.0, drag=0.3, gravity=0.2),
+    SpringConfig(bone_name="Sp_He_Hair*", stiffness=9.0, drag=0.4, gravity=0.1),
+    SpringConfig(bone_name="Sp_Ch_Bust*", stiffness=24.0, drag=0.7, gravity=0.0),
+    # 其余所有动态骨骼
+    SpringConfig(bone_name="Sp_*", stiffness=9.0, drag=0.4, gravity=0.1),
+]
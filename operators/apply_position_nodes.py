@@ -0,0 +1,132 @@
+import bpy
+from collections import namedtuple
+
+from ..config.node_groups import ATLAS_ROWS
+from ..utils.profiling import phase, profiled
+from ..utils.texture_slots import SLOT_KEY, TEXTURE_SLOT_INDEX
+from .create_shader_nodes import ensure_position_nodegroups, linked_assets
+
+ApplyResult = namedtuple(
+    "ApplyResult",
+    [
+        "materials",  # 插入了节点的材质数量
+        "inserted",  # 插入的位置节点组数量
+        "skipped",  # 已经接有位置节点组而跳过的贴图数量
+    ],
+)
+
+
+def character_materials(objects) -> list:
+    """返回物体（骨架则包括其所有子物体）使用的材质，去重并保持顺序"""
+    materials = {}
+    for obj in objects:
+        for member in [obj, *obj.children_recursive]:
+            for slot in getattr(member, "material_slots", ()):
+                material = slot.material
+                if material is not None and material.node_tree is not None:
+                    materials.setdefault(material.name_full, material)
+    return list(materials.values())
+
+
+def _insert_position_node(tree, texture, group, slot):
+    vector_input = texture.inputs["Vector"]
+    if vector_input.links:
+        source = vector_input.links[0].from_socket
+    else:
+        # 图像纹理未连接矢量时默认使用活动 UV
+        uv_node = tree.nodes.new("ShaderNodeTexCoord")
+        uv_node.location = (texture.location.x - 400, texture.location.y)
+        source = uv_node.outputs["UV"]
+
+    node = tree.nodes.new("ShaderNodeGroup")
+    node.node_tree = group
+    node.name = group.name
+    node.label = group.name
+    node.location = (texture.location.x - 200, texture.location.y)
+    node[SLOT_KEY] = slot.slot
+
+    tree.links.new(source, node.inputs["矢量"])
+    tree.links.new(node.outputs["矢量"], vector_input)
+    return node
+
+
+def _is_position_node(node) -> bool:
+    """按节点组名或槽位标记判断，本地副本和任何资产库中链接的节点组都算"""
+    if SLOT_KEY in node:
+        return True
+    group = getattr(node, "node_tree", None)
+    return group is not None and group.name in ATLAS_ROWS
+
+
+def apply_position_nodes(materials, compact: bool = False, assets=None) -> ApplyResult:
+    """在眼睛、嘴巴和睫毛贴图的 UV 输入前插入对应的位置节点组
+
+    已经由位置节点组驱动的贴图会被跳过，因此可以重复运行。给出 assets 时
+    使用从共享资产库链接的节点组。
+    """
+    with phase("节点组"):
+        groups = {
+            group.name: group for group in ensure_position_nodegroups(compact, assets)
+        }
+
+    material_count = 0
+    inserted = 0
+    skipped = 0
+    for material in materials:
+        tree = material.node_tree
+        textures = [node for node in tree.nodes if node.type == "TEX_IMAGE"]
+        changed = False
+        for texture in textures:
+            slot = TEXTURE_SLOT_INDEX.classify_node(texture)
+            if slot is None:
+                continue
+            links = texture.inputs["Vector"].links
+            if links and _is_position_node(links[0].from_node):
+                skipped += 1
+                continue
+            _insert_position_node(tree, texture, groups[slot.group_name], slot)
+            inserted += 1
+            changed = True
+        material_count += changed
+
+    return ApplyResult(materials=material_count, inserted=inserted, skipped=skipped)
+
+
+class UMA_TOOL_OT_apply_position_nodes(bpy.types.Operator):
+    """为所选角色的所有眼睛、嘴巴和睫毛贴图插入位置节点组"""
+
+    bl_idname = "uma_tool.apply_position_nodes"
+    bl_label = "批量插入位置节点"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(context.selected_objects)
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        try:
+            assets = linked_assets(context)
+        except OSError as e:
+            self.report({"ERROR"}, f"无法使用共享资产库：{e}")
+            return {"CANCELLED"}
+
+        with phase("收集材质"):
+            materials = character_materials(context.selected_objects)
+
+        result = apply_position_nodes(materials, assets=assets)
+
+        if not result.inserted:
+            self.report(
+                {"INFO"},
+                f"没有需要插入的贴图（{len(materials)} 个材质，"
+                f"{result.skipped} 个已连接位置节点组）。",
+            )
+            return {"FINISHED"}
+
+        self.report(
+            {"INFO"},
+            f"已在 {result.materials} 个材质中插入 {result.inserted} 个位置节点组，"
+            f"跳过 {result.skipped} 个已连接的贴图。",
+        )
+        return {"FINISHED"}
@@ -0,0 +1,41 @@
+import bpy
+
+from ..config.settings import get_settings
+from ..utils.asset_library import adopt_linked_assets
+from ..utils.profiling import phase, profiled
+from .create_shader_nodes import linked_assets
+
+
+class UMA_TOOL_OT_link_asset_library(bpy.types.Operator):
+    """从共享资产库链接位置节点组和控制器形状，并替换文件中的本地副本
+
+    资产库不存在或内容已变化时先生成；切换精简节点组后也需重新链接。
+    """
+
+    bl_idname = "uma_tool.link_asset_library"
+    bl_label = "链接共享资产"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        settings = get_settings(context)
+        return bool(settings and settings.asset_library_dir)
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        with phase("链接资产库"):
+            try:
+                assets = linked_assets(context)
+            except OSError as e:
+                self.report({"ERROR"}, f"无法使用共享资产库：{e}")
+                return {"CANCELLED"}
+
+        with phase("替换本地副本"):
+            replaced = adopt_linked_assets(assets)
+
+        written = "已生成并" if assets.written else "已"
+        self.report(
+            {"INFO"},
+            f"{written}链接资产库 {assets.library.filepath}，替换 {replaced} 个本地副本。",
+        )
+        return {"FINISHED"}
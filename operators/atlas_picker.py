@@ -0,0 +1,91 @@
+import bpy
+
+from ..config.node_groups import ATLAS_ROWS
+from ..utils.atlas_cells import ATLAS_CELL_CACHE
+from ..utils.profiling import profiled
+
+
+def active_position_node(context):
+    """返回节点编辑器中活动的位置节点组节点，没有时返回 None"""
+    space = context.space_data
+    tree = getattr(space, "edit_tree", None)
+    node = tree.nodes.active if tree is not None else None
+    if node is None or node.type != "GROUP" or node.node_tree is None:
+        return None
+    if node.node_tree.name not in ATLAS_ROWS:
+        return None
+    return node
+
+
+def position_node_image(node):
+    """返回位置节点组驱动的图像纹理所用的图集图像"""
+    for link in node.outputs["矢量"].links:
+        if link.to_node.type == "TEX_IMAGE" and link.to_node.image is not None:
+            return link.to_node.image
+    return None
+
+
+def index_property(node):
+    """编号由物体类型的属性节点驱动时返回该属性名，否则返回 None"""
+    links = node.inputs["编号"].links
+    if not links:
+        return None
+    attribute = links[0].from_node
+    if attribute.type != "ATTRIBUTE" or attribute.attribute_type != "OBJECT":
+        return None
+    return attribute.attribute_name
+
+
+def _property_fcurve(obj, name: str):
+    animation_data = obj.animation_data
+    if animation_data is None or animation_data.action is None:
+        return None
+    return animation_data.action.fcurves.find(f'["{name}"]')
+
+
+class UMA_TOOL_OT_pick_atlas_cell(bpy.types.Operator):
+    """把活动位置节点组的编号设为所选格子"""
+
+    bl_idname = "uma_tool.pick_atlas_cell"
+    bl_label = "选择表情"
+    bl_options = {"REGISTER", "UNDO"}
+
+    index: bpy.props.IntProperty(name="编号", default=1, min=1)  # pyright: ignore[reportInvalidTypeForm]
+
+    @classmethod
+    def poll(cls, context):
+        return active_position_node(context) is not None
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        node = active_position_node(context)
+        name = index_property(node)
+        obj = context.object
+        if name is not None and obj is not None:
+            # 编号由物体属性驱动时修改属性，属性节点需要物体更新才会重新求值
+            obj[name] = self.index
+            fcurve = _property_fcurve(obj, name)
+            if fcurve is not None:
+                # 属性已有表情时间轴时，直接赋值会在下次换帧时被动画覆盖，
+                # 改为在当前帧插入与时间轴相同的 CONSTANT 关键帧
+                frame = context.scene.frame_current
+                obj.keyframe_insert(f'["{name}"]', frame=frame)
+                for keyframe in fcurve.keyframe_points:
+                    if keyframe.co.x == frame:
+                        keyframe.interpolation = "CONSTANT"
+            obj.update_tag()
+        else:
+            node.inputs["编号"].default_value = self.index  # pyright: ignore[reportAttributeAccessIssue]
+        return {"FINISHED"}
+
+
+class UMA_TOOL_OT_refresh_atlas_previews(bpy.types.Operator):
+    """清空图集缩略图缓存，在外部修改了图集文件后使用"""
+
+    bl_idname = "uma_tool.refresh_atlas_previews"
+    bl_label = "刷新缩略图"
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        ATLAS_CELL_CACHE.clear()
+        return {"FINISHED"}
@@ -0,0 +1,57 @@
+import bpy
+
+from ..utils.profiling import phase, profiled
+from ..utils.spring_bake import bake_springs
+from .profile_playback import animation_frame_range
+
+
+class UMA_TOOL_OT_bake_springs(bpy.types.Operator):
+    """模拟所有 Sp_* 动态骨骼链并烘焙为关键帧
+
+    链参数（刚度、阻尼、重力）在 config/spring_config.py 中按骨骼名配置。
+    结果写入当前动作的副本，原动作作为再次烘焙时的输入保留。
+    """
+
+    bl_idname = "uma_tool.bake_springs"
+    bl_label = "烘焙动态骨骼"
+    bl_options = {"REGISTER", "UNDO"}
+
+    frame_start: bpy.props.IntProperty(name="起始帧", default=1)  # pyright: ignore[reportInvalidTypeForm]
+    frame_end: bpy.props.IntProperty(name="结束帧", default=250)  # pyright: ignore[reportInvalidTypeForm]
+
+    @classmethod
+    def poll(cls, context):
+        return (
+            context.active_object is not None
+            and context.active_object.type == "ARMATURE"
+        )
+
+    def invoke(self, context, event):  # pyright: ignore[reportIncompatibleMethodOverride]
+        self.frame_start, self.frame_end = animation_frame_range(
+            context.active_object, context.scene
+        )
+        return context.window_manager.invoke_props_dialog(self)
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        armature = context.active_object
+        if self.frame_end < self.frame_start:
+            self.report({"WARNING"}, "结束帧不能早于起始帧。")
+            return {"CANCELLED"}
+
+        if context.mode == "EDIT_ARMATURE":
+            with phase("模式切换"):
+                bpy.ops.object.mode_set(mode="POSE")
+
+        result = bake_springs(armature, context.scene, self.frame_start, self.frame_end)
+
+        if not result.bones:
+            self.report({"WARNING"}, "骨架中没有匹配配置的动态骨骼。")
+            return {"CANCELLED"}
+
+        self.report(
+            {"INFO"},
+            f"已烘焙 {result.bones} 根动态骨骼、{result.frames} 帧，"
+            f"共 {result.keys} 个关键帧，写入动作 {result.action.name}。",
+        )
+        return {"FINISHED"}
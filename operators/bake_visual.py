@@ -0,0 +1,127 @@
+import math
+
+import bpy
+
+from ..utils.profiling import phase, profiled
+from ..utils.visual_bake import visual_bake
+from .profile_playback import animation_frame_range
+
+
+class UMA_TOOL_OT_bake_visual(bpy.types.Operator):
+    """把控制器驱动的最终姿态烘焙到形变骨骼，并按误差简化关键帧"""
+
+    bl_idname = "uma_tool.bake_visual"
+    bl_label = "烘焙到形变骨骼"
+    bl_options = {"REGISTER", "UNDO"}
+
+    frame_start: bpy.props.IntProperty(name="起始帧", default=1)  # pyright: ignore[reportInvalidTypeForm]
+    frame_end: bpy.props.IntProperty(name="结束帧", default=250)  # pyright: ignore[reportInvalidTypeForm]
+    only_selected: bpy.props.BoolProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="仅选中骨骼",
+        description="只烘焙选中的姿态骨骼，否则烘焙所有形变骨骼",
+        default=False,
+    )
+    location_tolerance: bpy.props.FloatProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="位置容差",
+        default=1e-4,
+        min=0.0,
+        precision=5,
+        subtype="DISTANCE",
+    )
+    rotation_tolerance: bpy.props.FloatProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="旋转容差",
+        default=math.radians(0.1),
+        min=0.0,
+        precision=3,
+        subtype="ANGLE",
+    )
+    scale_tolerance: bpy.props.FloatProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="缩放容差",
+        default=1e-4,
+        min=0.0,
+        precision=5,
+    )
+    clear_constraints: bpy.props.BoolProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="清除约束",
+        description="烘焙后删除这些骨骼的约束，否则约束会在关键帧之上再次生效",
+        default=True,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return (
+            context.active_object is not None
+            and context.active_object.type == "ARMATURE"
+        )
+
+    def invoke(self, context, event):  # pyright: ignore[reportIncompatibleMethodOverride]
+        self.frame_start, self.frame_end = animation_frame_range(
+            context.active_object, context.scene
+        )
+        return context.window_manager.invoke_props_dialog(self)
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        armature = context.active_object
+        if self.frame_end < self.frame_start:
+            self.report({"WARNING"}, "结束帧不能早于起始帧。")
+            return {"CANCELLED"}
+
+        if context.mode == "EDIT_ARMATURE":
+            with phase("模式切换"):
+                bpy.ops.object.mode_set(mode="POSE")
+
+        if self.only_selected:
+            names = [bone.name for bone in context.selected_pose_bones or ()]
+        else:
+            names = [bone.name for bone in armature.data.bones if bone.use_deform]
+        if not names:
+            self.report({"WARNING"}, "没有需要烘焙的骨骼。")
+            return {"CANCELLED"}
+
+        result = visual_bake(
+            armature,
+            context.scene,
+            names,
+            self.frame_start,
+            self.frame_end,
+            self.location_tolerance,
+            self.rotation_tolerance,
+            self.scale_tolerance,
+        )
+
+        skipped = set(result.skipped)
+        baked = [name for name in names if name not in skipped]
+        if self.clear_constraints:
+            with phase("清除约束"):
+                for name in baked:
+                    constraints = armature.pose.bones[name].constraints
+                    for constraint in list(constraints):
+                        constraints.remove(constraint)
+        else:
+            constrained = [
+                name
+                for name in baked
+                if any(c.enabled for c in armature.pose.bones[name].constraints)
+            ]
+            if constrained:
+                self.report(
+                    {"WARNING"},
+                    f"{len(constrained)} 根已烘焙的骨骼仍有启用的约束，"
+                    "约束会在关键帧之上再次生效。",
+                )
+
+        if result.skipped:
+            self.report(
+                {"WARNING"},
+                f"{len(result.skipped)} 根骨骼不完全继承父骨骼的旋转、缩放或"
+                "不使用局部位置，已跳过：" + ", ".join(result.skipped),
+            )
+
+        ratio = result.keys_after / result.keys_before if result.keys_before else 0.0
+        self.report(
+            {"INFO"},
+            f"已烘焙 {result.bones} 根骨骼、{result.frames} 帧：关键帧 "
+            f"{result.keys_before} → {result.keys_after}（{ratio:.1%}）。",
+        )
+        return {"FINISHED"}
@@ -2,114 +2,48 @@ import bpy
 
 from bpy.types import Menu
 
+from ..config.node_groups import position_group_specs
+from ..config.settings import get_settings
+from ..utils.asset_library import link_asset_library
+from ..utils.node_builder import get_or_create_node_group
+from ..utils.profiling import phase, profiled
 
-def _create_position_nodegroup(group_name: str, y_offset_value: float):
-    """Creates a shader node group for positioning with a specific Y offset."""
-    # Create the node group
-    group = bpy.data.node_groups.new(name=group_name, type="ShaderNodeTree")
-
-    # --- Group Interface ---
-    socket_in = group.interface.new_socket(
-        name="编号", in_out="INPUT", socket_type="NodeSocketInt"
-    )
-    socket_in.default_value = 1  # pyright: ignore[reportAttributeAccessIssue]
-
-    group.interface.new_socket(
-        name="矢量", in_out="INPUT", socket_type="NodeSocketVector"
-    )
-
-    group.interface.new_socket(
-        name="矢量", in_out="OUTPUT", socket_type="NodeSocketVector"
-    )
-
-    # --- Nodes ---
-    group_input_node = group.nodes.new("NodeGroupInput")
-    group_input_node.location = (-800, 0)
-
-    group_output_node = group.nodes.new("NodeGroupOutput")
-    group_output_node.location = (600, 0)
-
-    subtract_node = group.nodes.new("ShaderNodeMath")
-    subtract_node.name = "相减"
-    subtract_node.label = "相减"
-    subtract_node.operation = "SUBTRACT"  # pyright: ignore[reportAttributeAccessIssue]
-    subtract_node.inputs[1].default_value = 1.0  # pyright: ignore[reportAttributeAccessIssue]
-    subtract_node.location = (-600, 100)
-
-    column_node = group.nodes.new("ShaderNodeMath")
-    column_node.name = "列号"
-    column_node.label = "列号"
-    column_node.operation = "MODULO"  # pyright: ignore[reportAttributeAccessIssue]
-    column_node.inputs[1].default_value = 4.0  # pyright: ignore[reportAttributeAccessIssue]
-    column_node.location = (-400, 200)
-
-    row_node = group.nodes.new("ShaderNodeMath")
-    row_node.name = "行号"
-    row_node.label = "行号"
-    row_node.operation = "DIVIDE"  # pyright: ignore[reportAttributeAccessIssue]
-    row_node.inputs[1].default_value = 4.0  # pyright: ignore[reportAttributeAccessIssue]
-    row_node.location = (-400, 0)
-
-    floor_node = group.nodes.new("ShaderNodeMath")
-    floor_node.name = "向下取整"
-    floor_node.label = "向下取整"
-    floor_node.operation = "FLOOR"  # pyright: ignore[reportAttributeAccessIssue]
-    floor_node.location = (-200, 0)
-
-    x_offset_node = group.nodes.new("ShaderNodeMath")
-    x_offset_node.name = "X偏移"
-    x_offset_node.label = "X偏移"
-    x_offset_node.operation = "MULTIPLY"  # pyright: ignore[reportAttributeAccessIssue]
-    x_offset_node.inputs[1].default_value = 0.25  # pyright: ignore[reportAttributeAccessIssue]
-    x_offset_node.location = (-200, 200)
-
-    y_offset_node = group.nodes.new("ShaderNodeMath")
-    y_offset_node.name = "Y偏移"
-    y_offset_node.label = "Y偏移"
-    y_offset_node.operation = "MULTIPLY"  # pyright: ignore[reportAttributeAccessIssue]
-    y_offset_node.inputs[1].default_value = y_offset_value  # pyright: ignore[reportAttributeAccessIssue]
-    y_offset_node.location = (0, 0)
-
-    combine_xyz_node = group.nodes.new("ShaderNodeCombineXYZ")
-    combine_xyz_node.name = "合并XYZ"
-    combine_xyz_node.label = "合并XYZ"
-    combine_xyz_node.inputs[2].default_value = 0.0  # pyright: ignore[reportAttributeAccessIssue]
-    combine_xyz_node.location = (200, 100)
-
-    mapping_node = group.nodes.new("ShaderNodeMapping")
-    mapping_node.location = (400, 100)
-
-    # --- Links ---
-    links = group.links
-    links.new(group_input_node.outputs["编号"], subtract_node.inputs[0])
-    links.new(subtract_node.outputs["Value"], column_node.inputs[0])
-    links.new(subtract_node.outputs["Value"], row_node.inputs[0])
-    links.new(row_node.outputs["Value"], floor_node.inputs[0])
-    links.new(column_node.outputs["Value"], x_offset_node.inputs[0])
-    links.new(floor_node.outputs["Value"], y_offset_node.inputs[0])
-    links.new(x_offset_node.outputs["Value"], combine_xyz_node.inputs["X"])
-    links.new(y_offset_node.outputs["Value"], combine_xyz_node.inputs["Y"])
-    links.new(group_input_node.outputs["矢量"], mapping_node.inputs["Vector"])
-    links.new(combine_xyz_node.outputs["Vector"], mapping_node.inputs["Location"])
-    links.new(mapping_node.outputs["Vector"], group_output_node.inputs["矢量"])
-
-    return group
-
-
-def get_or_create_eye_or_mouth_position_nodegroup():
-    """Ensures the '眼睛/嘴巴位置' node group exists and returns it."""
-    group_name = "眼睛/嘴巴位置"
-    if group_name in bpy.data.node_groups:
-        return bpy.data.node_groups[group_name]
-    return _create_position_nodegroup(group_name, -0.125)
-
-
-def get_or_create_eyelash_position_nodegroup():
-    """Ensures the '睫毛位置' node group exists and returns it."""
-    group_name = "睫毛位置"
-    if group_name in bpy.data.node_groups:
-        return bpy.data.node_groups[group_name]
-    return _create_position_nodegroup(group_name, -0.25)
+
+def linked_assets(context):
+    """Returns the assets linked from the shared library, or None if unset.
+
+    Raises OSError when the library cannot be written or read.
+    """
+    settings = get_settings(context)
+    if settings is None or not settings.asset_library_dir:
+        return None
+    return link_asset_library(settings.asset_library_dir)
+
+
+def _position_nodegroup(spec, assets=None):
+    if assets is not None:
+        return assets.node_groups[spec.name]
+    return get_or_create_node_group(spec)
+
+
+def get_or_create_eye_or_mouth_position_nodegroup(compact: bool = False, assets=None):
+    """Ensures the '眼睛/嘴巴位置' node group is up to date and returns it.
+
+    Switching ``compact`` rebuilds the existing group in place, so materials
+    that already use it pick up the other variant without relinking. With
+    ``assets`` the linked group is returned instead of a local copy.
+    """
+    return _position_nodegroup(position_group_specs(compact)[0], assets)
+
+
+def get_or_create_eyelash_position_nodegroup(compact: bool = False, assets=None):
+    """Ensures the '睫毛位置' node group is up to date and returns it."""
+    return _position_nodegroup(position_group_specs(compact)[1], assets)
+
+
+def ensure_position_nodegroups(compact: bool = False, assets=None):
+    """Ensures all position node groups exist without needing a node editor."""
+    return [_position_nodegroup(spec, assets) for spec in position_group_specs(compact)]
 
 
 class UMA_OT_AddEyeOrMoutnhPositionNode(bpy.types.Operator):
@@ -129,17 +63,26 @@ class UMA_OT_AddEyeOrMoutnhPositionNode(bpy.types.Operator):
             and context.object.active_material is not None
         )
 
+    @profiled
     def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
-        group = get_or_create_eye_or_mouth_position_nodegroup()
+        try:
+            assets = linked_assets(context)
+        except OSError as e:
+            self.report({"ERROR"}, f"无法使用共享资产库：{e}")
+            return {"CANCELLED"}
 
-        node = context.space_data.edit_tree.nodes.new(type="ShaderNodeGroup")  # pyright: ignore[reportAttributeAccessIssue]
-        node.node_tree = group
-        node.name = group.name
-        node.label = group.name
+        with phase("节点组"):
+            group = get_or_create_eye_or_mouth_position_nodegroup(assets=assets)
 
-        node.location = context.space_data.cursor_location  # pyright: ignore[reportAttributeAccessIssue]
-        node.select = True
-        context.space_data.edit_tree.nodes.active = node  # pyright: ignore[reportAttributeAccessIssue]
+        with phase("插入节点"):
+            node = context.space_data.edit_tree.nodes.new(type="ShaderNodeGroup")  # pyright: ignore[reportAttributeAccessIssue]
+            node.node_tree = group
+            node.name = group.name
+            node.label = group.name
+
+            node.location = context.space_data.cursor_location  # pyright: ignore[reportAttributeAccessIssue]
+            node.select = True
+            context.space_data.edit_tree.nodes.active = node  # pyright: ignore[reportAttributeAccessIssue]
 
         return {"FINISHED"}
 
@@ -161,17 +104,26 @@ class UMA_OT_AddEyelashPositionNode(bpy.types.Operator):
             and context.object.active_material is not None
         )
 
+    @profiled
     def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
-        group = get_or_create_eyelash_position_nodegroup()
-
-        node = context.space_data.edit_tree.nodes.new(type="ShaderNodeGroup")  # pyright: ignore[reportAttributeAccessIssue]
-        node.node_tree = group
-        node.name = group.name
-        node.label = group.name
-
-        node.location = context.space_data.cursor_location  # pyright: ignore[reportAttributeAccessIssue]
-        node.select = True
-        context.space_data.edit_tree.nodes.active = node  # pyright: ignore[reportAttributeAccessIssue]
+        try:
+            assets = linked_assets(context)
+        except OSError as e:
+            self.report({"ERROR"}, f"无法使用共享资产库：{e}")
+            return {"CANCELLED"}
+
+        with phase("节点组"):
+            group = get_or_create_eyelash_position_nodegroup(assets=assets)
+
+        with phase("插入节点"):
+            node = context.space_data.edit_tree.nodes.new(type="ShaderNodeGroup")  # pyright: ignore[reportAttributeAccessIssue]
+            node.node_tree = group
+            node.name = group.name
+            node.label = group.name
+
+            node.location = context.space_data.cursor_location  # pyright: ignore[reportAttributeAccessIssue]
+            node.select = True
+            context.space_data.edit_tree.nodes.active = node  # pyright: ignore[reportAttributeAccessIssue]
 
         return {"FINISHED"}
 
@@ -0,0 +1,99 @@
+import bpy
+from ..utils.display_state import apply_preset, preset_names, remove_preset, save_preset
+from ..utils.profiling import phase, profiled
+
+# 动态枚举项的字符串必须保持引用，否则 Blender 可能读到已释放的内存
+_preset_items = []
+
+
+def _preset_enum_items(self, context):
+    global _preset_items
+    names = preset_names(context.active_object) if _armature_poll(context) else []
+    _preset_items = [(name, name, "") for name in names]
+    return _preset_items
+
+
+def _armature_poll(context):
+    return (
+        context.active_object is not None and context.active_object.type == "ARMATURE"
+    )
+
+
+class UMA_TOOL_OT_save_display_preset(bpy.types.Operator):
+    """把当前所有骨骼的可见性保存为命名预设"""
+
+    bl_idname = "uma_tool.save_display_preset"
+    bl_label = "保存显示预设"
+    bl_options = {"REGISTER", "UNDO"}
+
+    name: bpy.props.StringProperty(name="名称", default="预设")  # pyright: ignore[reportInvalidTypeForm]
+
+    @classmethod
+    def poll(cls, context):
+        return _armature_poll(context)
+
+    def invoke(self, context, event):  # pyright: ignore[reportIncompatibleMethodOverride]
+        return context.window_manager.invoke_props_dialog(self)
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        if not self.name:
+            self.report({"WARNING"}, "预设名称不能为空。")
+            return {"CANCELLED"}
+
+        with phase("保存预设"):
+            save_preset(context.active_object, self.name)
+
+        self.report({"INFO"}, f"已保存显示预设 '{self.name}'。")
+        return {"FINISHED"}
+
+
+class UMA_TOOL_OT_apply_display_preset(bpy.types.Operator):
+    """一次恢复命名预设中所有骨骼的可见性"""
+
+    bl_idname = "uma_tool.apply_display_preset"
+    bl_label = "应用显示预设"
+    bl_options = {"REGISTER", "UNDO"}
+
+    preset: bpy.props.EnumProperty(name="预设", items=_preset_enum_items)  # pyright: ignore[reportInvalidTypeForm]
+
+    @classmethod
+    def poll(cls, context):
+        return _armature_poll(context) and bool(preset_names(context.active_object))
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        armature = context.active_object
+        if context.mode == "EDIT_ARMATURE":
+            with phase("模式切换"):
+                bpy.ops.object.mode_set(mode="OBJECT")
+
+        with phase("应用预设"):
+            shown_count = apply_preset(armature, self.preset)
+
+        if shown_count is None:
+            self.report({"WARNING"}, f"预设 '{self.preset}' 与当前骨骼不一致，未应用。")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, f"已应用显示预设 '{self.preset}'。")
+        return {"FINISHED"}
+
+
+class UMA_TOOL_OT_remove_display_preset(bpy.types.Operator):
+    """删除命名的显示预设"""
+
+    bl_idname = "uma_tool.remove_display_preset"
+    bl_label = "删除显示预设"
+    bl_options = {"REGISTER", "UNDO"}
+
+    preset: bpy.props.EnumProperty(name="预设", items=_preset_enum_items)  # pyright: ignore[reportInvalidTypeForm]
+
+    @classmethod
+    def poll(cls, context):
+        return _armature_poll(context) and bool(preset_names(context.active_object))
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        remove_preset(context.active_object, self.preset)
+        self.report({"INFO"}, f"已删除显示预设 '{self.preset}'。")
+        return {"FINISHED"}
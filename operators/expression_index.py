@@ -0,0 +1,134 @@
+import bpy
+from bpy_extras.io_utils import ImportHelper
+
+from ..config.node_groups import position_group_specs
+from ..utils.expression_index import (
+    ensure_index_property,
+    load_expression_timeline,
+    node_slot,
+    wire_index_attribute,
+    write_expression_keys,
+)
+from ..utils.profiling import phase, profiled
+
+
+def slotted_meshes(objects) -> dict:
+    """返回 {网格物体: {槽位: [(节点树, 位置节点组节点), ...]}}
+
+    物体为骨架时包括其所有子物体。
+    """
+    group_names = {spec.name for spec in position_group_specs()}
+    members = {}
+    for obj in objects:
+        for member in [obj, *obj.children_recursive]:
+            if member.type == "MESH":
+                members.setdefault(member.name_full, member)
+
+    meshes = {}
+    for mesh in members.values():
+        slots = {}
+        for material_slot in mesh.material_slots:
+            material = material_slot.material
+            if material is None or material.node_tree is None:
+                continue
+            tree = material.node_tree
+            for node in tree.nodes:
+                if node.type != "GROUP" or node.node_tree is None:
+                    continue
+                if node.node_tree.name not in group_names:
+                    continue
+                slot = node_slot(node)
+                if slot is not None:
+                    slots.setdefault(slot, []).append((tree, node))
+        if slots:
+            meshes[mesh] = slots
+    return meshes
+
+
+class UMA_TOOL_OT_setup_expression_index(bpy.types.Operator):
+    """把位置节点组的编号改为由物体自定义属性驱动，可直接插入关键帧"""
+
+    bl_idname = "uma_tool.setup_expression_index"
+    bl_label = "设置表情编号属性"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(context.selected_objects)
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        with phase("查找节点"):
+            meshes = slotted_meshes(context.selected_objects)
+        if not meshes:
+            self.report({"WARNING"}, "所选角色的材质中没有位置节点组。")
+            return {"CANCELLED"}
+
+        wired = 0
+        with phase("连接属性"):
+            for mesh, slots in meshes.items():
+                for slot, nodes in slots.items():
+                    ensure_index_property(mesh, slot)
+                    # 共享材质只需连接一次，wire_index_attribute 会跳过已连接的节点
+                    for tree, node in nodes:
+                        wired += wire_index_attribute(tree, node, slot)
+
+        self.report(
+            {"INFO"},
+            f"已为 {len(meshes)} 个网格添加表情编号属性，连接 {wired} 个属性节点。",
+        )
+        return {"FINISHED"}
+
+
+class UMA_TOOL_OT_import_expression_timeline(bpy.types.Operator, ImportHelper):
+    """从 JSON 或 CSV 时间轴导入表情编号关键帧（CONSTANT 插值）
+
+    尚未连接属性节点的位置节点组会先自动连接。
+    """
+
+    bl_idname = "uma_tool.import_expression_timeline"
+    bl_label = "导入表情时间轴"
+    bl_options = {"REGISTER", "UNDO"}
+
+    filter_glob: bpy.props.StringProperty(default="*.json;*.csv", options={"HIDDEN"})  # pyright: ignore[reportInvalidTypeForm]
+
+    @classmethod
+    def poll(cls, context):
+        return bool(context.selected_objects)
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        with phase("读取时间轴"):
+            try:
+                timeline = load_expression_timeline(self.filepath)
+            except (OSError, ValueError, KeyError) as e:
+                self.report({"ERROR"}, f"无法读取时间轴：{e}")
+                return {"CANCELLED"}
+
+        with phase("查找节点"):
+            meshes = slotted_meshes(context.selected_objects)
+
+        keys = 0
+        targets = set()
+        with phase("写入关键帧"):
+            for mesh, slots in meshes.items():
+                for slot, (frames, values) in timeline.items():
+                    if slot in slots:
+                        for tree, node in slots[slot]:
+                            wire_index_attribute(tree, node, slot)
+                        keys += write_expression_keys(mesh, slot, frames, values)
+                        targets.add(mesh.name)
+
+        unused = sorted(
+            set(timeline) - {slot for slots in meshes.values() for slot in slots}
+        )
+        if unused:
+            self.report(
+                {"WARNING"}, "以下槽位在所选角色中没有位置节点组：" + ", ".join(unused)
+            )
+        if not keys:
+            self.report({"WARNING"}, "没有写入任何关键帧。")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, f"已为 {len(targets)} 个网格写入 {keys} 个表情关键帧。")
+        return {"FINISHED"}
@@ -1,16 +1,236 @@
 import bpy
-import math
-from mathutils import Vector, Euler
-from ..config.bone_config import BONE_CONFIGS
+import hashlib
+from collections import namedtuple
+import numpy as np
+from ..config.bone_config import ACTIVE_BONE_COLOR, BONE_CONFIGS
+from ..utils.bone_resolver import resolve_bone_configs
+from ..utils.curve_shapes import (
+    get_or_create_shape_object,
+    rebuild_shape_object,
+    remove_controller_object,
+)
+from ..utils.profiling import phase, profiled
+from ..utils.pose_math import (
+    normalized_rotations,
+    read_bools,
+    read_floats,
+    read_matrices,
+    rotations_to_euler_xyz,
+    write_bools,
+    write_floats,
+)
+from .create_shader_nodes import linked_assets
+
+
+# 存放在姿态骨骼上的控制器指纹属性名
+FINGERPRINT_KEY = "uma_ctrl_fingerprint"
+# 控制器生成逻辑发生变化时递增，使旧指纹全部失效
+FINGERPRINT_VERSION = 1
+
+
+def _controller_fingerprint(config, bone, pose_bone) -> str:
+    """根据配置项、骨骼长度和静止矩阵计算控制器指纹
+
+    GLOBAL_HORIZONTAL 的旋转依赖当前姿态，因此这类配置还会包含姿态矩阵。
+    """
+    state = [
+        FINGERPRINT_VERSION,
+        tuple(config),
+        round(bone.length, 6),
+        tuple(round(v, 6) for row in bone.matrix_local for v in row),
+    ]
+    if config.shape_rotation_euler == "GLOBAL_HORIZONTAL":
+        state.append(tuple(round(v, 6) for row in pose_bone.matrix for v in row))
+    return hashlib.sha1(repr(state).encode()).hexdigest()
+
+
+def _place_controllers(armature, changed_configs, shape_objects) -> int:
+    """批量计算所有控制器的大小、旋转和偏移，并用 foreach_set 一次写回"""
+    pose_bones = armature.pose.bones
+    data_bones = armature.data.bones
+    pose_index = {name: i for i, name in enumerate(pose_bones.keys())}
+    data_index = {name: i for i, name in enumerate(data_bones.keys())}
+
+    entries = [
+        (config, fingerprint)
+        for config, fingerprint in changed_configs
+        if config.bone_name in pose_index and shape_objects.get(config.shape)
+    ]
+    if not entries:
+        return 0
+
+    configs = [config for config, _ in entries]
+    rows = np.array([pose_index[config.bone_name] for config in configs])
+    data_rows = np.array([data_index[config.bone_name] for config in configs])
+
+    # 大小：骨骼长度 * radius_multiplier
+    bone_lengths = read_floats(data_bones, "length")[data_rows]
+    bone_lengths = np.where(bone_lengths < 0.001, 0.1, bone_lengths)
+    radius = np.array([config.radius_multiplier for config in configs])
+    scales = read_floats(pose_bones, "custom_shape_scale_xyz", 3)
+    scales[rows] = (bone_lengths * radius)[:, None]
+
+    # 旋转：GLOBAL_HORIZONTAL 抵消骨骼自身的旋转，其余直接使用配置值
+    horizontal = np.array(
+        [config.shape_rotation_euler == "GLOBAL_HORIZONTAL" for config in configs]
+    )
+    rotations = read_floats(pose_bones, "custom_shape_rotation_euler", 3)
+    rotations[rows[~horizontal]] = np.array(
+        [
+            config.shape_rotation_euler
+            for config in configs
+            if config.shape_rotation_euler != "GLOBAL_HORIZONTAL"
+        ],
+        dtype=np.float32,
+    ).reshape(-1, 3)
+    if horizontal.any():
+        bone_rotations = normalized_rotations(
+            read_matrices(pose_bones)[rows[horizontal]]
+        )
+        inverse_rotations = bone_rotations.transpose(0, 2, 1)
+        rotations[rows[horizontal]] = rotations_to_euler_xyz(inverse_rotations)
+
+    # 偏移：方向 * 姿态骨骼长度 * offset_multiplier
+    pose_lengths = read_floats(pose_bones, "length")[rows]
+    directions = np.array(
+        [config.offset_direction for config in configs], dtype=np.float32
+    )
+    multipliers = np.array([config.offset_multiplier for config in configs])
+    translations = read_floats(pose_bones, "custom_shape_translation", 3)
+    translations[rows] = directions * (pose_lengths * multipliers)[:, None]
+
+    use_bone_size = read_bools(pose_bones, "use_custom_shape_bone_size")
+    use_bone_size[rows] = False
+    show_wire = read_bools(data_bones, "show_wire")
+    show_wire[data_rows] = True
+
+    write_floats(pose_bones, "custom_shape_scale_xyz", scales)
+    write_floats(pose_bones, "custom_shape_rotation_euler", rotations)
+    write_floats(pose_bones, "custom_shape_translation", translations)
+    write_bools(pose_bones, "use_custom_shape_bone_size", use_bone_size)
+    write_bools(data_bones, "show_wire", show_wire)
+
+    # 指针和自定义属性无法批量写入
+    for (config, fingerprint), row in zip(entries, rows):
+        pose_bone = pose_bones[int(row)]
+        pose_bone.custom_shape = shape_objects[config.shape]
+        pose_bone[FINGERPRINT_KEY] = fingerprint
+
+    # foreach_set 不会触发 RNA 更新，手动标记以刷新视图
+    armature.update_tag()
+    return len(entries)
+
+
+GenerateResult = namedtuple(
+    "GenerateResult",
+    [
+        "placed",  # 重新生成的控制器数量
+        "skipped",  # 指纹未变化而跳过的控制器数量
+        "missing",  # 在骨架中找不到的配置骨骼名
+    ],
+)
+
+
+def get_or_create_controller_collection(scene):
+    ctrl_collection_name = "Controllers"
+    if ctrl_collection_name not in bpy.data.collections:
+        ctrl_collection = bpy.data.collections.new(ctrl_collection_name)
+        scene.collection.children.link(ctrl_collection)
+    else:
+        ctrl_collection = bpy.data.collections[ctrl_collection_name]
+    return ctrl_collection
+
+
+def generate_controllers(
+    armature, scene, mode: str = "INCREMENTAL", assets=None
+) -> GenerateResult:
+    """为骨架生成控制器，不依赖 UI 上下文，可在后台批处理中直接调用
+
+    mode 为 "INCREMENTAL" 时只重新生成指纹变化的控制器，"FULL" 时全部重建。
+    给出 assets 时使用从共享资产库链接的形状对象，不创建本地形状。
+    调用方需保证骨架不处于编辑模式。
+    """
+    shape_objects = {}
+    changed_configs = []
+    skipped_count = 0
+
+    with phase("集合准备"):
+        ctrl_collection = get_or_create_controller_collection(scene)
+        if mode == "FULL" and assets is None:
+            for shape in {config.shape for config in BONE_CONFIGS}:
+                rebuild_shape_object(shape)
+
+    with phase("解析骨骼"):
+        resolved = resolve_bone_configs(armature)
+
+    for rule in resolved.rules:
+        config = rule.config
+        bone = armature.data.bones[config.bone_name]
+
+        pose_bone = armature.pose.bones.get(bone.name)
+        if not pose_bone:
+            continue
+
+        if config.shape not in shape_objects:
+            with phase(f"形状创建:{config.shape}"):
+                if assets is not None:
+                    shape_objects[config.shape] = assets.shapes.get(config.shape)
+                else:
+                    shape_objects[config.shape] = get_or_create_shape_object(
+                        config.shape, ctrl_collection
+                    )
+
+        with phase("指纹计算"):
+            fingerprint = _controller_fingerprint(config, bone, pose_bone)
+        if (
+            mode == "INCREMENTAL"
+            and pose_bone.get(FINGERPRINT_KEY) == fingerprint
+            and pose_bone.custom_shape is not None
+            and pose_bone.custom_shape == shape_objects[config.shape]
+        ):
+            skipped_count += 1
+            continue
+        changed_configs.append((config, fingerprint))
+
+        if hasattr(bone, "color"):
+            bone.color.palette = "CUSTOM"
+            bone.color.custom.normal = rule.color
+            bone.color.custom.active = ACTIVE_BONE_COLOR
+            bone.color.custom.select = rule.color
+
+        # 旧版本为每根骨骼单独创建的控制器对象
+        remove_controller_object(f"CTRL_{config.bone_name}")
+
+    placed_count = 0
+    if changed_configs:
+        with phase("姿态分配"):
+            placed_count = _place_controllers(armature, changed_configs, shape_objects)
+
+    return GenerateResult(
+        placed=placed_count, skipped=skipped_count, missing=resolved.missing
+    )
 
 
 class UMA_TOOL_OT_generate_controllers(bpy.types.Operator):
-    """遍历配置列表，为所有定义的骨骼生成控制器"""
+    """遍历配置列表，为所有定义的骨骼生成控制器
+
+    每种形状只创建一个单位大小的共享曲线对象，每根骨骼的大小通过
+    custom_shape_scale_xyz 控制。
+    """
 
     bl_idname = "uma_tool.generate_controllers"
     bl_label = "生成控制器"
     bl_options = {"REGISTER", "UNDO"}
 
+    mode: bpy.props.EnumProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="模式",
+        items=[
+            ("INCREMENTAL", "增量", "只重新生成配置或骨骼发生变化的控制器"),
+            ("FULL", "全部重建", "重建共享形状并重新生成所有控制器"),
+        ],
+        default="INCREMENTAL",
+    )
+
     @classmethod
     def poll(cls, context):
         return (
@@ -18,221 +238,38 @@ class UMA_TOOL_OT_generate_controllers(bpy.types.Operator):
             and context.active_object.type == "ARMATURE"
         )
 
+    @profiled
     def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
         armature = context.active_object
 
-        if context.mode != "OBJECT":
-            bpy.ops.object.mode_set(mode="OBJECT")
-
-        ctrl_collection_name = "Controllers"
-        if ctrl_collection_name not in bpy.data.collections:
-            ctrl_collection = bpy.data.collections.new(ctrl_collection_name)
-            context.scene.collection.children.link(ctrl_collection)
-        else:
-            ctrl_collection = bpy.data.collections[ctrl_collection_name]
-
-        new_controllers = {}
-
-        bone_custom_colors = {
-            "Left": (0.0, 1.0, 1.0),  # Cyan
-            "Right": (1.0, 1.0, 0.0),  # Yellow
-            "Center": (1.0, 0.0, 1.0),  # Magenta
-        }
-        active_color = (1.0, 0.0, 0.0)  # Red
-
-        for config in BONE_CONFIGS:
-            bone = armature.data.bones.get(config.bone_name)  # pyright: ignore[reportAttributeAccessIssue]
-            if not bone:
-                self.report(
-                    {"WARNING"}, f"数据层骨骼 '{config.bone_name}' 未找到，已跳过。"
-                )
-                continue
-
-            ctrl_name = f"CTRL_{config.bone_name}"
-
-            bone_name_low = config.bone_name.lower()
-            group_name = "Center"
-            if ".l" in bone_name_low or "_l" in bone_name_low:
-                group_name = "Left"
-            elif ".r" in bone_name_low or "_r" in bone_name_low:
-                group_name = "Right"
-
-            if hasattr(bone, "color"):
-                bone.color.palette = "CUSTOM"
-                color = bone_custom_colors[group_name]
-                bone.color.custom.normal = color
-                bone.color.custom.active = active_color
-                bone.color.custom.select = color
-
-            existing_ctrl = bpy.data.objects.get(ctrl_name)
-            if existing_ctrl:
-                bpy.data.objects.remove(existing_ctrl, do_unlink=True)
-
-            bone_length = bone.length
-            if bone_length < 0.001:
-                bone_length = 0.1
-
-            controller = None
-            controller_size = bone_length * config.radius_multiplier
-
-            context.view_layer.objects.active = armature
-
-            if config.shape == "CIRCLE":
-                bpy.ops.curve.primitive_bezier_circle_add(
-                    radius=controller_size,
-                    enter_editmode=False,
-                    align="WORLD",
-                    location=(0, 0, 0),
-                )
-                controller = context.active_object
-
-            elif config.shape == "SQUARE":
-                bpy.ops.curve.primitive_bezier_circle_add(
-                    radius=controller_size,
-                    enter_editmode=False,
-                    align="WORLD",
-                    location=(0, 0, 0),
-                )
-                controller = context.active_object
-                context.view_layer.objects.active = controller
-                bpy.ops.object.mode_set(mode="EDIT")
-                bpy.ops.curve.select_all(action="SELECT")
-                bpy.ops.curve.handle_type_set(type="VECTOR")
+        # 只通过数据 API 修改骨骼和姿态骨骼，物体模式和姿态模式下都无需切换。
+        # 编辑模式下退出时编辑骨骼会覆盖数据层骨骼，因此只有这种情况需要切换。
+        if context.mode == "EDIT_ARMATURE":
+            with phase("模式切换"):
                 bpy.ops.object.mode_set(mode="OBJECT")
 
-            elif config.shape == "ARROW_CIRCLE":
-                # 创建一个空的曲线对象来容纳所有的几何体
-                bpy.ops.object.add(type="CURVE", location=(0, 0, 0))
-                controller = context.active_object
-                splines = controller.data.splines  # pyright: ignore[reportAttributeAccessIssue]
-                # 清除默认创建的样条线
-                splines.clear()
-
-                arrow_size = controller_size * 0.4
-                arrow_offset = controller_size * 1.0
-
-                # 用于存储每个箭头基部在世界坐标系下的起点和终点
-                arrow_base_points_world = []
-
-                # 循环创建4个箭头样条线
-                for i in range(4):
-                    spline = splines.new("BEZIER")
-                    # 定义单个箭头的局部坐标点
-                    points_pos_raw: list[tuple[float, float, float]] = [
-                        (-0.3, -0.05, 0),
-                        (-0.3, 0.5, 0),
-                        (-0.5, 0.5, 0),
-                        (0, 1, 0),
-                        (0.5, 0.5, 0),
-                        (0.3, 0.5, 0),
-                        (0.3, -0.05, 0),
-                    ]
-
-                    # 计算每个箭头的旋转和位置
-                    angle = i * math.pi / 2
-                    rot_matrix = Euler((0, 0, -angle), "XYZ").to_matrix()
-                    location = Vector(
-                        (
-                            arrow_offset * math.sin(angle),
-                            arrow_offset * math.cos(angle),
-                            0,
-                        )
-                    )
-
-                    # 将局部坐标点转换为世界坐标
-                    world_points = [
-                        location + rot_matrix @ (Vector(p) * arrow_size)
-                        for p in points_pos_raw
-                    ]
-
-                    # 将计算好的点添加到样条线中
-                    spline.bezier_points.add(len(world_points) - 1)
-                    for j, p_co in enumerate(world_points):
-                        p = spline.bezier_points[j]
-                        p.co = p_co
-                        p.handle_left_type = "VECTOR"
-                        p.handle_right_type = "VECTOR"
-
-                    # 记录下箭头基部的两个点，用于后续连接圆弧
-                    arrow_base_points_world.append((world_points[0], world_points[-1]))
-
-                # 循环创建4个圆弧样条线来连接箭头
-                for i in range(4):
-                    next_i = (i + 1) % 4
-                    # 获取当前箭头的终点和下一个箭头的起点
-                    p_start = arrow_base_points_world[i][1]
-                    p_end = arrow_base_points_world[next_i][0]
-
-                    spline = splines.new("BEZIER")
-                    spline.bezier_points.add(1)
-                    p0, p1 = spline.bezier_points
-                    p0.co, p1.co = p_start, p_end
-
-                    # --- 设置贝塞尔手柄以形成平滑的圆弧 ---
-                    # 这个神奇数字是 (4/3)*tan(pi/8)，用于通过2个贝塞尔点创建90度圆弧
-                    handle_len = controller_size * 0.55228
-                    # 计算起点的手柄向量
-                    v_start = p_start.normalized()
-                    h_start = v_start.cross(Vector((0, 0, 1))).normalized() * handle_len
-                    p0.handle_right, p0.handle_left = p0.co + h_start, p0.co - h_start
-                    # 计算终点的手柄向量
-                    v_end = p_end.normalized()
-                    h_end = v_end.cross(Vector((0, 0, 1))).normalized() * handle_len
-                    p1.handle_left, p1.handle_right = p1.co - h_end, p1.co + h_end
-                    # 设置手柄类型为对齐，以确保曲线平滑
-                    p0.handle_left_type = p0.handle_right_type = "ALIGNED"
-                    p1.handle_left_type = p1.handle_right_type = "ALIGNED"
-
-            if not controller:
-                continue
-
-            controller.name = ctrl_name
-            new_controllers[config.bone_name] = controller
-
-            for coll in controller.users_collection:
-                coll.objects.unlink(controller)
-            ctrl_collection.objects.link(controller)
-
-        context.view_layer.objects.active = armature
-        bpy.ops.object.mode_set(mode="POSE")
-
-        for config in BONE_CONFIGS:
-            pose_bone = armature.pose.bones.get(config.bone_name)
-            if not pose_bone:
-                continue
-
-            controller = new_controllers.get(config.bone_name)
-            if not controller:
-                continue
-
-            pose_bone.custom_shape = None
-
-            controller.matrix_world = armature.matrix_world @ pose_bone.matrix
-
-            pose_bone.custom_shape = controller
-
-            if config.shape_rotation_euler == "GLOBAL_HORIZONTAL":
-                bone_rotation_matrix = pose_bone.matrix.to_3x3()
-                inverse_rotation_matrix = bone_rotation_matrix.inverted()
-                target_rotation_matrix = Euler((0, 0, 0), "XYZ").to_matrix().to_3x3()
-                final_rotation_matrix = inverse_rotation_matrix @ target_rotation_matrix
-                pose_bone.custom_shape_rotation_euler = final_rotation_matrix.to_euler(
-                    "XYZ"
-                )
-            else:
-                pose_bone.custom_shape_rotation_euler = config.shape_rotation_euler
-
-            direction_vec = Vector(config.offset_direction)
-            offset_vector = direction_vec * pose_bone.length * config.offset_multiplier
-            pose_bone.custom_shape_translation = offset_vector
-
-            pose_bone.use_custom_shape_bone_size = False
-            armature.data.bones[pose_bone.name].show_wire = True  # pyright: ignore[reportAttributeAccessIssue]
-
-            controller.hide_select = True
-            controller.hide_viewport = True
-
-        bpy.ops.object.mode_set(mode="OBJECT")
-
-        self.report({"INFO"}, "控制器已清理并重新生成。")
+        try:
+            assets = linked_assets(context)
+        except OSError as e:
+            self.report({"ERROR"}, f"无法使用共享资产库：{e}")
+            return {"CANCELLED"}
+
+        result = generate_controllers(armature, context.scene, self.mode, assets)
+
+        if result.missing:
+            self.report(
+                {"WARNING"},
+                f"{len(result.missing)} 根配置骨骼未找到，已跳过："
+                + ", ".join(result.missing),
+            )
+
+        if not result.placed:
+            self.report({"INFO"}, f"控制器均未变化，已跳过 {result.skipped} 个。")
+            return {"FINISHED"}
+
+        self.report(
+            {"INFO"},
+            f"已重新生成 {result.placed} 个控制器，"
+            f"跳过 {result.skipped} 个未变化的控制器。",
+        )
         return {"FINISHED"}
@@ -1,4 +1,25 @@
 import bpy
+from ..utils.bone_resolver import hidden_bone_mask
+from ..utils.display_state import store_snapshot
+from ..utils.playback_mode import enable_playback_mode, measure_playback_fps
+from ..utils.pose_math import read_bools, write_bools
+from ..utils.profiling import phase, profiled
+
+
+def optimize_skeleton_display(armature) -> int:
+    """隐藏所有以 _Handle 结尾的骨骼和指定的耳朵骨骼，返回隐藏的骨骼数量
+
+    需要隐藏的骨骼按骨架缓存，用一次 foreach_set 写入所有骨骼的 hide。
+    隐藏前的可见性会保存为快照，供反向优化时精确恢复。
+    """
+    store_snapshot(armature)
+
+    bones = armature.data.bones
+    mask = hidden_bone_mask(armature)
+    write_bools(bones, "hide", read_bools(bones, "hide") | mask)
+    # foreach_set 不会触发 RNA 更新，手动标记以刷新视图
+    armature.update_tag()
+    return int(mask.sum())
 
 
 class UMA_TOOL_OT_optimize_skeleton_display(bpy.types.Operator):
@@ -8,6 +29,27 @@ class UMA_TOOL_OT_optimize_skeleton_display(bpy.types.Operator):
     bl_label = "优化骨骼显示"
     bl_options = {"REGISTER", "UNDO"}
 
+    playback_mode: bpy.props.BoolProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="播放性能模式",
+        description="同时简化骨骼显示、关闭前端显示和细分/实体化/描边修改器，"
+        "反向优化时恢复原状",
+        default=False,
+    )
+    measure_frames: bpy.props.IntProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="测量帧数",
+        description="开启播放性能模式前后各步进这么多帧并报告求值帧率，0 表示不测量",
+        default=24,
+        min=0,
+    )
+    bone_display_type: bpy.props.EnumProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="骨骼显示",
+        items=[
+            ("STICK", "棍状", ""),
+            ("WIRE", "线框", ""),
+        ],
+        default="STICK",
+    )
+
     @classmethod
     def poll(cls, context):
         return (
@@ -15,22 +57,35 @@ class UMA_TOOL_OT_optimize_skeleton_display(bpy.types.Operator):
             and context.active_object.type == "ARMATURE"
         )
 
+    @profiled
     def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
         armature = context.active_object
-        if context.mode != "OBJECT":
-            bpy.ops.object.mode_set(mode="OBJECT")
-
-        hidden_count = 0
-        bones_to_hide = [
-            "Sp_He_Ear0_R_01",
-            "Sp_He_Ear0_R_02",
-            "Sp_He_Ear0_L_01",
-            "Sp_He_Ear0_L_02",
-        ]
-        for bone in armature.data.bones:  # pyright: ignore[reportAttributeAccessIssue]
-            if bone.name.endswith("_Handle") or bone.name in bones_to_hide:
-                bone.hide = True
-                hidden_count += 1
+        # 编辑模式下退出时编辑骨骼会覆盖数据层骨骼的 hide
+        if context.mode == "EDIT_ARMATURE":
+            with phase("模式切换"):
+                bpy.ops.object.mode_set(mode="OBJECT")
+
+        with phase("隐藏骨骼"):
+            hidden_count = optimize_skeleton_display(armature)
+
+        if self.playback_mode:
+            scene = context.scene
+            with phase("测量帧率"):
+                before = measure_playback_fps(
+                    scene, self.measure_frames, scene.frame_current
+                )
+            changed_count = enable_playback_mode(
+                armature, scene, self.bone_display_type
+            )
+            with phase("测量帧率"):
+                after = measure_playback_fps(
+                    scene, self.measure_frames, scene.frame_current
+                )
+            message = f"已隐藏 {hidden_count} 根骨骼，播放性能模式修改了 {changed_count} 项设置"
+            if before and after:
+                message += f"，求值帧率 {before:.1f} → {after:.1f} fps"
+            self.report({"INFO"}, message + "。")
+            return {"FINISHED"}
 
         self.report({"INFO"}, f"已隐藏 {hidden_count} 根骨骼。")
         return {"FINISHED"}
@@ -0,0 +1,128 @@
+import bpy
+from ..utils.pose_store import apply_pose, pose_names, remove_pose, save_pose
+from ..utils.profiling import phase, profiled
+
+# 动态枚举项的字符串必须保持引用，否则 Blender 可能读到已释放的内存
+_pose_items = []
+_blend_items = []
+
+# 混合姿态的枚举标识符都带此前缀，"不混合" 项不带，因此不会与任何姿态名冲突。
+# （空标识符在枚举中表示分隔线，不能用作 "不混合"。）
+_BLEND_PREFIX = "POSE:"
+_NO_BLEND = "NONE"
+
+
+def _pose_enum_items(self, context):
+    global _pose_items
+    names = pose_names(context.active_object) if _armature_poll(context) else []
+    _pose_items = [(name, name, "") for name in names]
+    return _pose_items
+
+
+def _blend_enum_items(self, context):
+    global _blend_items
+    names = pose_names(context.active_object) if _armature_poll(context) else []
+    _blend_items = [(_NO_BLEND, "不混合", "")] + [
+        (_BLEND_PREFIX + name, name, "") for name in names
+    ]
+    return _blend_items
+
+
+def _armature_poll(context):
+    return (
+        context.active_object is not None and context.active_object.type == "ARMATURE"
+    )
+
+
+class UMA_TOOL_OT_save_pose(bpy.types.Operator):
+    """把所有姿态骨骼的位置、旋转和缩放保存为命名姿态"""
+
+    bl_idname = "uma_tool.save_pose"
+    bl_label = "保存姿态"
+    bl_options = {"REGISTER", "UNDO"}
+
+    name: bpy.props.StringProperty(name="名称", default="姿态")  # pyright: ignore[reportInvalidTypeForm]
+
+    @classmethod
+    def poll(cls, context):
+        return _armature_poll(context)
+
+    def invoke(self, context, event):  # pyright: ignore[reportIncompatibleMethodOverride]
+        return context.window_manager.invoke_props_dialog(self)
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        if not self.name:
+            self.report({"WARNING"}, "姿态名称不能为空。")
+            return {"CANCELLED"}
+
+        with phase("保存姿态"):
+            save_pose(context.active_object, self.name)
+
+        self.report({"INFO"}, f"已保存姿态 '{self.name}'。")
+        return {"FINISHED"}
+
+
+class UMA_TOOL_OT_apply_pose(bpy.types.Operator):
+    """一次写回命名姿态中所有姿态骨骼的变换，可与第二个姿态混合"""
+
+    bl_idname = "uma_tool.apply_pose"
+    bl_label = "应用姿态"
+    bl_options = {"REGISTER", "UNDO"}
+
+    pose: bpy.props.EnumProperty(name="姿态", items=_pose_enum_items)  # pyright: ignore[reportInvalidTypeForm]
+    blend_pose: bpy.props.EnumProperty(name="混合姿态", items=_blend_enum_items)  # pyright: ignore[reportInvalidTypeForm]
+    factor: bpy.props.FloatProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="混合",
+        default=0.5,
+        min=0.0,
+        max=1.0,
+        subtype="FACTOR",
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return _armature_poll(context) and bool(pose_names(context.active_object))
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        blend_name = self.blend_pose.removeprefix(_BLEND_PREFIX)
+        if self.blend_pose == _NO_BLEND:
+            blend_name = ""
+        with phase("应用姿态"):
+            applied = apply_pose(
+                context.active_object, self.pose, blend_name, self.factor
+            )
+
+        if not applied:
+            self.report({"WARNING"}, f"姿态 '{self.pose}' 与当前骨骼不一致，未应用。")
+            return {"CANCELLED"}
+
+        if blend_name:
+            self.report(
+                {"INFO"},
+                f"已应用姿态 '{self.pose}' 与 '{blend_name}' 的混合（{self.factor:.0%}）。",
+            )
+        else:
+            self.report({"INFO"}, f"已应用姿态 '{self.pose}'。")
+        return {"FINISHED"}
+
+
+class UMA_TOOL_OT_remove_pose(bpy.types.Operator):
+    """删除命名姿态"""
+
+    bl_idname = "uma_tool.remove_pose"
+    bl_label = "删除姿态"
+    bl_options = {"REGISTER", "UNDO"}
+
+    pose: bpy.props.EnumProperty(name="姿态", items=_pose_enum_items)  # pyright: ignore[reportInvalidTypeForm]
+
+    @classmethod
+    def poll(cls, context):
+        return _armature_poll(context) and bool(pose_names(context.active_object))
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        remove_pose(context.active_object, self.pose)
+        self.report({"INFO"}, f"已删除姿态 '{self.pose}'。")
+        return {"FINISHED"}
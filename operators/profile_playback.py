@@ -0,0 +1,150 @@
+import bpy
+import json
+import time
+
+import numpy as np
+
+from ..utils.profiling import phase, profiled
+
+
+def animation_frame_range(armature, scene) -> tuple[int, int]:
+    """骨架动作的帧范围，没有动作时使用场景帧范围"""
+    animation_data = armature.animation_data if armature is not None else None
+    if animation_data is not None and animation_data.action is not None:
+        start, end = animation_data.action.frame_range
+        return int(start), int(end)
+    return scene.frame_start, scene.frame_end
+
+
+def _object_eval_ms(depsgraph, obj, repeat: int) -> float:
+    """单独标记一个物体并重新求值的平均耗时（包含依赖它的物体）"""
+    timings = []
+    for _ in range(repeat):
+        obj.update_tag(refresh={"OBJECT", "DATA"})
+        start = time.perf_counter()
+        depsgraph.update()
+        timings.append(time.perf_counter() - start)
+    return float(np.mean(timings)) * 1000
+
+
+def profile_playback(
+    scene, view_layer, frames: int, start_frame: int, object_repeat: int = 5
+) -> dict:
+    """逐帧步进时间线，统计依赖图每帧的求值耗时以及各物体的求值耗时
+
+    不依赖 UI 上下文，可在后台模式中直接调用。frames 为负数时抛出 ValueError。
+    """
+    if frames < 0:
+        raise ValueError(f"帧数不能为负数：{frames}")
+    depsgraph = view_layer.depsgraph
+    original_frame = scene.frame_current
+    frame_times = np.empty(frames)
+    updated_frames: dict[str, int] = {}
+    # 回调在 frame_set 内部执行，记录其耗时并从每帧耗时中扣除
+    handler_seconds = [0.0]
+
+    def collect_updates(handler_scene, handler_depsgraph):
+        # frame_set 返回后更新标记已被清除，只能在求值后的回调中读取
+        start = time.perf_counter()
+        if handler_depsgraph.view_layer.name == view_layer.name:
+            for update in handler_depsgraph.updates:
+                if isinstance(update.id, bpy.types.Object):
+                    name = update.id.original.name
+                    updated_frames[name] = updated_frames.get(name, 0) + 1
+        handler_seconds[0] += time.perf_counter() - start
+
+    scene.frame_set(start_frame - 1)
+    bpy.app.handlers.frame_change_post.append(collect_updates)
+    try:
+        for i in range(frames):
+            handler_seconds[0] = 0.0
+            start = time.perf_counter()
+            scene.frame_set(start_frame + i)
+            frame_times[i] = time.perf_counter() - start - handler_seconds[0]
+    finally:
+        bpy.app.handlers.frame_change_post.remove(collect_updates)
+
+    # 只有每帧都在变化的物体才影响播放，逐个单独求值得到它们的耗时
+    objects = []
+    for name, count in updated_frames.items():
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            continue
+        objects.append(
+            {
+                "name": name,
+                "type": obj.type,
+                "updated_frames": count,
+                "eval_ms": round(_object_eval_ms(depsgraph, obj, object_repeat), 4),
+            }
+        )
+    objects.sort(key=lambda entry: entry["eval_ms"], reverse=True)
+
+    scene.frame_set(original_frame)
+
+    frame_ms = frame_times * 1000
+    mean_ms = float(frame_ms.mean()) if frames else 0.0
+    return {
+        "frames": frames,
+        "start_frame": start_frame,
+        "mean_ms": round(mean_ms, 4),
+        "p95_ms": round(float(np.percentile(frame_ms, 95)), 4) if frames else 0.0,
+        "max_ms": round(float(frame_ms.max()), 4) if frames else 0.0,
+        "fps": round(1000 / mean_ms, 2) if mean_ms else 0.0,
+        "objects": objects,
+    }
+
+
+class UMA_TOOL_OT_profile_playback(bpy.types.Operator):
+    """逐帧播放当前骨架的动画，统计依赖图求值耗时"""
+
+    bl_idname = "uma_tool.profile_playback"
+    bl_label = "播放性能分析"
+    bl_options = {"REGISTER"}
+
+    frames: bpy.props.IntProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="帧数",
+        description="从动画起始帧开始步进的帧数，0 表示整个动画",
+        default=0,
+        min=0,
+    )
+    output_path: bpy.props.StringProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="输出文件",
+        description="把完整结果保存为 JSON，留空则只在信息栏报告",
+        subtype="FILE_PATH",
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return (
+            context.active_object is not None
+            and context.active_object.type == "ARMATURE"
+        )
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        scene = context.scene
+        start, end = animation_frame_range(context.active_object, scene)
+        frames = self.frames or end - start + 1
+        if frames <= 0:
+            self.report({"WARNING"}, f"动画帧范围无效：{start} - {end}。")
+            return {"CANCELLED"}
+
+        with phase("逐帧求值"):
+            stats = profile_playback(scene, context.view_layer, frames, start)
+
+        if self.output_path:
+            with open(bpy.path.abspath(self.output_path), "w", encoding="utf-8") as f:
+                json.dump(stats, f, ensure_ascii=False, indent=2)
+
+        slowest = "，".join(
+            f"{entry['name']} {entry['eval_ms']:.2f} ms"
+            for entry in stats["objects"][:3]
+        )
+        self.report(
+            {"INFO"},
+            f"{stats['frames']} 帧：平均 {stats['mean_ms']:.2f} ms，"
+            f"p95 {stats['p95_ms']:.2f} ms（{stats['fps']:.1f} fps）"
+            + (f"；最慢：{slowest}" if slowest else ""),
+        )
+        return {"FINISHED"}
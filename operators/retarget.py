@@ -0,0 +1,107 @@
+import math
+
+import bpy
+
+from ..config.retarget_config import RETARGET_MAPS
+from ..utils.profiling import profiled
+from ..utils.retarget import retarget
+from .profile_playback import animation_frame_range
+
+
+def _source_armature(context):
+    """选中的另一个骨架，作为重定向的源"""
+    target = context.active_object
+    return next(
+        (
+            obj
+            for obj in context.selected_objects
+            if obj.type == "ARMATURE" and obj != target
+        ),
+        None,
+    )
+
+
+class UMA_TOOL_OT_retarget(bpy.types.Operator):
+    """把另一个选中骨架（MMD、动捕等）的动作重定向到活动的赛马娘骨架
+
+    骨骼映射表在 config/retarget_config.py 中配置。
+    """
+
+    bl_idname = "uma_tool.retarget"
+    bl_label = "重定向动作"
+    bl_options = {"REGISTER", "UNDO"}
+
+    preset: bpy.props.EnumProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="映射表",
+        items=[(name, name, "") for name in RETARGET_MAPS],
+    )
+    frame_start: bpy.props.IntProperty(name="起始帧", default=1)  # pyright: ignore[reportInvalidTypeForm]
+    frame_end: bpy.props.IntProperty(name="结束帧", default=250)  # pyright: ignore[reportInvalidTypeForm]
+    reduce: bpy.props.BoolProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="简化关键帧",
+        default=True,
+    )
+    rotation_tolerance: bpy.props.FloatProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="旋转容差",
+        default=math.radians(0.1),
+        min=0.0,
+        precision=3,
+        subtype="ANGLE",
+    )
+    location_tolerance: bpy.props.FloatProperty(  # pyright: ignore[reportInvalidTypeForm]
+        name="位置容差",
+        default=1e-4,
+        min=0.0,
+        precision=5,
+        subtype="DISTANCE",
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return (
+            context.active_object is not None
+            and context.active_object.type == "ARMATURE"
+            and _source_armature(context) is not None
+        )
+
+    def invoke(self, context, event):  # pyright: ignore[reportIncompatibleMethodOverride]
+        self.frame_start, self.frame_end = animation_frame_range(
+            _source_armature(context), context.scene
+        )
+        return context.window_manager.invoke_props_dialog(self)
+
+    @profiled
+    def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
+        if self.frame_end < self.frame_start:
+            self.report({"WARNING"}, "结束帧不能早于起始帧。")
+            return {"CANCELLED"}
+
+        source = _source_armature(context)
+        result = retarget(
+            source,
+            context.active_object,
+            context.scene,
+            self.preset,
+            self.frame_start,
+            self.frame_end,
+            self.reduce,
+            self.rotation_tolerance,
+            self.location_tolerance,
+        )
+
+        if result.missing:
+            self.report(
+                {"WARNING"},
+                f"{len(result.missing)} 个映射项未找到，已跳过："
+                + ", ".join(result.missing),
+            )
+        if not result.bones:
+            self.report({"ERROR"}, f"'{source.name}' 与映射表 {self.preset} 不匹配。")
+            return {"CANCELLED"}
+
+        self.report(
+            {"INFO"},
+            f"已从 '{source.name}' 重定向 {result.bones} 根骨骼、{result.frames} 帧，"
+            f"写入 {result.keys} 个关键帧。",
+        )
+        return {"FINISHED"}
@@ -1,8 +1,34 @@
 import bpy
+from ..utils.bone_resolver import hidden_bone_mask
+from ..utils.display_state import pop_snapshot, restore_hidden_state
+from ..utils.pose_math import read_bools, write_bools
+from ..utils.playback_mode import disable_playback_mode
+from ..utils.profiling import phase, profiled
+
+
+def revert_skeleton_display(armature) -> int:
+    """恢复优化前的骨骼可见性，返回显示的骨骼数量
+
+    有优化时保存的快照时一次写回快照，之前被隐藏的骨骼保持隐藏；
+    没有快照或骨骼已发生变化时，显示所有以 _Handle 结尾的骨骼和指定的耳朵骨骼。
+    """
+    snapshot = pop_snapshot(armature)
+    if snapshot is not None:
+        shown_count = restore_hidden_state(armature, snapshot)
+        if shown_count is not None:
+            return shown_count
+
+    bones = armature.data.bones
+    mask = hidden_bone_mask(armature)
+    hidden = read_bools(bones, "hide")
+    write_bools(bones, "hide", hidden & ~mask)
+    # foreach_set 不会触发 RNA 更新，手动标记以刷新视图
+    armature.update_tag()
+    return int((hidden & mask).sum())
 
 
 class UMA_TOOL_OT_revert_skeleton_display(bpy.types.Operator):
-    """显示所有以 _Handle 结尾的骨骼和指定的耳朵骨骼"""
+    """恢复优化骨骼显示之前的骨骼可见性"""
 
     bl_idname = "uma_tool.revert_skeleton_display"
     bl_label = "反向优化骨骼显示"
@@ -15,22 +41,23 @@ class UMA_TOOL_OT_revert_skeleton_display(bpy.types.Operator):
             and context.active_object.type == "ARMATURE"
         )
 
+    @profiled
     def execute(self, context):  # pyright: ignore[reportIncompatibleMethodOverride]
         armature = context.active_object
-        if context.mode != "OBJECT":
-            bpy.ops.object.mode_set(mode="OBJECT")
-
-        shown_count = 0
-        bones_to_show = [
-            "Sp_He_Ear0_R_01",
-            "Sp_He_Ear0_R_02",
-            "Sp_He_Ear0_L_01",
-            "Sp_He_Ear0_L_02",
-        ]
-        for bone in armature.data.bones:  # pyright: ignore[reportAttributeAccessIssue]
-            if bone.name.endswith("_Handle") or bone.name in bones_to_show:
-                bone.hide = False
-                shown_count += 1
+        # 编辑模式下退出时编辑骨骼会覆盖数据层骨骼的 hide
+        if context.mode == "EDIT_ARMATURE":
+            with phase("模式切换"):
+                bpy.ops.object.mode_set(mode="OBJECT")
+
+        with phase("显示骨骼"):
+            shown_count = revert_skeleton_display(armature)
+
+        with phase("播放性能模式"):
+            restored = disable_playback_mode(armature)
+
+        if restored:
+            self.report({"INFO"}, f"已显示 {shown_count} 根骨骼，并退出播放性能模式。")
+            return {"FINISHED"}
 
         self.report({"INFO"}, f"已显示 {shown_count} 根骨骼。")
         return {"FINISHED"}
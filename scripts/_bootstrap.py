@@ -0,0 +1,72 @@
+"""Helpers shared by the scripts; nothing here imports bpy."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+# The script is in scripts/, so project root is one level up.
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# The addon directory name ("uma-tools") is not a valid module name, so the
+# package is imported under this name instead.
+ADDON_MODULE = "uma_tools"
+
+
+def load_addon():
+    """Import the addon package from the project root without installing it."""
+    if ADDON_MODULE in sys.modules:
+        return sys.modules[ADDON_MODULE]
+
+    spec = importlib.util.spec_from_file_location(
+        ADDON_MODULE,
+        PROJECT_ROOT / "__init__.py",
+        submodule_search_locations=[str(PROJECT_ROOT)],
+    )
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[ADDON_MODULE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def script_args() -> list[str]:
+    """Return the arguments passed after ``--`` on the Blender command line."""
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1 :]
+    return []
+
+
+def collect_blend_files(paths: list[str], recursive: bool) -> list[Path]:
+    files = []
+    for path_str in paths:
+        path = Path(path_str)
+        if path.is_dir():
+            pattern = "**/*.blend" if recursive else "*.blend"
+            files.extend(sorted(path.glob(pattern)))
+        elif path.suffix == ".blend":
+            files.append(path)
+        else:
+            print(f"Skipping {path}: not a .blend file or directory")
+    return files
+
+
+def output_path_for(path: Path, roots: list[str], output_dir: str | None) -> Path:
+    """Where the rigged copy of ``path`` is saved.
+
+    Under ``output_dir`` the path keeps its location relative to the input
+    directory it was found in, so same-named files from different folders
+    do not overwrite each other. Without ``output_dir`` the file is rigged
+    in place.
+    """
+    if not output_dir:
+        return path
+    for root in roots:
+        root_path = Path(root)
+        if root_path.is_dir() and path.is_relative_to(root_path):
+            return Path(output_dir) / path.relative_to(root_path)
+    return Path(output_dir) / path.name
+
+
+def summary_path_for(output_path: Path) -> Path:
+    """The JSON summary batch_rig.py writes for a rigged file."""
+    return output_path.with_name(output_path.name + ".uma.json")
@@ -0,0 +1,119 @@
+"""Procedural armatures that use the real Uma bone names, for benchmarks."""
+
+import bpy
+
+# (name, parent, head, tail) of the core body bones, roughly Uma-proportioned.
+_BODY = [
+    ("Hip", None, (0, 0, 0.90), (0, 0, 1.00)),
+    ("Waist", "Hip", (0, 0, 1.00), (0, 0, 1.10)),
+    ("Spine", "Waist", (0, 0, 1.10), (0, 0, 1.25)),
+    ("Chest", "Spine", (0, 0, 1.25), (0, 0, 1.40)),
+    ("Neck", "Chest", (0, 0, 1.40), (0, 0, 1.48)),
+    ("Head", "Neck", (0, 0, 1.48), (0, 0, 1.65)),
+]
+
+_BODY_NAMES = {spec[0] for spec in _BODY}
+
+# Side bones are built for "_R" (negative X) and mirrored to "_L".
+_SIDE = [
+    ("Shoulder", "Chest", (-0.03, 0, 1.38), (-0.12, 0, 1.38)),
+    ("Arm", "Shoulder", (-0.12, 0, 1.38), (-0.35, 0, 1.38)),
+    ("Elbow", "Arm", (-0.35, 0, 1.38), (-0.58, 0, 1.38)),
+    ("Wrist", "Elbow", (-0.58, 0, 1.38), (-0.64, 0, 1.38)),
+    ("Thumb_01", "Wrist", (-0.60, -0.02, 1.37), (-0.62, -0.04, 1.37)),
+    ("Thumb_02", "Thumb_01", (-0.62, -0.04, 1.37), (-0.64, -0.05, 1.37)),
+    ("Thumb_03", "Thumb_02", (-0.64, -0.05, 1.37), (-0.66, -0.06, 1.37)),
+    ("Index_01", "Wrist", (-0.64, -0.01, 1.38), (-0.67, -0.01, 1.38)),
+    ("Index_02", "Index_01", (-0.67, -0.01, 1.38), (-0.69, -0.01, 1.38)),
+    ("Index_03", "Index_02", (-0.69, -0.01, 1.38), (-0.71, -0.01, 1.38)),
+    ("Ring_01", "Wrist", (-0.64, 0.01, 1.38), (-0.67, 0.01, 1.38)),
+    ("Ring_02", "Ring_01", (-0.67, 0.01, 1.38), (-0.69, 0.01, 1.38)),
+    ("Ring_03", "Ring_02", (-0.69, 0.01, 1.38), (-0.71, 0.01, 1.38)),
+    ("Thigh", "Hip", (-0.09, 0, 0.90), (-0.09, 0, 0.50)),
+    ("Knee", "Thigh", (-0.09, 0, 0.50), (-0.09, 0, 0.10)),
+    ("Ankle", "Knee", (-0.09, 0, 0.10), (-0.09, -0.08, 0.02)),
+    ("Ear_01", "Head", (-0.06, 0, 1.62), (-0.08, 0, 1.68)),
+    ("Ear_02", "Ear_01", (-0.08, 0, 1.68), (-0.09, 0, 1.72)),
+    ("Ear_03", "Ear_02", (-0.09, 0, 1.72), (-0.10, 0, 1.75)),
+]
+
+
+def _mirror(point):
+    return (-point[0], point[1], point[2])
+
+
+def _bone_specs(side_separator: str, extra_handles: int, extra_spring_bones: int):
+    specs = list(_BODY)
+    for side, transform in (("R", lambda p: p), ("L", _mirror)):
+        suffix = f"{side_separator}{side}"
+
+        for base, parent, head, tail in _SIDE:
+            if parent not in _BODY_NAMES:
+                parent = f"{parent}{suffix}"
+            specs.append((f"{base}{suffix}", parent, transform(head), transform(tail)))
+
+        # Ear spring bones hidden by optimize_skeleton_display.
+        for i in range(3):
+            parent = "Head" if i == 0 else f"Sp_He_Ear0_{side}_{i - 1:02d}"
+            x = -0.05 if side == "R" else 0.05
+            head = (x, 0.0, 1.62 + 0.04 * i)
+            specs.append(
+                (f"Sp_He_Ear0_{side}_{i:02d}", parent, head, (x, 0.0, head[2] + 0.04))
+            )
+
+    # Tail chain used by BONE_CONFIGS, extended by the extra spring bones.
+    for i in range(3 + extra_spring_bones):
+        parent = "Hip" if i == 0 else f"Sp_Hi_Tail0_B_{i - 1:02d}"
+        head = (0.0, 0.1 + 0.05 * i, 0.95)
+        specs.append(
+            (f"Sp_Hi_Tail0_B_{i:02d}", parent, head, (0.0, head[1] + 0.05, 0.95))
+        )
+
+    body_names = [spec[0] for spec in specs]
+    for i in range(extra_handles):
+        parent = body_names[i % len(body_names)]
+        specs.append((f"{parent}_{i:04d}_Handle", parent, (0, 0, 1.0), (0, 0.02, 1.0)))
+
+    return specs
+
+
+def build_uma_armature(
+    name: str = "UmaBench",
+    side_separator: str = "_",
+    extra_handles: int = 0,
+    extra_spring_bones: int = 0,
+):
+    """Create and select an armature object with Uma bone names.
+
+    ``side_separator`` is "_" for Arm_R style names and "." for Arm.R.
+    """
+    context = bpy.context
+    if context.mode != "OBJECT":
+        bpy.ops.object.mode_set(mode="OBJECT")
+
+    data = bpy.data.armatures.new(name)
+    armature = bpy.data.objects.new(name, data)
+    context.scene.collection.objects.link(armature)
+    context.view_layer.objects.active = armature
+    armature.select_set(True)
+
+    bpy.ops.object.mode_set(mode="EDIT")
+    edit_bones = data.edit_bones
+    for bone_name, parent, head, tail in _bone_specs(
+        side_separator, extra_handles, extra_spring_bones
+    ):
+        bone = edit_bones.new(bone_name)
+        bone.head = head
+        bone.tail = tail
+        if parent is not None:
+            bone.parent = edit_bones[parent]
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    return armature
+
+
+def remove_armature(armature):
+    data = armature.data
+    bpy.data.objects.remove(armature, do_unlink=True)
+    if data.users == 0:
+        bpy.data.armatures.remove(data)
@@ -0,0 +1,197 @@
+#!/usr/bin/python3
+"""Rig every character .blend file in a directory without opening the UI.
+
+Run inside Blender:
+
+    blender --background --factory-startup --python scripts/batch_rig.py -- characters/ --recursive
+
+For every file this generates controllers and optimizes the skeleton display
+of each armature, creates the shader position node groups, saves the file and
+writes a JSON summary next to it (``<file>.uma.json``).
+"""
+
+import argparse
+import json
+import sys
+import traceback
+from pathlib import Path
+
+import bpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _bootstrap import (
+    collect_blend_files,
+    load_addon,
+    output_path_for,
+    script_args,
+    summary_path_for,
+)
+
+
+def rig_current_file(args) -> dict:
+    """Run the addon's core steps on every armature of the open file."""
+    from uma_tools.operators.create_shader_nodes import ensure_position_nodegroups  # pyright: ignore[reportMissingImports]
+    from uma_tools.operators.generate_controllers import generate_controllers  # pyright: ignore[reportMissingImports]
+    from uma_tools.operators.optimize_skeleton_display import (  # pyright: ignore[reportMissingImports]
+        optimize_skeleton_display,
+    )
+    from uma_tools.utils.asset_library import (  # pyright: ignore[reportMissingImports]
+        adopt_linked_assets,
+        link_asset_library,
+    )
+
+    assets = None
+    if args.asset_library:
+        assets = link_asset_library(args.asset_library)
+        adopt_linked_assets(assets)
+
+    scene = bpy.context.scene
+    armatures = []
+    for obj in scene.objects:
+        if obj.type != "ARMATURE":
+            continue
+        entry = {"name": obj.name}
+        if not args.no_controllers:
+            result = generate_controllers(obj, scene, args.mode, assets)
+            entry["controllers"] = result.placed
+            entry["unchanged"] = result.skipped
+            entry["missing_bones"] = result.missing
+        if not args.no_optimize:
+            entry["hidden_bones"] = optimize_skeleton_display(obj)
+        armatures.append(entry)
+
+    node_groups = []
+    if not args.no_shader_nodes:
+        node_groups = [
+            group.name for group in ensure_position_nodegroups(assets=assets)
+        ]
+
+    return {
+        "armatures": armatures,
+        "node_groups": node_groups,
+        "asset_library": assets.library.filepath if assets is not None else None,
+    }
+
+
+def profile_current_file(frames: int) -> dict:
+    from uma_tools.operators.profile_playback import (  # pyright: ignore[reportMissingImports]
+        animation_frame_range,
+        profile_playback,
+    )
+
+    context = bpy.context
+    armature = next((o for o in context.scene.objects if o.type == "ARMATURE"), None)
+    start, _ = animation_frame_range(armature, context.scene)
+    return profile_playback(context.scene, context.view_layer, frames, start)
+
+
+def ensure_object_mode():
+    """Leave edit or pose mode the file was saved in; controllers need object mode."""
+    context = bpy.context
+    obj = context.view_layer.objects.active
+    if obj is not None and obj.mode != "OBJECT":
+        with context.temp_override(active_object=obj, object=obj):
+            bpy.ops.object.mode_set(mode="OBJECT")
+
+    still_editing = [o.name for o in context.scene.objects if o.mode == "EDIT"]
+    if still_editing:
+        raise RuntimeError("Could not leave edit mode for: " + ", ".join(still_editing))
+
+
+def process_file(path: Path, args) -> dict:
+    output_path = output_path_for(path, args.paths, args.output_dir)
+    summary = {"file": str(path), "output": str(output_path), "status": "ok"}
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    from uma_tools.utils.profiling import phase, timing  # pyright: ignore[reportMissingImports]
+
+    with timing(path.name) as timer:
+        try:
+            with phase("打开文件"):
+                bpy.ops.wm.open_mainfile(filepath=str(path))
+                ensure_object_mode()
+            if args.profile_playback:
+                with phase("播放性能分析"):
+                    playback_before = profile_current_file(args.profile_playback)
+            summary.update(rig_current_file(args))
+            if args.profile_playback:
+                with phase("播放性能分析"):
+                    summary["playback"] = {
+                        "before": playback_before,
+                        "after": profile_current_file(args.profile_playback),
+                    }
+            if not args.dry_run:
+                with phase("保存文件"):
+                    bpy.ops.wm.save_as_mainfile(filepath=str(output_path))
+        except Exception as e:
+            summary["status"] = "error"
+            summary["error"] = f"{type(e).__name__}: {e}"
+            summary["traceback"] = traceback.format_exc()
+
+    summary["seconds"] = round(timer.total, 3)
+    summary["phases_ms"] = timer.record()["phases_ms"]
+
+    with open(summary_path_for(output_path), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rig character .blend files with the Uma tools in background mode."
+    )
+    parser.add_argument("paths", nargs="+", help=".blend files or directories.")
+    parser.add_argument(
+        "--recursive", action="store_true", help="Search directories recursively."
+    )
+    parser.add_argument(
+        "--output-dir", help="Save rigged copies here instead of overwriting."
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("INCREMENTAL", "FULL"),
+        default="INCREMENTAL",
+        help="Controller regeneration mode.",
+    )
+    parser.add_argument("--no-controllers", action="store_true")
+    parser.add_argument("--no-optimize", action="store_true")
+    parser.add_argument("--no-shader-nodes", action="store_true")
+    parser.add_argument(
+        "--asset-library",
+        metavar="DIR",
+        help="Link node groups and controller shapes from a shared .blend in DIR "
+        "(generated on first use) instead of creating local copies.",
+    )
+    parser.add_argument(
+        "--profile-playback",
+        type=int,
+        default=0,
+        metavar="FRAMES",
+        help="Profile playback over this many frames before and after rigging.",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Rig but do not save the files."
+    )
+    args = parser.parse_args(script_args())
+    if args.profile_playback < 0:
+        parser.error("--profile-playback must not be negative")
+
+    load_addon()
+
+    files = collect_blend_files(args.paths, args.recursive)
+    print(f"Rigging {len(files)} file(s)")
+
+    failed = 0
+    for path in files:
+        summary = process_file(path, args)
+        if summary["status"] != "ok":
+            failed += 1
+        print(f"[{summary['status']}] {path} ({summary['seconds']}s)")
+
+    print(f"Done: {len(files) - failed} ok, {failed} failed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
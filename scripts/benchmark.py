@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""Reproducible benchmarks on synthetic Uma armatures.
+
+Each size adds that many extra bones (half ``*_Handle``, half ``Sp_*`` tail
+bones) to an armature with every bone name from BONE_CONFIGS, then times the
+addon's core steps. Run inside Blender:
+
+    blender --background --factory-startup --python scripts/benchmark.py -- --sizes 0 500 5000 --output bench.json
+    blender --background --factory-startup --python scripts/benchmark.py -- --baseline bench.json
+
+With ``--baseline`` the run fails when a case is slower than the baseline by
+more than ``--threshold``.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _bootstrap import load_addon, script_args
+from _synthetic_rig import build_uma_armature, remove_armature
+
+# Regressions below this many milliseconds are treated as timer noise.
+NOISE_FLOOR_MS = 0.5
+
+
+def measure(run, repeat: int, setup=None) -> dict:
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(timings), 4),
+        "median_ms": round(statistics.median(timings), 4),
+    }
+
+
+def remove_node_groups(names):
+    for name in names:
+        group = bpy.data.node_groups.get(name)
+        if group is not None:
+            bpy.data.node_groups.remove(group)
+
+
+def benchmark_size(extra_bones: int, repeat: int) -> dict:
+    from uma_tools.operators.create_shader_nodes import ensure_position_nodegroups  # pyright: ignore[reportMissingImports]
+    from uma_tools.operators.generate_controllers import generate_controllers  # pyright: ignore[reportMissingImports]
+    from uma_tools.operators.optimize_skeleton_display import (  # pyright: ignore[reportMissingImports]
+        optimize_skeleton_display,
+    )
+    from uma_tools.operators.revert_skeleton_display import (  # pyright: ignore[reportMissingImports]
+        revert_skeleton_display,
+    )
+
+    scene = bpy.context.scene
+    armature = build_uma_armature(
+        extra_handles=extra_bones // 2,
+        extra_spring_bones=extra_bones - extra_bones // 2,
+    )
+
+    def clear_custom_shapes():
+        for pose_bone in armature.pose.bones:
+            pose_bone.custom_shape = None
+
+    group_names = [group.name for group in ensure_position_nodegroups()]
+
+    results = {
+        "bones": len(armature.data.bones),
+        "generate_controllers_full": measure(
+            lambda: generate_controllers(armature, scene, "FULL"),
+            repeat,
+            setup=clear_custom_shapes,
+        ),
+        "generate_controllers_noop": measure(
+            lambda: generate_controllers(armature, scene, "INCREMENTAL"), repeat
+        ),
+        "optimize_skeleton_display": measure(
+            lambda: optimize_skeleton_display(armature), repeat
+        ),
+        "revert_skeleton_display": measure(
+            lambda: revert_skeleton_display(armature), repeat
+        ),
+        "create_node_groups": measure(
+            ensure_position_nodegroups,
+            repeat,
+            setup=lambda: remove_node_groups(group_names),
+        ),
+    }
+
+    remove_armature(armature)
+    return results
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for size, cases in results["sizes"].items():
+        baseline_cases = baseline.get("sizes", {}).get(size, {})
+        for case, timing in cases.items():
+            if not isinstance(timing, dict) or case not in baseline_cases:
+                continue
+            current = timing["median_ms"]
+            previous = baseline_cases[case]["median_ms"]
+            if current > previous * threshold and current - previous > NOISE_FLOOR_MS:
+                regressions.append(
+                    f"{case} @ +{size} bones: {previous:.3f} ms -> {current:.3f} ms"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Uma tools on synthetic armatures."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[0, 100, 1000, 5000],
+        help="Extra *_Handle/Sp_* bones added on top of the Uma bones.",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare against an earlier JSON result.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Allowed slowdown factor against the baseline.",
+    )
+    args = parser.parse_args(script_args())
+
+    addon = load_addon()
+    results = {
+        "blender": bpy.app.version_string,
+        "addon": ".".join(str(v) for v in addon.bl_info["version"]),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "sizes": {},
+    }
+
+    for size in args.sizes:
+        cases = benchmark_size(size, args.repeat)
+        results["sizes"][str(size)] = cases
+        print(f"+{size} bones ({cases['bones']} total)")
+        for case, timing in cases.items():
+            if isinstance(timing, dict):
+                print(f"  {case:<28} {timing['median_ms']:10.3f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""Compare operator-based controller shape creation with the data-API builder.
+
+Run inside Blender:
+
+    blender --background --factory-startup --python scripts/benchmark_controller_shapes.py -- --count 76 --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _bootstrap import load_addon, script_args  # noqa: E402
+
+
+def create_with_operators(shape: str, size: float):
+    """The shape creation used before the data-API builder."""
+    context = bpy.context
+    if shape == "SQUARE":
+        bpy.ops.curve.primitive_bezier_circle_add(
+            radius=size, enter_editmode=False, align="WORLD", location=(0, 0, 0)
+        )
+        controller = context.active_object
+        bpy.ops.object.mode_set(mode="EDIT")
+        bpy.ops.curve.select_all(action="SELECT")
+        bpy.ops.curve.handle_type_set(type="VECTOR")
+        bpy.ops.object.mode_set(mode="OBJECT")
+        return controller
+
+    if shape == "ARROW_CIRCLE":
+        # Only the object creation went through an operator; the splines were
+        # filled in afterwards, which the builder does the same way.
+        bpy.ops.object.add(type="CURVE", location=(0, 0, 0))
+        controller = context.active_object
+        controller.data.splines.clear()  # pyright: ignore[reportAttributeAccessIssue]
+        curve_shapes = sys.modules["uma_tools.utils.curve_shapes"]
+        curve_shapes._build_arrow_circle(controller.data, size)
+        return controller
+
+    bpy.ops.curve.primitive_bezier_circle_add(
+        radius=size, enter_editmode=False, align="WORLD", location=(0, 0, 0)
+    )
+    return context.active_object
+
+
+def create_with_data_api(shape: str, size: float, collection):
+    curve_shapes = sys.modules["uma_tools.utils.curve_shapes"]
+    curve = curve_shapes.build_controller_curve("CTRL_bench", shape, size)
+    controller = bpy.data.objects.new("CTRL_bench", curve)
+    collection.objects.link(controller)
+    return controller
+
+
+def clear_controllers():
+    for obj in list(bpy.data.objects):
+        if obj.name.startswith(("CTRL_bench", "BezierCircle", "Curve")):
+            bpy.data.objects.remove(obj, do_unlink=True)
+    for curve in list(bpy.data.curves):
+        if curve.users == 0:
+            bpy.data.curves.remove(curve)
+
+
+def run(label, create, shapes, repeat):
+    timings = []
+    for _ in range(repeat):
+        clear_controllers()
+        start = time.perf_counter()
+        for shape in shapes:
+            create(shape)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"{label:<12} best {best * 1000:9.2f} ms  ({len(shapes)} controllers)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark controller shape creation inside Blender."
+    )
+    parser.add_argument("--count", type=int, default=76, help="Controllers per run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per method.")
+    args = parser.parse_args(script_args())
+
+    load_addon()
+    from uma_tools.utils.curve_shapes import SHAPE_TYPES  # pyright: ignore[reportMissingImports]
+
+    shapes = [SHAPE_TYPES[i % len(SHAPE_TYPES)] for i in range(args.count)]
+    collection = bpy.context.scene.collection
+
+    operators = run(
+        "operators", lambda shape: create_with_operators(shape, 1.0), shapes, args.repeat
+    )
+    data_api = run(
+        "data API",
+        lambda shape: create_with_data_api(shape, 1.0, collection),
+        shapes,
+        args.repeat,
+    )
+    clear_controllers()
+
+    print(f"speedup      {operators / data_api:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+"""Time the full controller generation against the previous mode-switching flow.
+
+Run inside Blender, either on a synthetic armature with the Uma bone names or
+on the first armature of an existing character file:
+
+    blender --background --factory-startup --python scripts/benchmark_generate_controllers.py -- --repeat 5
+    blender --background character.blend --python scripts/benchmark_generate_controllers.py
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import bpy
+from mathutils import Euler, Vector
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _bootstrap import load_addon, script_args
+from _synthetic_rig import build_uma_armature
+from benchmark_controller_shapes import create_with_operators
+
+
+def legacy_generate_controllers(context, armature, configs):
+    """The generation flow before it became mode-switch free.
+
+    One operator-created curve per bone, then POSE mode for the assignment
+    and back to OBJECT mode.
+    """
+    if context.mode != "OBJECT":
+        bpy.ops.object.mode_set(mode="OBJECT")
+
+    collection = bpy.data.collections.get("Controllers")
+    if collection is None:
+        collection = bpy.data.collections.new("Controllers")
+        context.scene.collection.children.link(collection)
+
+    controllers = {}
+    for config in configs:
+        bone = armature.data.bones.get(config.bone_name)
+        if not bone:
+            continue
+        existing = bpy.data.objects.get(f"CTRL_{config.bone_name}")
+        if existing:
+            bpy.data.objects.remove(existing, do_unlink=True)
+
+        context.view_layer.objects.active = armature
+        length = bone.length if bone.length >= 0.001 else 0.1
+        controller = create_with_operators(
+            config.shape, length * config.radius_multiplier
+        )
+        controller.name = f"CTRL_{config.bone_name}"
+        for coll in controller.users_collection:
+            coll.objects.unlink(controller)
+        collection.objects.link(controller)
+        controllers[config.bone_name] = controller
+
+    context.view_layer.objects.active = armature
+    bpy.ops.object.mode_set(mode="POSE")
+
+    for config in configs:
+        pose_bone = armature.pose.bones.get(config.bone_name)
+        controller = controllers.get(config.bone_name)
+        if not pose_bone or not controller:
+            continue
+        controller.matrix_world = armature.matrix_world @ pose_bone.matrix
+        pose_bone.custom_shape = controller
+        if config.shape_rotation_euler == "GLOBAL_HORIZONTAL":
+            rotation = pose_bone.matrix.to_3x3().inverted()
+            pose_bone.custom_shape_rotation_euler = rotation.to_euler("XYZ")
+        else:
+            pose_bone.custom_shape_rotation_euler = Euler(config.shape_rotation_euler)
+        pose_bone.custom_shape_translation = (
+            Vector(config.offset_direction)
+            * pose_bone.length
+            * config.offset_multiplier
+        )
+        pose_bone.use_custom_shape_bone_size = False
+        armature.data.bones[pose_bone.name].show_wire = True
+        controller.hide_select = True
+        controller.hide_viewport = True
+
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+
+def clear_generated(armature):
+    for pose_bone in armature.pose.bones:
+        pose_bone.custom_shape = None
+    for obj in list(bpy.data.objects):
+        if obj.name.startswith("CTRL_"):
+            bpy.data.objects.remove(obj, do_unlink=True)
+    for curve in list(bpy.data.curves):
+        if curve.users == 0:
+            bpy.data.curves.remove(curve)
+
+
+def best_of(repeat, setup, run):
+    timings = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare controller generation with the legacy flow."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per method.")
+    args = parser.parse_args(script_args())
+
+    addon = load_addon()
+    addon.register()
+    from uma_tools.utils.bone_resolver import resolve_bone_configs  # pyright: ignore[reportMissingImports]
+
+    context = bpy.context
+    armature = next((o for o in bpy.data.objects if o.type == "ARMATURE"), None)
+    if armature is None:
+        armature = build_uma_armature()
+    context.view_layer.objects.active = armature
+    configs = [rule.config for rule in resolve_bone_configs(armature).rules]
+
+    legacy = best_of(
+        args.repeat,
+        lambda: clear_generated(armature),
+        lambda: legacy_generate_controllers(context, armature, configs),
+    )
+    full = best_of(
+        args.repeat,
+        lambda: clear_generated(armature),
+        lambda: bpy.ops.uma_tool.generate_controllers(mode="FULL"),
+    )
+    incremental = best_of(
+        args.repeat,
+        lambda: None,
+        lambda: bpy.ops.uma_tool.generate_controllers(mode="INCREMENTAL"),
+    )
+
+    print(f"armature        {armature.name} ({len(configs)} controllers)")
+    print(f"legacy flow     {legacy * 1000:9.2f} ms")
+    print(f"full            {full * 1000:9.2f} ms  ({legacy / full:.1f}x)")
+    print(f"no-op rerun     {incremental * 1000:9.2f} ms")
+
+    clear_generated(armature)
+    addon.unregister()
+
+
+if __name__ == "__main__":
+    main()
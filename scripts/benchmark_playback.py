@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""Measure playback frame rate of a character before and after playback mode.
+
+Open a character file and run inside Blender:
+
+    blender --background character.blend --python scripts/benchmark_playback.py -- --frames 250
+
+In background mode this measures depsgraph evaluation only (the modifiers
+playback mode turns off); viewport drawing costs such as bone display type
+and in-front drawing only show up when the same script is
+run from an interactive Blender session.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import bpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _bootstrap import load_addon, script_args
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare playback FPS with and without playback mode."
+    )
+    parser.add_argument("--frames", type=int, default=250, help="Frames to step.")
+    parser.add_argument("--armature", help="Armature object name (default: first).")
+    parser.add_argument("--display-type", choices=("STICK", "WIRE"), default="STICK")
+    args = parser.parse_args(script_args())
+
+    load_addon()
+    from uma_tools.utils.playback_mode import (  # pyright: ignore[reportMissingImports]
+        disable_playback_mode,
+        enable_playback_mode,
+        measure_playback_fps,
+    )
+
+    scene = bpy.context.scene
+    if args.armature:
+        armature = bpy.data.objects[args.armature]
+    else:
+        armature = next(o for o in scene.objects if o.type == "ARMATURE")
+
+    before = measure_playback_fps(scene, args.frames, scene.frame_start)
+    changed = enable_playback_mode(armature, scene, args.display_type)
+    after = measure_playback_fps(scene, args.frames, scene.frame_start)
+    disable_playback_mode(armature)
+
+    print(f"armature        {armature.name} ({changed} settings changed)")
+    print(f"normal          {before:8.1f} fps")
+    print(f"playback mode   {after:8.1f} fps  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+"""Compare EEVEE shader compile and render time of the position node groups.
+
+EEVEE keeps compiled shaders for the lifetime of the process, so each variant
+has to be measured in a fresh Blender:
+
+    blender --background --factory-startup --python scripts/benchmark_shader_compile.py -- --variant original
+    blender --background --factory-startup --python scripts/benchmark_shader_compile.py -- --variant compact
+
+The scene holds ``--materials`` planes, each with its own face-like material
+(UV -> position group -> atlas texture). The first render includes shader
+compilation; later renders reuse the compiled shaders, so the difference is
+the compile cost. EEVEE needs a GPU context, which background mode only gets
+on machines with a working GPU driver.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _bootstrap import load_addon, script_args
+
+ATLAS_SIZE = 512
+
+
+def build_scene(scene, material_count: int, compact: bool) -> list:
+    from uma_tools.operators.create_shader_nodes import ensure_position_nodegroups  # pyright: ignore[reportMissingImports]
+
+    groups = ensure_position_nodegroups(compact)
+    atlas = bpy.data.images.new("bench_atlas", ATLAS_SIZE, ATLAS_SIZE)
+    atlas.generated_type = "COLOR_GRID"
+
+    for i in range(material_count):
+        material = bpy.data.materials.new(f"bench_face_{i:03d}")
+        material.use_nodes = True
+        nodes = material.node_tree.nodes
+        links = material.node_tree.links
+        bsdf = nodes["Principled BSDF"]
+
+        uv = nodes.new("ShaderNodeTexCoord")
+        group_node = nodes.new("ShaderNodeGroup")
+        group_node.node_tree = groups[i % len(groups)]
+        group_node.inputs["编号"].default_value = i % 32 + 1  # pyright: ignore[reportAttributeAccessIssue]
+        texture = nodes.new("ShaderNodeTexImage")
+        texture.image = atlas
+
+        links.new(uv.outputs["UV"], group_node.inputs["矢量"])
+        links.new(group_node.outputs["矢量"], texture.inputs["Vector"])
+        links.new(texture.outputs["Color"], bsdf.inputs["Base Color"])
+
+        mesh = bpy.data.meshes.new(material.name)
+        mesh.from_pydata(
+            [(-0.5, -0.5, 0), (0.5, -0.5, 0), (0.5, 0.5, 0), (-0.5, 0.5, 0)],
+            [],
+            [(0, 1, 2, 3)],
+        )
+        mesh.uv_layers.new()
+        mesh.materials.append(material)
+        obj = bpy.data.objects.new(material.name, mesh)
+        obj.location = (i % 8 - 3.5, i // 8, 0)
+        scene.collection.objects.link(obj)
+
+    camera = bpy.data.objects.new("bench_camera", bpy.data.cameras.new("bench_camera"))
+    camera.location = (0, material_count // 16, 12)
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+    return groups
+
+
+def configure_render(scene, resolution: int):
+    engines = bpy.types.RenderSettings.bl_rna.properties["engine"].enum_items.keys()
+    scene.render.engine = (
+        "BLENDER_EEVEE_NEXT" if "BLENDER_EEVEE_NEXT" in engines else "BLENDER_EEVEE"
+    )
+    scene.render.resolution_x = resolution
+    scene.render.resolution_y = resolution
+    scene.render.resolution_percentage = 100
+    scene.eevee.taa_render_samples = 1
+
+
+def render_ms() -> float:
+    start = time.perf_counter()
+    bpy.ops.render.render(write_still=False)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure EEVEE compile and render time of a position group variant."
+    )
+    parser.add_argument(
+        "--variant", choices=("original", "compact"), default="original"
+    )
+    parser.add_argument("--materials", type=int, default=64)
+    parser.add_argument("--resolution", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=5, help="Warm renders to time.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    args = parser.parse_args(script_args())
+
+    load_addon()
+
+    scene = bpy.context.scene
+    for obj in list(scene.objects):
+        bpy.data.objects.remove(obj)
+    configure_render(scene, args.resolution)
+
+    start = time.perf_counter()
+    groups = build_scene(scene, args.materials, args.variant == "compact")
+    build_ms = (time.perf_counter() - start) * 1000
+
+    first_ms = render_ms()
+    warm = [render_ms() for _ in range(args.repeat)]
+    warm_ms = statistics.median(warm)
+
+    result = {
+        "variant": args.variant,
+        "engine": scene.render.engine,
+        "blender": bpy.app.version_string,
+        "materials": args.materials,
+        "group_nodes": {group.name: len(group.nodes) - 2 for group in groups},
+        "build_ms": round(build_ms, 3),
+        "first_render_ms": round(first_ms, 3),
+        "warm_render_ms": round(warm_ms, 3),
+        "compile_ms": round(first_ms - warm_ms, 3),
+    }
+
+    print(f"variant         {args.variant} ({scene.render.engine})")
+    for name, count in result["group_nodes"].items():
+        print(f"  {name:<12}  {count} nodes")
+    print(f"first render    {first_ms:10.1f} ms")
+    print(f"warm render     {warm_ms:10.1f} ms (median of {args.repeat})")
+    print(f"shader compile  {first_ms - warm_ms:10.1f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
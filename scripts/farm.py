@@ -0,0 +1,219 @@
+#!/usr/bin/python3
+"""Rig many character files in parallel background Blender processes.
+
+Each file is one job: ``blender --background --python scripts/batch_rig.py``.
+Progress is kept in a manifest so an interrupted run continues where it
+stopped when started again with the same manifest:
+
+    python scripts/farm.py characters/ --recursive --jobs 16 --blender /opt/blender/blender
+"""
+
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from _bootstrap import (
+    PROJECT_ROOT,
+    collect_blend_files,
+    output_path_for,
+    summary_path_for,
+)
+
+BATCH_SCRIPT = PROJECT_ROOT / "scripts" / "batch_rig.py"
+
+
+class Manifest:
+    """Per-file job state, written atomically after every change."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.jobs: dict[str, dict] = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                self.jobs = json.load(f).get("jobs", {})
+            # Jobs that were running when the previous run died start over.
+            for job in self.jobs.values():
+                if job["status"] == "running":
+                    job["status"] = "pending"
+
+    def add(self, file: str, output: str):
+        job = self.jobs.setdefault(file, {"status": "pending", "attempts": 0})
+        job.setdefault("output", output)
+
+    def update(self, file: str, **fields):
+        with self.lock:
+            self.jobs[file].update(fields)
+            self._save()
+
+    def save(self):
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"jobs": self.jobs}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def pending(self) -> list[str]:
+        return [file for file, job in self.jobs.items() if job["status"] == "pending"]
+
+
+# Final job states; a job that does not finish is retried before it gets one.
+DONE, FAILED, TIMED_OUT = "done", "failed", "timed_out"
+
+
+def run_job(file: str, output: str, args, batch_args: list[str]) -> tuple[str, str]:
+    """Rig one file in its own Blender process; return (status, error)."""
+    output_path = Path(output)
+    command = [
+        args.blender,
+        "--background",
+        "--factory-startup",
+        # A script that raises would otherwise still exit with 0.
+        "--python-exit-code",
+        "1",
+        "--python",
+        str(BATCH_SCRIPT),
+        "--",
+        file,
+    ]
+    if output_path != Path(file):
+        command += ["--output-dir", str(output_path.parent)]
+    command += batch_args
+
+    # A summary left by an earlier run must not count as this run's result.
+    summary_path = summary_path_for(output_path)
+    summary_path.unlink(missing_ok=True)
+
+    try:
+        process = subprocess.run(
+            command, capture_output=True, text=True, timeout=args.timeout
+        )
+    except subprocess.TimeoutExpired:
+        return TIMED_OUT, f"timed out after {args.timeout}s"
+
+    if summary_path.exists():
+        with open(summary_path, encoding="utf-8") as f:
+            summary = json.load(f)
+        if summary.get("status") == "ok" and process.returncode == 0:
+            return DONE, ""
+        if summary.get("error"):
+            return FAILED, summary["error"]
+
+    error = f"exit code {process.returncode}"
+    output = (process.stderr or process.stdout).strip().splitlines()
+    if output:
+        error += ": " + " | ".join(output[-3:])
+    return FAILED, error
+
+
+def worker(jobs: queue.Queue, manifest: Manifest, args, batch_args: list[str]):
+    while True:
+        try:
+            file = jobs.get_nowait()
+        except queue.Empty:
+            return
+
+        job = manifest.jobs[file]
+        attempts = job["attempts"] + 1
+        output = job.get("output", file)
+        manifest.update(file, status="running", attempts=attempts)
+        start = time.perf_counter()
+        status, error = run_job(file, output, args, batch_args)
+        seconds = round(time.perf_counter() - start, 3)
+
+        if status == DONE:
+            manifest.update(file, status=DONE, seconds=seconds, error="")
+            print(f"[done] {file} ({seconds}s)")
+        elif attempts <= args.retries:
+            manifest.update(file, status="pending", seconds=seconds, error=error)
+            print(f"[retry {attempts}/{args.retries}] {file}: {error}")
+            jobs.put(file)
+        else:
+            manifest.update(file, status=status, seconds=seconds, error=error)
+            print(f"[{status}] {file}: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Farm character files out to parallel background Blender processes."
+    )
+    parser.add_argument("paths", nargs="*", help=".blend files or directories.")
+    parser.add_argument(
+        "--recursive", action="store_true", help="Search directories recursively."
+    )
+    parser.add_argument("--blender", default="blender", help="Blender executable.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Concurrent Blender processes.",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=600, help="Seconds before a job is killed."
+    )
+    parser.add_argument(
+        "--retries", type=int, default=2, help="Retries for a failed job."
+    )
+    parser.add_argument(
+        "--manifest",
+        default="farm_manifest.json",
+        help="Job state file; rerun with the same file to resume.",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Queue files that failed or timed out in a previous run again.",
+    )
+    parser.add_argument(
+        "--output-dir", help="Save rigged copies here instead of overwriting."
+    )
+    args, batch_args = parser.parse_known_args()
+    # Anything after "--" is passed on to batch_rig.py.
+    batch_args = [arg for arg in batch_args if arg != "--"]
+
+    manifest = Manifest(Path(args.manifest))
+    for path in collect_blend_files(args.paths, args.recursive):
+        manifest.add(str(path), str(output_path_for(path, args.paths, args.output_dir)))
+    if args.retry_failed:
+        for job in manifest.jobs.values():
+            if job["status"] in (FAILED, TIMED_OUT):
+                job.update(status="pending", attempts=0)
+    manifest.save()
+
+    pending = manifest.pending()
+    done = sum(job["status"] == DONE for job in manifest.jobs.values())
+    print(f"{len(pending)} pending, {done} already done, {args.jobs} worker(s)")
+
+    jobs: queue.Queue = queue.Queue()
+    for file in pending:
+        jobs.put(file)
+
+    threads = [
+        threading.Thread(target=worker, args=(jobs, manifest, args, batch_args))
+        for _ in range(max(1, min(args.jobs, len(pending))))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    counts = Counter(job["status"] for job in manifest.jobs.values())
+    print(
+        f"Finished: {counts[DONE]} done, {counts[FAILED]} failed, "
+        f"{counts[TIMED_OUT]} timed out"
+    )
+    sys.exit(1 if counts[FAILED] or counts[TIMED_OUT] else 0)
+
+
+if __name__ == "__main__":
+    main()
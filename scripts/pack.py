@@ -22,6 +22,7 @@ def main():
     files_and_dirs_to_include = [
         "__init__.py",
         "config",
+        "utils",
         "operators",
         "ui",
     ]
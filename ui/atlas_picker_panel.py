@@ -0,0 +1,57 @@
+import bpy
+
+from ..config.node_groups import ATLAS_COLUMNS, ATLAS_ROWS
+from ..operators.atlas_picker import (
+    UMA_TOOL_OT_pick_atlas_cell,
+    UMA_TOOL_OT_refresh_atlas_previews,
+    active_position_node,
+    index_property,
+    position_node_image,
+)
+from ..utils.atlas_cells import ATLAS_CELL_CACHE
+
+
+class UMA_TOOL_PT_atlas_picker(bpy.types.Panel):
+    bl_label = "表情选择"
+    bl_idname = "UMA_TOOL_PT_atlas_picker"
+    bl_space_type = "NODE_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "赛马娘工具"
+
+    @classmethod
+    def poll(cls, context):
+        return active_position_node(context) is not None
+
+    def draw(self, context):
+        layout = self.layout
+        node = active_position_node(context)
+        image = position_node_image(node)
+
+        row = layout.row()
+        row.label(text=image.name if image else "未连接图像纹理", icon="IMAGE_DATA")
+        row.operator(
+            UMA_TOOL_OT_refresh_atlas_previews.bl_idname, text="", icon="FILE_REFRESH"
+        )
+        if image is None or image.size[0] == 0:
+            return
+
+        name = index_property(node)
+        if name is not None and context.object is not None:
+            current = context.object.get(name, 1)
+        else:
+            current = node.inputs["编号"].default_value  # pyright: ignore[reportAttributeAccessIssue]
+
+        icon_ids = ATLAS_CELL_CACHE.icons(
+            image, ATLAS_COLUMNS, ATLAS_ROWS[node.node_tree.name]
+        )
+        grid = layout.grid_flow(
+            row_major=True, columns=ATLAS_COLUMNS, even_columns=True, align=True
+        )
+        for index, icon_id in enumerate(icon_ids, start=1):
+            cell = grid.column(align=True)
+            cell.template_icon(icon_value=icon_id, scale=3.0)
+            cell.operator(
+                UMA_TOOL_OT_pick_atlas_cell.bl_idname,
+                text=str(index),
+                depress=index == current,
+            ).index = index  # pyright: ignore[reportAttributeAccessIssue]
@@ -1,7 +1,28 @@
 import bpy
+from ..config.settings import get_settings
 from ..operators.generate_controllers import UMA_TOOL_OT_generate_controllers
 from ..operators.optimize_skeleton_display import UMA_TOOL_OT_optimize_skeleton_display
 from ..operators.revert_skeleton_display import UMA_TOOL_OT_revert_skeleton_display
+from ..operators.apply_position_nodes import UMA_TOOL_OT_apply_position_nodes
+from ..operators.expression_index import (
+    UMA_TOOL_OT_import_expression_timeline,
+    UMA_TOOL_OT_setup_expression_index,
+)
+from ..operators.asset_library import UMA_TOOL_OT_link_asset_library
+from ..operators.bake_springs import UMA_TOOL_OT_bake_springs
+from ..operators.bake_visual import UMA_TOOL_OT_bake_visual
+from ..operators.pose_library import (
+    UMA_TOOL_OT_apply_pose,
+    UMA_TOOL_OT_remove_pose,
+    UMA_TOOL_OT_save_pose,
+)
+from ..operators.retarget import UMA_TOOL_OT_retarget
+from ..operators.profile_playback import UMA_TOOL_OT_profile_playback
+from ..operators.display_presets import (
+    UMA_TOOL_OT_apply_display_preset,
+    UMA_TOOL_OT_remove_display_preset,
+    UMA_TOOL_OT_save_display_preset,
+)
 
 
 class UMA_TOOL_PT_main_panel(bpy.types.Panel):
@@ -28,4 +49,56 @@ class UMA_TOOL_PT_main_panel(bpy.types.Panel):
         box = layout.box()
         box.label(text="骨架显示")
         box.operator(UMA_TOOL_OT_optimize_skeleton_display.bl_idname)
+        box.operator(
+            UMA_TOOL_OT_optimize_skeleton_display.bl_idname, text="播放性能模式"
+        ).playback_mode = True  # pyright: ignore[reportAttributeAccessIssue]
         box.operator(UMA_TOOL_OT_revert_skeleton_display.bl_idname)
+        row = box.row(align=True)
+        row.operator(UMA_TOOL_OT_save_display_preset.bl_idname, text="保存预设")
+        row.operator_menu_enum(
+            UMA_TOOL_OT_apply_display_preset.bl_idname, "preset", text="应用预设"
+        )
+        row.operator_menu_enum(
+            UMA_TOOL_OT_remove_display_preset.bl_idname,
+            "preset",
+            text="",
+            icon="X",
+        )
+
+        box = layout.box()
+        box.label(text="动画")
+        box.operator(UMA_TOOL_OT_bake_springs.bl_idname)
+        box.operator(UMA_TOOL_OT_bake_visual.bl_idname)
+        box.operator(UMA_TOOL_OT_retarget.bl_idname)
+        row = box.row(align=True)
+        row.operator(UMA_TOOL_OT_save_pose.bl_idname, text="保存姿态")
+        row.operator_menu_enum(
+            UMA_TOOL_OT_apply_pose.bl_idname, "pose", text="应用姿态"
+        )
+        row.operator_menu_enum(
+            UMA_TOOL_OT_remove_pose.bl_idname,
+            "pose",
+            text="",
+            icon="X",
+        )
+
+        settings = get_settings(context)
+
+        box = layout.box()
+        box.label(text="着色器节点")
+        box.operator(UMA_TOOL_OT_apply_position_nodes.bl_idname)
+        box.operator(UMA_TOOL_OT_setup_expression_index.bl_idname)
+        box.operator(UMA_TOOL_OT_import_expression_timeline.bl_idname)
+        if settings is not None:
+            box.prop(settings, "asset_library_dir")
+            box.operator(UMA_TOOL_OT_link_asset_library.bl_idname)
+
+        if settings is not None:
+            box = layout.box()
+            box.label(text="性能分析")
+            box.operator(UMA_TOOL_OT_profile_playback.bl_idname)
+            box.prop(settings, "profiling_enabled")
+            box.prop(settings, "profiling_log_path")
+            box.prop(settings, "profiling_use_cprofile")
+            if settings.profiling_use_cprofile:
+                box.prop(settings, "profiling_output_dir")
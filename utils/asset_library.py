@@ -0,0 +1,200 @@
+import hashlib
+import os
+from collections import namedtuple
+from contextlib import contextmanager
+
+import bpy
+
+from ..config.node_groups import position_group_specs
+from .curve_shapes import (
+    SHAPE_TYPES,
+    build_controller_curve,
+    new_shape_object,
+    shape_object_name,
+)
+from .node_builder import new_node_group, spec_hash
+
+# 共享资产的生成逻辑（例如控制器形状）发生变化时递增，使旧资产库全部失效
+LIBRARY_VERSION = 1
+# 资产库文件名前缀，后接内容哈希；内容变化时写入新文件，已链接旧文件的角色不受影响
+LIBRARY_FILE_PREFIX = "uma_assets_"
+
+LinkedAssets = namedtuple(
+    "LinkedAssets",
+    [
+        "library",  # bpy.types.Library
+        "node_groups",  # {节点组名: 链接的节点组}
+        "shapes",  # {形状类型: 链接的形状对象}
+        "written",  # 本次是否新写入了资产库文件
+    ],
+)
+
+
+def library_hash(compact: bool = False) -> str:
+    specs = [spec_hash(spec) for spec in position_group_specs(compact)]
+    state = (LIBRARY_VERSION, specs, SHAPE_TYPES)
+    return hashlib.sha1(repr(state).encode()).hexdigest()
+
+
+def library_filepath(directory: str, compact: bool = False) -> str:
+    name = f"{LIBRARY_FILE_PREFIX}{library_hash(compact)[:12]}.blend"
+    return os.path.normpath(os.path.join(bpy.path.abspath(directory), name))
+
+
+def _library_names(compact: bool):
+    node_group_names = [spec.name for spec in position_group_specs(compact)]
+    object_names = [shape_object_name(shape) for shape in SHAPE_TYPES]
+    return node_group_names, object_names
+
+
+@contextmanager
+def _free_names(collection, names):
+    """暂时给本地同名数据块改名，使新建的数据块能使用原名，退出时改回"""
+    moved = []
+    for name in names:
+        existing = collection.get((name, None))
+        if existing is not None:
+            existing.name = f"{name}.uma_tmp"
+            moved.append((existing, name))
+    try:
+        yield
+    finally:
+        for existing, name in moved:
+            existing.name = name
+
+
+def write_asset_library(filepath: str, compact: bool = False):
+    """新建位置节点组和所有控制器形状，写入资产库文件后从当前文件删除
+
+    先写入临时文件再替换，多个进程同时生成同一个资产库时不会读到半个文件。
+    """
+    node_group_names, object_names = _library_names(compact)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    temp_path = f"{filepath}.{os.getpid()}.tmp"
+
+    created = []
+    with (
+        _free_names(bpy.data.node_groups, node_group_names),
+        _free_names(bpy.data.objects, object_names),
+        _free_names(bpy.data.curves, object_names),
+    ):
+        try:
+            for spec in position_group_specs(compact):
+                created.append(new_node_group(spec))
+            for shape, name in zip(SHAPE_TYPES, object_names):
+                curve = build_controller_curve(name, shape, 1.0)
+                created.append(curve)
+                created.append(new_shape_object(name, curve))
+            bpy.data.libraries.write(
+                temp_path, set(created), path_remap="NONE", fake_user=True
+            )
+            os.replace(temp_path, filepath)
+        except BaseException:
+            # 写入或替换失败时不在资产库旁边留下临时文件
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        finally:
+            bpy.data.batch_remove(created)
+
+
+def _linked_ids(filepath: str, node_group_names, object_names):
+    """返回 (资产库, 节点组列表, 形状对象列表)，尚未链接或有缺失时返回 None"""
+    library = next(
+        (
+            library
+            for library in bpy.data.libraries
+            if os.path.normpath(bpy.path.abspath(library.filepath)) == filepath
+        ),
+        None,
+    )
+    if library is None:
+        return None
+    node_groups = [
+        bpy.data.node_groups.get((name, library.filepath)) for name in node_group_names
+    ]
+    objects = [bpy.data.objects.get((name, library.filepath)) for name in object_names]
+    if None in node_groups or None in objects:
+        return None
+    return library, node_groups, objects
+
+
+def link_asset_library(directory: str, compact: bool = False) -> LinkedAssets:
+    """返回从共享资产库链接的位置节点组和控制器形状
+
+    资产库文件不存在（首次使用或内容已变化）时先生成；已经链接过时直接
+    复用，不读取文件。无法写入或读取资产库时抛出 OSError。
+    """
+    filepath = library_filepath(directory, compact)
+    node_group_names, object_names = _library_names(compact)
+
+    written = False
+    if not os.path.isfile(filepath):
+        write_asset_library(filepath, compact)
+        written = True
+
+    linked = _linked_ids(filepath, node_group_names, object_names)
+    if linked is None:
+        with bpy.data.libraries.load(
+            filepath, link=True, relative=bool(bpy.data.filepath)
+        ) as (data_from, data_to):
+            data_to.node_groups = [
+                name for name in node_group_names if name in data_from.node_groups
+            ]
+            data_to.objects = [
+                name for name in object_names if name in data_from.objects
+            ]
+        linked = _linked_ids(filepath, node_group_names, object_names)
+        if linked is None:
+            raise OSError(f"资产库不完整：{filepath}")
+
+    library, node_groups, objects = linked
+    return LinkedAssets(
+        library=library,
+        node_groups={group.name: group for group in node_groups},
+        shapes=dict(zip(SHAPE_TYPES, objects)),
+        written=written,
+    )
+
+
+def _real_users(id_data) -> int:
+    return id_data.users - int(id_data.use_fake_user)
+
+
+def adopt_linked_assets(assets: LinkedAssets) -> int:
+    """把本地副本和旧资产库中的同名数据块的使用者全部改为链接的资产
+
+    不再被使用的本地副本会被删除，不再被使用的旧资产库会被卸载。
+    返回替换的数据块数量。
+    """
+    replaced = 0
+    stale_libraries = set()
+    for collection, linked in (
+        (bpy.data.node_groups, assets.node_groups.values()),
+        (bpy.data.objects, assets.shapes.values()),
+    ):
+        for asset in linked:
+            copies = [
+                id_data
+                for id_data in collection
+                if id_data.name == asset.name and id_data != asset
+            ]
+            for copy in copies:
+                copy.user_remap(asset)
+                replaced += 1
+                if copy.library is not None:
+                    stale_libraries.add(copy.library)
+                elif isinstance(copy, bpy.types.Object):
+                    curve = copy.data
+                    bpy.data.objects.remove(copy, do_unlink=True)
+                    if curve is not None and curve.users == 0:
+                        bpy.data.curves.remove(curve)
+                else:
+                    collection.remove(copy)
+
+    for library in stale_libraries:
+        if not os.path.basename(library.filepath).startswith(LIBRARY_FILE_PREFIX):
+            continue
+        if all(_real_users(id_data) == 0 for id_data in library.users_id):
+            bpy.data.libraries.remove(library)
+    return replaced
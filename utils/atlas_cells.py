@@ -0,0 +1,120 @@
+import itertools
+from collections import OrderedDict
+
+import bpy
+import bpy.utils.previews
+import numpy as np
+
+# 缩略图边长（像素）
+THUMBNAIL_SIZE = 96
+# 最多同时缓存的图集数量，超出时淘汰最久未使用的图集及其缩略图
+MAX_CACHED_ATLASES = 8
+
+
+def image_stamp(image) -> tuple:
+    """图像的修改标记：文件路径、是否打包、尺寸和是否有未保存的修改
+
+    面板每次重绘都会计算这个标记，因此只读取数据块上的属性，不访问磁盘。
+    在 Blender 内绘制、换图或重新打包会改变标记；在外部修改图集文件后
+    用刷新操作清空缓存。
+    """
+    return (
+        image.filepath,
+        image.packed_file is not None,
+        tuple(image.size),
+        image.is_dirty,
+    )
+
+
+def read_pixels(image) -> np.ndarray:
+    """用 foreach_get 一次读取整张图像，返回 (高, 宽, 4) 的数组（第 0 行在底部）"""
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+
+def slice_cells(pixels: np.ndarray, columns: int, rows: int, size: int) -> list:
+    """把图集切成 columns * rows 个格子并缩小到不超过 size 的缩略图
+
+    按编号顺序返回：编号 1 是左上角，先从左到右再从上到下。
+    """
+    height, width = pixels.shape[:2]
+    cell_w, cell_h = width // columns, height // rows
+    step = max(1, max(cell_w, cell_h) // size)
+
+    cells = []
+    for row in range(rows):
+        # 像素数组自下而上存放，第 row 行（自上而下）对应数组的高位
+        top = height - row * cell_h
+        for column in range(columns):
+            left = column * cell_w
+            cells.append(pixels[top - cell_h : top : step, left : left + cell_w : step])
+    return cells
+
+
+class AtlasCellCache:
+    """按 (图像名, 修改标记, 行列数) 缓存图集缩略图的 LRU 缓存
+
+    缩略图存放在 bpy.utils.previews 集合中，界面重绘时只查询缓存，
+    不会重新读取像素。
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_ATLASES):
+        self.max_entries = max_entries
+        # 键 -> (图标 ID 列表, 缩略图名列表)
+        self._entries: OrderedDict[tuple, tuple[list, list]] = OrderedDict()
+        self._previews = None
+        self._names = itertools.count()
+
+    def _preview_collection(self):
+        if self._previews is None:
+            self._previews = bpy.utils.previews.new()
+        return self._previews
+
+    def icons(self, image, columns: int, rows: int) -> list[int]:
+        """返回按编号排列的缩略图图标 ID"""
+        key = (image.name_full, image_stamp(image), columns, rows)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        # 同一图像的旧版本不会再被使用，先移除
+        for old_key in [k for k in self._entries if k[0] == key[0]]:
+            self._evict(old_key)
+
+        previews = self._preview_collection()
+        cells = slice_cells(read_pixels(image), columns, rows, THUMBNAIL_SIZE)
+        icon_ids = []
+        names = []
+        for cell in cells:
+            name = f"atlas_cell_{next(self._names)}"
+            preview = previews.new(name)
+            preview.image_size = (cell.shape[1], cell.shape[0])
+            preview.image_pixels_float.foreach_set(np.ascontiguousarray(cell).ravel())
+            icon_ids.append(preview.icon_id)
+            names.append(name)
+
+        self._entries[key] = (icon_ids, names)
+        while len(self._entries) > self.max_entries:
+            self._evict(next(iter(self._entries)))
+        return icon_ids
+
+    def _evict(self, key):
+        _, names = self._entries.pop(key)
+        for name in names:
+            del self._previews[name]
+
+    def clear(self):
+        self._entries.clear()
+        if self._previews is not None:
+            bpy.utils.previews.remove(self._previews)
+            self._previews = None
+
+
+ATLAS_CELL_CACHE = AtlasCellCache()
+
+
+def unregister():
+    ATLAS_CELL_CACHE.clear()
@@ -0,0 +1,112 @@
+from collections import namedtuple
+
+import bpy
+import numpy as np
+
+from ..config.bone_config import HIDDEN_BONE_NAMES, HIDDEN_BONE_SUFFIX
+from .bone_rules import BONE_RULE_INDEX, is_pattern
+
+ResolvedBones = namedtuple(
+    "ResolvedBones",
+    [
+        "rules",  # 骨架中每根有配置的骨骼对应的 BoneRule，按骨骼顺序排列
+        "missing",  # 在骨架中找不到的精确配置骨骼名
+    ],
+)
+
+# 以骨架数据块的 session_uid 为键缓存的解析结果，值为 (骨骼数量, 结果)。
+# session_uid 在整个会话中唯一，打开其他文件后不会被复用；骨骼改名或增删时
+# 由依赖图更新回调清除对应的缓存，命中时只需比较骨骼数量。
+_resolved_cache: dict[int, tuple[int, ResolvedBones]] = {}
+_hidden_mask_cache: dict[int, tuple[int, np.ndarray]] = {}
+
+
+def _cached(cache, armature):
+    bones = armature.data.bones
+    key = armature.data.session_uid
+    cached = cache.get(key)
+    if cached is not None and cached[0] == len(bones):
+        return key, cached[1]
+    return key, None
+
+
+def resolve_bone_configs(armature) -> ResolvedBones:
+    """一次遍历骨架的所有骨骼，通过规则索引把配置解析到实际存在的骨骼上
+
+    结果按骨架缓存，骨骼名不变时其他操作符可以直接复用。
+    """
+    cache_key, cached = _cached(_resolved_cache, armature)
+    if cached is not None:
+        return cached
+
+    bone_names = armature.data.bones.keys()
+    rules = []
+    matched_sources = set()
+    for name in bone_names:
+        rule = BONE_RULE_INDEX.lookup(name)
+        if rule is None:
+            continue
+        # 同一精确配置只取第一根匹配的骨骼（例如同时存在 Arm_R 和 Arm.R）
+        if rule.source in matched_sources and not is_pattern(rule.source):
+            continue
+        rules.append(rule)
+        matched_sources.add(rule.source)
+
+    resolved = ResolvedBones(
+        rules=rules,
+        missing=[
+            config.bone_name
+            for config in BONE_RULE_INDEX.exact_configs
+            if config.bone_name not in matched_sources
+        ],
+    )
+    _resolved_cache[cache_key] = (len(bone_names), resolved)
+    return resolved
+
+
+def hidden_bone_mask(armature) -> np.ndarray:
+    """返回优化显示时需要隐藏的骨骼掩码，顺序与 armature.data.bones 相同
+
+    结果按骨架缓存，骨骼名不变时不会重新计算。
+    """
+    cache_key, cached = _cached(_hidden_mask_cache, armature)
+    if cached is not None:
+        return cached
+
+    bone_names = armature.data.bones.keys()
+    hidden_names = set(HIDDEN_BONE_NAMES)
+    mask = np.fromiter(
+        (
+            name.endswith(HIDDEN_BONE_SUFFIX) or name in hidden_names
+            for name in bone_names
+        ),
+        dtype=bool,
+        count=len(bone_names),
+    )
+    mask.flags.writeable = False
+    _hidden_mask_cache[cache_key] = (len(bone_names), mask)
+    return mask
+
+
+def clear_resolved_cache():
+    _resolved_cache.clear()
+    _hidden_mask_cache.clear()
+
+
+def _invalidate_updated_armatures(scene, depsgraph):
+    """骨架数据更新（改名、编辑模式修改骨骼等）时清除其缓存"""
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Armature):
+            key = update.id.original.session_uid
+            _resolved_cache.pop(key, None)
+            _hidden_mask_cache.pop(key, None)
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(_invalidate_updated_armatures)
+
+
+def unregister():
+    if _invalidate_updated_armatures in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_invalidate_updated_armatures)
+    clear_resolved_cache()
@@ -0,0 +1,138 @@
+import fnmatch
+import re
+from collections import namedtuple
+
+from ..config.bone_config import BONE_CONFIGS, BONE_SIDE_COLORS
+
+# 配置中 bone_name 以此前缀开头时按正则表达式匹配
+REGEX_PREFIX = "re:"
+
+# 侧向标记必须是独立的名称片段，例如 Arm_R、Arm.R、Sp_He_Ear0_R_01
+_SIDE_PATTERN = re.compile(r"(?:^|[_.])([LR])(?=$|[_.])")
+_SIDES = {"L": "Left", "R": "Right"}
+
+# 另一种命名约定中的侧向后缀写法
+SIDE_SUFFIX_ALIASES = {"_R": ".R", "_L": ".L"}
+
+BoneRule = namedtuple(
+    "BoneRule",
+    [
+        "config",  # bone_name 已替换为实际骨骼名的 ControllerConfig
+        "side",  # "Left"、"Right" 或 "Center"
+        "color",  # 该侧的骨骼颜色
+        "source",  # 配置中原始的骨骼名或模式
+    ],
+)
+
+
+def bone_side(bone_name: str) -> str:
+    """根据独立的 L/R 名称片段判断骨骼所在的一侧"""
+    match = _SIDE_PATTERN.search(bone_name)
+    if match is None:
+        return "Center"
+    return _SIDES[match.group(1)]
+
+
+def is_pattern(bone_name: str) -> bool:
+    return bone_name.startswith(REGEX_PREFIX) or any(c in bone_name for c in "*?[")
+
+
+def pattern_regex(bone_name: str) -> str:
+    if bone_name.startswith(REGEX_PREFIX):
+        return bone_name[len(REGEX_PREFIX) :]
+    regex = fnmatch.translate(bone_name)
+    # fnmatch.translate 返回 "(?s:...)\Z"，去掉结尾以便拼接
+    return regex[: -len(r"\Z")] if regex.endswith(r"\Z") else regex
+
+
+def _side_aliases(bone_name: str) -> list[str]:
+    names = [bone_name]
+    for suffix, alias in SIDE_SUFFIX_ALIASES.items():
+        if bone_name.endswith(suffix):
+            names.append(bone_name[: -len(suffix)] + alias)
+    return names
+
+
+class BoneRuleIndex:
+    """把骨骼名映射到侧向、颜色和控制器配置的预编译索引
+
+    精确名称（包括 .R/.L 别名）存放在字典中；相邻的通配符和普通正则规则合并成
+    一个带命名分组的正则表达式，一次匹配即可得到命中的规则。带有 "(?" 的正则
+    规则（内联标志、自身的命名分组等）单独编译，以免影响其他规则。匹配仍按配置
+    顺序进行。查询结果按骨骼名缓存。
+    """
+
+    def __init__(self, configs):
+        self.exact_configs = []
+        self._exact = {}
+        # [(编译后的正则, 规则列表, 是否为合并的正则)]，合并的正则按分组 r0、r1…
+        # 对应规则列表，单独编译的正则只有一条规则
+        self._matchers = []
+        alternatives = []
+        merged_configs = []
+
+        def flush():
+            if alternatives:
+                self._matchers.append(
+                    (re.compile("|".join(alternatives)), list(merged_configs), True)
+                )
+                alternatives.clear()
+                merged_configs.clear()
+
+        for config in configs:
+            if not is_pattern(config.bone_name):
+                self.exact_configs.append(config)
+                for name in _side_aliases(config.bone_name):
+                    self._exact.setdefault(name, config)
+            elif config.bone_name.startswith(REGEX_PREFIX) and "(?" in config.bone_name:
+                flush()
+                self._matchers.append(
+                    (re.compile(pattern_regex(config.bone_name)), [config], False)
+                )
+            else:
+                group = f"r{len(merged_configs)}"
+                alternatives.append(f"(?P<{group}>{pattern_regex(config.bone_name)})")
+                merged_configs.append(config)
+        flush()
+
+        self._cache: dict[str, BoneRule | None] = {}
+
+    def _match_pattern(self, bone_name: str):
+        for pattern, configs, merged in self._matchers:
+            match = pattern.fullmatch(bone_name)
+            if match is None:
+                continue
+            if not merged:
+                return configs[0]
+            # 规则自身的正则可能带有分组，因此按分组名查找命中的规则
+            return next(
+                config for i, config in enumerate(configs) if match.start(f"r{i}") != -1
+            )
+        return None
+
+    def lookup(self, bone_name: str) -> BoneRule | None:
+        """返回骨骼对应的规则，没有规则时返回 None"""
+        try:
+            return self._cache[bone_name]
+        except KeyError:
+            pass
+
+        rule = None
+        config = self._exact.get(bone_name)
+        if config is None:
+            config = self._match_pattern(bone_name)
+
+        if config is not None:
+            side = bone_side(bone_name)
+            rule = BoneRule(
+                config=config._replace(bone_name=bone_name),
+                side=side,
+                color=BONE_SIDE_COLORS[side],
+                source=config.bone_name,
+            )
+        self._cache[bone_name] = rule
+        return rule
+
+
+# 导入时编译一次
+BONE_RULE_INDEX = BoneRuleIndex(BONE_CONFIGS)
@@ -0,0 +1,237 @@
+import math
+
+import bpy
+
+# 贝塞尔手柄类型在 RNA 中的枚举值（HD_FREE / HD_AUTO / HD_VECT / HD_ALIGN），
+# 供 foreach_set 批量写入 handle_left_type / handle_right_type 使用
+HANDLE_FREE = 0
+HANDLE_AUTO = 1
+HANDLE_VECTOR = 2
+HANDLE_ALIGNED = 3
+
+# (4/3)*tan(pi/8)，用2个贝塞尔点拟合90度圆弧时的手柄长度系数
+ARC_HANDLE_FACTOR = 0.55228
+
+# 单个箭头的局部坐标点（箭头朝 +Y）
+ARROW_POINTS = (
+    (-0.3, -0.05, 0.0),
+    (-0.3, 0.5, 0.0),
+    (-0.5, 0.5, 0.0),
+    (0.0, 1.0, 0.0),
+    (0.5, 0.5, 0.0),
+    (0.3, 0.5, 0.0),
+    (0.3, -0.05, 0.0),
+)
+
+SHAPE_TYPES = ("CIRCLE", "SQUARE", "ARROW_CIRCLE")
+
+Point = tuple[float, float, float]
+
+
+def _add_bezier_spline(
+    curve: bpy.types.Curve,
+    co: list[Point],
+    handle_left: list[Point],
+    handle_right: list[Point],
+    handle_type: int,
+    cyclic: bool = False,
+):
+    """用 foreach_set 一次性写入一条贝塞尔样条线的所有点"""
+    spline = curve.splines.new("BEZIER")
+    points = spline.bezier_points
+    count = len(co)
+    # 新样条线自带一个点
+    points.add(count - 1)
+
+    points.foreach_set("co", [c for p in co for c in p])
+    points.foreach_set("handle_left", [c for p in handle_left for c in p])
+    points.foreach_set("handle_right", [c for p in handle_right for c in p])
+    points.foreach_set("handle_left_type", [handle_type] * count)
+    points.foreach_set("handle_right_type", [handle_type] * count)
+
+    spline.use_cyclic_u = cyclic
+    return spline
+
+
+def _vector_handles(co: list[Point], cyclic: bool):
+    """计算 VECTOR 手柄：手柄位于指向相邻点的 1/3 处"""
+    count = len(co)
+    handle_left = []
+    handle_right = []
+    for i, p in enumerate(co):
+        if cyclic or i > 0:
+            prev = co[i - 1]
+        else:
+            prev = (2 * p[0] - co[1][0], 2 * p[1] - co[1][1], 2 * p[2] - co[1][2])
+        if cyclic or i < count - 1:
+            nxt = co[(i + 1) % count]
+        else:
+            nxt = (2 * p[0] - prev[0], 2 * p[1] - prev[1], 2 * p[2] - prev[2])
+        handle_left.append(tuple(a + (b - a) / 3.0 for a, b in zip(p, prev)))
+        handle_right.append(tuple(a + (b - a) / 3.0 for a, b in zip(p, nxt)))
+    return handle_left, handle_right
+
+
+def _circle_points(size: float) -> list[Point]:
+    """与 primitive_bezier_circle_add 相同的4个点，顺时针排列"""
+    return [(-size, 0.0, 0.0), (0.0, size, 0.0), (size, 0.0, 0.0), (0.0, -size, 0.0)]
+
+
+def _build_circle(curve: bpy.types.Curve, size: float):
+    co = _circle_points(size)
+    handle_len = size * ARC_HANDLE_FACTOR
+    handle_left = []
+    handle_right = []
+    for x, y, z in co:
+        # 顺时针方向的切线
+        tx, ty = y / size, -x / size
+        handle_left.append((x - tx * handle_len, y - ty * handle_len, z))
+        handle_right.append((x + tx * handle_len, y + ty * handle_len, z))
+    _add_bezier_spline(curve, co, handle_left, handle_right, HANDLE_ALIGNED, True)
+
+
+def _build_square(curve: bpy.types.Curve, size: float):
+    # 圆形的4个点使用 VECTOR 手柄即为方形
+    co = _circle_points(size)
+    handle_left, handle_right = _vector_handles(co, True)
+    _add_bezier_spline(curve, co, handle_left, handle_right, HANDLE_VECTOR, True)
+
+
+def _build_arrow_circle(curve: bpy.types.Curve, size: float):
+    arrow_size = size * 0.4
+    arrow_offset = size * 1.0
+
+    # 用于存储每个箭头基部的起点和终点
+    arrow_base_points = []
+
+    # 创建4个箭头样条线
+    for i in range(4):
+        angle = i * math.pi / 2
+        sin_a, cos_a = math.sin(angle), math.cos(angle)
+        loc_x, loc_y = arrow_offset * sin_a, arrow_offset * cos_a
+
+        # 绕 Z 轴旋转 -angle 后平移到箭头位置
+        co = []
+        for x, y, z in ARROW_POINTS:
+            x, y, z = x * arrow_size, y * arrow_size, z * arrow_size
+            co.append((loc_x + x * cos_a + y * sin_a, loc_y - x * sin_a + y * cos_a, z))
+
+        handle_left, handle_right = _vector_handles(co, False)
+        _add_bezier_spline(curve, co, handle_left, handle_right, HANDLE_VECTOR)
+        arrow_base_points.append((co[0], co[-1]))
+
+    # 创建4个圆弧样条线来连接箭头
+    handle_len = size * ARC_HANDLE_FACTOR
+    for i in range(4):
+        p_start = arrow_base_points[i][1]
+        p_end = arrow_base_points[(i + 1) % 4][0]
+
+        handles = []
+        for x, y, _ in (p_start, p_end):
+            # normalize(p) x (0, 0, 1) 的方向
+            length = math.hypot(x, y)
+            handles.append((y / length * handle_len, -x / length * handle_len, 0.0))
+        h_start, h_end = handles
+
+        co = [p_start, p_end]
+        handle_left = [
+            tuple(a - b for a, b in zip(p_start, h_start)),
+            tuple(a - b for a, b in zip(p_end, h_end)),
+        ]
+        handle_right = [
+            tuple(a + b for a, b in zip(p_start, h_start)),
+            tuple(a + b for a, b in zip(p_end, h_end)),
+        ]
+        _add_bezier_spline(curve, co, handle_left, handle_right, HANDLE_ALIGNED)
+
+
+_SHAPE_BUILDERS = {
+    "CIRCLE": _build_circle,
+    "SQUARE": _build_square,
+    "ARROW_CIRCLE": _build_arrow_circle,
+}
+
+
+def build_controller_curve(name: str, shape: str, size: float):
+    """只通过数据 API 创建控制器曲线，不调用任何操作符，也不切换模式。
+
+    未知的形状返回 None。
+    """
+    builder = _SHAPE_BUILDERS.get(shape)
+    if builder is None:
+        return None
+
+    curve = bpy.data.curves.new(name=name, type="CURVE")
+    builder(curve, size)
+    return curve
+
+
+# 共享形状对象的名称前缀，每种形状只有一个单位大小的对象
+SHAPE_OBJECT_PREFIX = "CTRL_SHAPE_"
+
+
+def shape_object_name(shape: str) -> str:
+    return f"{SHAPE_OBJECT_PREFIX}{shape}"
+
+
+def get_or_create_shape_object(shape: str, collection: bpy.types.Collection):
+    """返回该形状的共享单位大小对象，不存在时创建。
+
+    所有姿态骨骼共用同一个对象，每根骨骼的大小通过 custom_shape_scale_xyz 控制。
+    未知的形状返回 None。
+    """
+    name = shape_object_name(shape)
+    shape_object = bpy.data.objects.get((name, None))
+    if shape_object is not None and shape_object.type == "CURVE":
+        if collection not in shape_object.users_collection:
+            collection.objects.link(shape_object)
+        return shape_object
+
+    curve = build_controller_curve(name, shape, 1.0)
+    if curve is None:
+        return None
+
+    if shape_object is not None:
+        # 同名但不是曲线的对象，替换掉
+        bpy.data.objects.remove(shape_object, do_unlink=True)
+
+    shape_object = new_shape_object(name, curve)
+    collection.objects.link(shape_object)
+    return shape_object
+
+
+def rebuild_shape_object(shape: str) -> bool:
+    """原地重建本地共享形状对象的曲线数据
+
+    对象本身保留，文件中所有使用它作为自定义形状的骨骼都不受影响。
+    形状对象不存在时返回 False。
+    """
+    builder = _SHAPE_BUILDERS.get(shape)
+    shape_object = bpy.data.objects.get((shape_object_name(shape), None))
+    if builder is None or shape_object is None or shape_object.type != "CURVE":
+        return False
+    curve = shape_object.data
+    if curve.library is not None:
+        return False
+    curve.splines.clear()
+    builder(curve, 1.0)
+    return True
+
+
+def new_shape_object(name: str, curve: bpy.types.Curve):
+    """用曲线数据新建隐藏且不可选的形状对象，不链接到任何集合"""
+    shape_object = bpy.data.objects.new(name, curve)
+    shape_object.hide_select = True
+    shape_object.hide_viewport = True
+    return shape_object
+
+
+def remove_controller_object(name: str):
+    """删除本地控制器对象及其不再被使用的曲线数据"""
+    controller = bpy.data.objects.get((name, None))
+    if controller is None:
+        return
+    old_curve = controller.data
+    bpy.data.objects.remove(controller, do_unlink=True)
+    if old_curve and old_curve.users == 0:
+        bpy.data.curves.remove(old_curve)  # pyright: ignore[reportArgumentType]
@@ -0,0 +1,90 @@
+import base64
+import zlib
+
+import numpy as np
+
+from .pose_math import read_bools, write_bools
+
+# 优化显示前的可见性快照，以及命名的显示预设，都存放在骨架数据上
+SNAPSHOT_KEY = "uma_display_snapshot"
+PRESETS_KEY = "uma_display_presets"
+
+
+def bone_names_hash(bone_names) -> str:
+    """骨骼名顺序的稳定哈希，用来确认快照的位数组仍与骨骼一一对应"""
+    return f"{zlib.crc32(chr(0).join(bone_names).encode()):08x}"
+
+
+def capture_hidden_state(armature) -> dict:
+    """把所有骨骼的 hide 压缩成位数组"""
+    bones = armature.data.bones
+    hidden = read_bools(bones, "hide")
+    return {
+        "names_hash": bone_names_hash(bones.keys()),
+        "count": len(hidden),
+        "hidden": base64.b64encode(np.packbits(hidden).tobytes()).decode("ascii"),
+    }
+
+
+def restore_hidden_state(armature, state) -> int | None:
+    """一次写回快照中的 hide，返回由隐藏变为显示的骨骼数量
+
+    骨骼名或数量与快照不一致时不做修改并返回 None。
+    """
+    bones = armature.data.bones
+    if state.get("names_hash") != bone_names_hash(bones.keys()):
+        return None
+    count = int(state["count"])
+    if count != len(bones):
+        return None
+
+    packed = np.frombuffer(base64.b64decode(state["hidden"]), dtype=np.uint8)
+    hidden = np.unpackbits(packed, count=count).astype(bool)
+
+    previous = read_bools(bones, "hide")
+    write_bools(bones, "hide", hidden)
+    armature.update_tag()
+    return int((previous & ~hidden).sum())
+
+
+def store_snapshot(armature) -> bool:
+    """保存优化前的可见性，已有快照时保留原快照并返回 False"""
+    if SNAPSHOT_KEY in armature.data:
+        return False
+    armature.data[SNAPSHOT_KEY] = capture_hidden_state(armature)
+    return True
+
+
+def pop_snapshot(armature):
+    state = armature.data.get(SNAPSHOT_KEY)
+    if state is None:
+        return None
+    state = state.to_dict()
+    del armature.data[SNAPSHOT_KEY]
+    return state
+
+
+def preset_names(armature) -> list[str]:
+    presets = armature.data.get(PRESETS_KEY)
+    return sorted(presets.keys()) if presets is not None else []
+
+
+def save_preset(armature, name: str):
+    if PRESETS_KEY not in armature.data:
+        armature.data[PRESETS_KEY] = {}
+    armature.data[PRESETS_KEY][name] = capture_hidden_state(armature)
+
+
+def apply_preset(armature, name: str) -> int | None:
+    presets = armature.data.get(PRESETS_KEY)
+    if presets is None or name not in presets:
+        return None
+    return restore_hidden_state(armature, presets[name].to_dict())
+
+
+def remove_preset(armature, name: str) -> bool:
+    presets = armature.data.get(PRESETS_KEY)
+    if presets is None or name not in presets:
+        return False
+    del presets[name]
+    return True
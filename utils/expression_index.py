@@ -0,0 +1,106 @@
+import csv
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .keyframes import get_or_create_fcurve, step_changes, write_keyframes
+from .texture_slots import SLOT_KEY, TEXTURE_SLOT_INDEX
+
+# 表情编号属性存放在网格物体上，着色器通过“物体”类型的属性节点读取，
+# 动画直接驱动自定义属性，不需要 Python 驱动器
+INDEX_PROPERTY_FORMAT = "uma_{}_index"
+INDEX_GROUP_NAME = "表情编号"
+
+
+def index_property_name(slot: str) -> str:
+    return INDEX_PROPERTY_FORMAT.format(slot.lower())
+
+
+def node_slot(node) -> str | None:
+    """返回位置节点组节点对应的槽位
+
+    批量插入的节点带有 SLOT_KEY；手动添加的节点按它驱动的图像纹理识别。
+    """
+    slot = node.get(SLOT_KEY)
+    if slot is not None:
+        return slot
+    for output in node.outputs:
+        for link in output.links:
+            if link.to_node.type == "TEX_IMAGE":
+                texture_slot = TEXTURE_SLOT_INDEX.classify_node(link.to_node)
+                if texture_slot is not None:
+                    return texture_slot.slot
+    return None
+
+
+def ensure_index_property(obj, slot: str, default: int = 1) -> str:
+    name = index_property_name(slot)
+    if name not in obj:
+        obj[name] = default
+        obj.id_properties_ui(name).update(min=1, soft_max=32, step=1)
+    return name
+
+
+def wire_index_attribute(tree, group_node, slot: str) -> bool:
+    """用读取物体自定义属性的属性节点驱动位置节点组的编号
+
+    已经连接了属性节点时返回 False。
+    """
+    index_input = group_node.inputs["编号"]
+    name = index_property_name(slot)
+    if index_input.links:
+        from_node = index_input.links[0].from_node
+        if from_node.type == "ATTRIBUTE" and from_node.attribute_name == name:
+            return False
+
+    attribute = tree.nodes.new("ShaderNodeAttribute")
+    attribute.attribute_type = "OBJECT"
+    attribute.attribute_name = name
+    attribute.label = name
+    attribute.location = (group_node.location.x - 200, group_node.location.y - 150)
+    tree.links.new(attribute.outputs["Fac"], index_input)
+    return True
+
+
+def load_expression_timeline(path) -> dict:
+    """读取表情时间轴，返回 {槽位: (帧数组, 编号数组)}
+
+    支持两种格式：
+    - CSV，表头包含 frame、slot、index 三列
+    - JSON，{"eye": [[帧, 编号], ...], "mouth": ...}
+      或 [{"frame": 帧, "slot": 槽位, "index": 编号}, ...]
+    """
+    path = Path(path)
+    rows = []
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                rows.append((row["slot"], float(row["frame"]), float(row["index"])))
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            for slot, keys in data.items():
+                rows.extend((slot, float(frame), float(index)) for frame, index in keys)
+        else:
+            rows.extend(
+                (row["slot"], float(row["frame"]), float(row["index"])) for row in data
+            )
+
+    by_slot = {}
+    for slot, frame, index in rows:
+        by_slot.setdefault(slot.upper(), []).append((frame, index))
+
+    timeline = {}
+    for slot, keys in by_slot.items():
+        keys = np.array(keys, dtype=np.float32)
+        timeline[slot] = step_changes(keys[:, 0], keys[:, 1])
+    return timeline
+
+
+def write_expression_keys(obj, slot: str, frames, values) -> int:
+    """把一个槽位的表情序列写成 CONSTANT 关键帧，替换该属性原有的关键帧"""
+    name = ensure_index_property(obj, slot)
+    fcurve = get_or_create_fcurve(obj, f'["{name}"]', group=INDEX_GROUP_NAME)
+    return write_keyframes(fcurve, frames, values)
@@ -0,0 +1,204 @@
+import bpy
+import numpy as np
+
+# KeyframePoint.interpolation 枚举值
+INTERPOLATION_CONSTANT = 0
+INTERPOLATION_LINEAR = 1
+# KeyframePoint.handle_left_type / handle_right_type 枚举值
+HANDLE_VECTOR = 2
+
+
+def get_or_create_fcurve(id_data, data_path: str, index: int = 0, group: str = ""):
+    """返回 id_data 动作中的 F 曲线，没有动作或曲线时创建"""
+    animation_data = id_data.animation_data or id_data.animation_data_create()
+    action = animation_data.action
+    if action is None:
+        action = animation_data.action = bpy.data.actions.new(f"{id_data.name}Action")
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve is None:
+        fcurve = action.fcurves.new(data_path, index=index, action_group=group)
+    return fcurve
+
+
+# 只替换区间内的关键帧时，区间外原有关键帧需要保留的属性：(属性名, 分量数, 类型)
+_POINT_PROPERTIES = (
+    ("co", 2, np.float32),
+    ("handle_left", 2, np.float32),
+    ("handle_right", 2, np.float32),
+    ("handle_left_type", 1, np.int32),
+    ("handle_right_type", 1, np.int32),
+    ("interpolation", 1, np.int32),
+    ("easing", 1, np.int32),
+    ("type", 1, np.int32),
+    ("back", 1, np.float32),
+    ("amplitude", 1, np.float32),
+    ("period", 1, np.float32),
+)
+
+
+def _read_points(points) -> dict:
+    count = len(points)
+    arrays = {}
+    for name, size, dtype in _POINT_PROPERTIES:
+        data = np.empty(count * size, dtype=dtype)
+        points.foreach_get(name, data)
+        arrays[name] = data.reshape(count, size)
+    return arrays
+
+
+def write_keyframes(
+    fcurve,
+    frames,
+    values,
+    interpolation: int = INTERPOLATION_CONSTANT,
+    frame_range=None,
+) -> int:
+    """用 foreach_set 一次写入 F 曲线的关键帧，返回写入的关键帧数量
+
+    frame_range 为 None 时替换原有的全部关键帧；为 (起始帧, 结束帧) 时只替换
+    该区间内的关键帧，区间外的原有关键帧及其插值、手柄保持不变。
+    frames 必须已按升序排列并位于 frame_range 内。手柄与关键帧重合，
+    CONSTANT/LINEAR 插值下曲线形状不受手柄影响。
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32)
+    count = len(frames)
+
+    points = fcurve.keyframe_points
+    kept = None
+    if frame_range is not None and len(points):
+        existing = _read_points(points)
+        keys = existing["co"][:, 0]
+        before = keys < frame_range[0]
+        after = keys > frame_range[1]
+        kept = {name: (data[before], data[after]) for name, data in existing.items()}
+    before_count = len(kept["co"][0]) if kept else 0
+    after_count = len(kept["co"][1]) if kept else 0
+    total = before_count + count + after_count
+
+    points.clear()
+    if not total:
+        return 0
+    points.add(total)
+    # 新增关键帧的默认属性作为底稿，写入的关键帧和保留的关键帧覆盖在上面
+    arrays = _read_points(points)
+
+    written = slice(before_count, before_count + count)
+    co = np.column_stack((frames, values))
+    arrays["co"][written] = co
+    arrays["handle_left"][written] = co
+    arrays["handle_right"][written] = co
+    arrays["handle_left_type"][written] = HANDLE_VECTOR
+    arrays["handle_right_type"][written] = HANDLE_VECTOR
+    arrays["interpolation"][written] = interpolation
+    if kept:
+        for name, (before, after) in kept.items():
+            arrays[name][:before_count] = before
+            arrays[name][before_count + count :] = after
+
+    for name, data in arrays.items():
+        points.foreach_set(name, data.ravel())
+
+    # foreach_set 不会触发 RNA 更新，手动刷新曲线缓存
+    fcurve.update()
+    return count
+
+
+def step_changes(frames, values):
+    """按帧排序并去掉与前一帧值相同的步进关键帧，同一帧以最后一个值为准"""
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32)
+    if not len(frames):
+        return frames, values
+
+    order = np.argsort(frames, kind="stable")
+    frames, values = frames[order], values[order]
+
+    last_of_frame = np.append(frames[1:] != frames[:-1], True)
+    frames, values = frames[last_of_frame], values[last_of_frame]
+
+    changed = np.insert(values[1:] != values[:-1], 0, True)
+    return frames[changed], values[changed]
+
+
+# 长区间先只检查这么多个等间距的帧来寻找拆分点
+_COARSE_SAMPLES = 64
+
+
+def reduce_keyframes(values, tolerance) -> np.ndarray:
+    """对每个通道做误差受限的 Ramer-Douglas-Peucker 简化，返回保留关键帧的掩码
+
+    values 形状为 (通道数, 帧数)，tolerance 为标量或每个通道一个值。保留的
+    关键帧之间按 LINEAR 插值，与原曲线的误差不超过 tolerance。
+
+    所有通道中待检查的区间放在同一组扁平数组里，每轮一起拆分。长区间先按
+    间隔抽样寻找超出容差的帧并在那里拆分；抽样都在容差内时再逐帧检查一次，
+    因此误差上界与逐帧的 RDP 相同，但每轮的计算量与区间长度无关。
+    """
+    values = np.asarray(values, dtype=np.float64)
+    channels, count = values.shape
+    tolerance = np.broadcast_to(np.asarray(tolerance, dtype=np.float64), (channels,))
+    keep = np.zeros((channels, count), dtype=bool)
+    keep[:, 0] = True
+    if count == 1:
+        return keep
+
+    # 整条曲线都在容差内时只保留第一帧
+    constant = np.abs(values - values[:, :1]).max(axis=1) <= tolerance
+    keep[~constant, -1] = True
+
+    # 待检查的区间：(通道, 起始帧, 结束帧)，两端都是保留的关键帧；
+    # exact 表示该区间抽样已在容差内，需要逐帧检查
+    rows = np.flatnonzero(~constant)
+    starts = np.zeros(len(rows), dtype=np.int64)
+    ends = np.full(len(rows), count - 1, dtype=np.int64)
+    exact = np.zeros(len(rows), dtype=bool)
+
+    while len(rows):
+        interior = ends - starts - 1
+        pending = interior > 0
+        rows, starts, ends = rows[pending], starts[pending], ends[pending]
+        exact, interior = exact[pending], interior[pending]
+        if not len(rows):
+            break
+
+        # 把所有区间要检查的帧展开成一维数组
+        stride = np.where(exact, 1, np.maximum(1, interior // _COARSE_SAMPLES))
+        samples = (interior + stride - 1) // stride
+        first = np.cumsum(samples) - samples
+        segment = np.repeat(np.arange(len(rows)), samples)
+        offsets = np.arange(samples.sum()) - first[segment]
+        positions = starts[segment] + 1 + offsets * stride[segment]
+
+        start_values = values[rows, starts][segment]
+        end_values = values[rows, ends][segment]
+        t = (positions - starts[segment]) / (ends - starts)[segment]
+        error = np.abs(
+            values[rows[segment], positions]
+            - (start_values + (end_values - start_values) * t)
+        )
+
+        # 每个区间误差最大的帧（并列时取第一个）
+        segment_max = np.maximum.reduceat(error, first)
+        candidates = np.flatnonzero(error == segment_max[segment])
+        unique = np.ones(len(candidates), dtype=bool)
+        unique[1:] = segment[candidates][1:] != segment[candidates][:-1]
+        worst = positions[candidates[unique]]
+
+        split = segment_max > tolerance[rows]
+        # 抽样检查通过的区间下一轮逐帧检查，逐帧检查通过的区间完成
+        recheck = ~split & (stride > 1)
+
+        keep[rows[split], worst[split]] = True
+        rows = np.concatenate((rows[split], rows[split], rows[recheck]))
+        starts, ends, exact = (
+            np.concatenate((starts[split], worst[split], starts[recheck])),
+            np.concatenate((worst[split], ends[split], ends[recheck])),
+            np.concatenate(
+                (
+                    np.zeros(2 * split.sum(), dtype=bool),
+                    np.ones(recheck.sum(), dtype=bool),
+                )
+            ),
+        )
+    return keep
@@ -0,0 +1,108 @@
+import hashlib
+
+import bpy
+
+# 节点组上记录构建所用规格哈希的属性名
+SPEC_HASH_KEY = "uma_spec_hash"
+# 构建逻辑发生变化时递增，使旧节点组全部重建
+BUILDER_VERSION = 1
+
+
+def spec_hash(spec) -> str:
+    return hashlib.sha1(repr((BUILDER_VERSION, spec)).encode()).hexdigest()
+
+
+def _socket_key(name: str, in_out: str, socket_type: str) -> tuple:
+    return (name, in_out, socket_type)
+
+
+def _sync_interface(group, socket_specs):
+    """只增删与规格不同的接口插槽，保留相同插槽的标识符
+
+    接口插槽的标识符（Socket_N）由递增计数器分配，重新创建后会变化，
+    使用该节点组的组节点会因此丢失连接。
+    """
+    interface = group.interface
+    existing = {}
+    for item in interface.items_tree:
+        if item.item_type == "SOCKET":
+            key = _socket_key(item.name, item.in_out, item.socket_type)
+            existing.setdefault(key, []).append(item)
+
+    sockets = []
+    for socket_spec in socket_specs:
+        key = _socket_key(socket_spec.name, socket_spec.in_out, socket_spec.socket_type)
+        matches = existing.get(key)
+        if matches:
+            socket = matches.pop(0)
+        else:
+            socket = interface.new_socket(
+                name=socket_spec.name,
+                in_out=socket_spec.in_out,
+                socket_type=socket_spec.socket_type,
+            )
+        if socket_spec.default is not None:
+            socket.default_value = socket_spec.default  # pyright: ignore[reportAttributeAccessIssue]
+        sockets.append(socket)
+
+    for items in existing.values():
+        for item in items:
+            interface.remove(item)
+
+    for position, socket in enumerate(sockets):
+        if socket.position != position:
+            interface.move(socket, position)
+
+
+def _build_into(group, spec):
+    _sync_interface(group, spec.sockets)
+    group.nodes.clear()
+
+    nodes = {}
+    for node_spec in spec.nodes:
+        node = group.nodes.new(node_spec.type)
+        if node_spec.label:
+            node.name = node_spec.key
+            node.label = node_spec.label
+        node.location = node_spec.location
+        for attr, value in node_spec.properties.items():
+            setattr(node, attr, value)
+        for socket, value in node_spec.inputs.items():
+            node.inputs[socket].default_value = value  # pyright: ignore[reportAttributeAccessIssue]
+        nodes[node_spec.key] = node
+
+    links = group.links
+    for link in spec.links:
+        links.new(
+            nodes[link.from_node].outputs[link.from_socket],
+            nodes[link.to_node].inputs[link.to_socket],
+        )
+
+    group[SPEC_HASH_KEY] = spec_hash(spec)
+    return group
+
+
+def get_or_create_node_group(spec, tree_type: str = "ShaderNodeTree"):
+    """按规格返回节点组
+
+    已存在且哈希一致时直接复用；哈希不同（规格变化或旧版本插件创建）时
+    原地重建，使用该节点组的材质无需重新连接。
+    """
+    # 只查找本地节点组，从共享资产库链接的同名节点组不能修改
+    group = bpy.data.node_groups.get((spec.name, None))
+    if group is not None:
+        if group.get(SPEC_HASH_KEY) == spec_hash(spec):
+            return group
+        return _build_into(group, spec)
+
+    return new_node_group(spec, tree_type)
+
+
+def new_node_group(spec, tree_type: str = "ShaderNodeTree"):
+    """总是按规格新建节点组，名称冲突时由 Blender 加上数字后缀"""
+    group = bpy.data.node_groups.new(name=spec.name, type=tree_type)
+    return _build_into(group, spec)
+
+
+def is_stale(group, spec) -> bool:
+    return group.get(SPEC_HASH_KEY) != spec_hash(spec)
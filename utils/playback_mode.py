@@ -0,0 +1,115 @@
+import time
+
+import bpy
+
+from .profiling import phase
+
+# 播放性能模式的原始状态保存在骨架物体上（show_in_front 和修改器都属于物体），
+# 用于精确恢复
+PLAYBACK_STATE_KEY = "uma_playback_state"
+
+# 播放时临时关闭的修改器类型，以及名称中带这些关键字的修改器（描边）
+DISABLED_MODIFIER_TYPES = {"SUBSURF", "SOLIDIFY"}
+OUTLINE_MODIFIER_KEYWORDS = ("outline", "描边")
+
+
+def _is_heavy_modifier(modifier) -> bool:
+    if modifier.type in DISABLED_MODIFIER_TYPES:
+        return True
+    name = modifier.name.lower()
+    return any(keyword in name for keyword in OUTLINE_MODIFIER_KEYWORDS)
+
+
+def deformed_meshes(armature, scene):
+    """返回被该骨架驱动的网格：子物体，或带有指向该骨架的骨架修改器"""
+    meshes = []
+    for obj in scene.objects:
+        if obj.type != "MESH":
+            continue
+        if obj.parent == armature or any(
+            modifier.type == "ARMATURE" and modifier.object == armature
+            for modifier in obj.modifiers
+        ):
+            meshes.append(obj)
+    return meshes
+
+
+def is_playback_mode(armature) -> bool:
+    return PLAYBACK_STATE_KEY in armature
+
+
+def measure_playback_fps(scene, frames: int, start_frame: int) -> float:
+    """逐帧步进时间线并返回每秒求值的帧数，结束后回到原来的帧
+
+    只包括依赖图求值，不包括视图绘制。
+    """
+    if frames <= 0:
+        return 0.0
+    original_frame = scene.frame_current
+    scene.frame_set(start_frame - 1)
+    start = time.perf_counter()
+    for i in range(frames):
+        scene.frame_set(start_frame + i)
+    seconds = time.perf_counter() - start
+    scene.frame_set(original_frame)
+    return frames / seconds if seconds else 0.0
+
+
+def enable_playback_mode(armature, scene, display_type: str = "STICK") -> int:
+    """一次应用所有提升播放帧率的设置，并记录原始状态，返回修改的项数
+
+    已处于播放性能模式时只更新骨骼显示方式，不覆盖原始状态。
+    """
+    data = armature.data
+    if is_playback_mode(armature):
+        data.display_type = display_type
+        return 0
+
+    state = {
+        "display_type": data.display_type,
+        "show_in_front": int(armature.show_in_front),
+        "modifiers": {},
+    }
+    changed = 2
+
+    with phase("骨架显示"):
+        data.display_type = display_type
+        armature.show_in_front = False
+
+    with phase("修改器"):
+        for mesh in deformed_meshes(armature, scene):
+            disabled = {}
+            for modifier in mesh.modifiers:
+                if _is_heavy_modifier(modifier) and modifier.show_viewport:
+                    disabled[modifier.name] = 1
+                    modifier.show_viewport = False
+            if disabled:
+                state["modifiers"][mesh.name] = disabled
+                changed += len(disabled)
+
+    armature[PLAYBACK_STATE_KEY] = state
+    return changed
+
+
+def disable_playback_mode(armature) -> bool:
+    """恢复进入播放性能模式前记录的状态，没有记录时返回 False"""
+    data = armature.data
+    state = armature.get(PLAYBACK_STATE_KEY)
+    if state is None:
+        return False
+    state = state.to_dict()
+
+    data.display_type = state["display_type"]
+    armature.show_in_front = bool(state["show_in_front"])
+
+    for mesh_name, modifier_names in state["modifiers"].items():
+        mesh = bpy.data.objects.get(mesh_name)
+        if mesh is None:
+            continue
+        for modifier_name in modifier_names:
+            modifier = mesh.modifiers.get(modifier_name)
+            if modifier is not None:
+                modifier.show_viewport = True
+
+    del armature[PLAYBACK_STATE_KEY]
+    return True
@@ -0,0 +1,207 @@
+import numpy as np
+
+# Blender 中 16*FLT_EPSILON，与 mathutils 的欧拉角分解阈值一致
+_EULER_EPSILON = 16 * np.finfo(np.float32).eps
+
+
+def read_floats(collection, attr: str, width: int = 1) -> np.ndarray:
+    """用 foreach_get 一次性读取集合中所有元素的浮点属性"""
+    data = np.empty(len(collection) * width, dtype=np.float32)
+    collection.foreach_get(attr, data)
+    return data.reshape(-1, width) if width > 1 else data
+
+
+def write_floats(collection, attr: str, values: np.ndarray):
+    collection.foreach_set(attr, np.ascontiguousarray(values, dtype=np.float32).ravel())
+
+
+def read_bools(collection, attr: str) -> np.ndarray:
+    data = np.empty(len(collection), dtype=bool)
+    collection.foreach_get(attr, data)
+    return data
+
+
+def write_bools(collection, attr: str, values: np.ndarray):
+    collection.foreach_set(attr, np.ascontiguousarray(values, dtype=bool))
+
+
+def read_matrices(collection, attr: str = "matrix") -> np.ndarray:
+    """读取 4x4 矩阵属性，返回 (n, 4, 4) 的行优先数组
+
+    RNA 中矩阵按列存储，因此读取后需要转置。
+    """
+    return read_floats(collection, attr, 16).reshape(-1, 4, 4).transpose(0, 2, 1)
+
+
+def write_matrices(collection, attr: str, matrices: np.ndarray):
+    write_floats(collection, attr, matrices.transpose(0, 2, 1))
+
+
+def normalized_rotations(matrices: np.ndarray) -> np.ndarray:
+    """取出 (n, 4, 4) 或 (n, 3, 3) 矩阵的旋转部分并去掉缩放"""
+    rotations = matrices[..., :3, :3].astype(np.float64)
+    norms = np.linalg.norm(rotations, axis=-2, keepdims=True)
+    return rotations / np.where(norms == 0.0, 1.0, norms)
+
+
+# 欧拉角顺序对应的 (第一, 第二, 第三) 旋转轴和奇偶性，与 Blender 的 rotOrders 表一致
+_EULER_ORDERS = {
+    "XYZ": (0, 1, 2, False),
+    "XZY": (0, 2, 1, True),
+    "YXZ": (1, 0, 2, True),
+    "YZX": (1, 2, 0, False),
+    "ZXY": (2, 0, 1, False),
+    "ZYX": (2, 1, 0, True),
+}
+
+
+def rotations_to_euler(rotations: np.ndarray, order: str = "XYZ") -> np.ndarray:
+    """把 (n, 3, 3) 旋转矩阵转换为欧拉角，结果与 Matrix.to_euler(order) 相同"""
+    i, j, k, parity = _EULER_ORDERS[order]
+    m = rotations
+    cy = np.hypot(m[:, i, i], m[:, j, i])
+    regular = cy > _EULER_EPSILON
+
+    # 两组等价解，取各分量绝对值之和较小的一组
+    eul1 = np.empty((len(m), 3))
+    eul1[:, i] = np.arctan2(m[:, k, j], m[:, k, k])
+    eul1[:, j] = np.arctan2(-m[:, k, i], cy)
+    eul1[:, k] = np.arctan2(m[:, j, i], m[:, i, i])
+    eul2 = np.empty((len(m), 3))
+    eul2[:, i] = np.arctan2(-m[:, k, j], -m[:, k, k])
+    eul2[:, j] = np.arctan2(-m[:, k, i], -cy)
+    eul2[:, k] = np.arctan2(-m[:, j, i], -m[:, i, i])
+    if parity:
+        eul1, eul2 = -eul1, -eul2
+    use_eul2 = np.abs(eul2).sum(axis=-1) < np.abs(eul1).sum(axis=-1)
+    euler = np.where(use_eul2[:, None], eul2, eul1)
+
+    # 万向节锁：cy 接近 0 时只有一组解
+    gimbal = np.zeros((len(m), 3))
+    gimbal[:, i] = np.arctan2(-m[:, j, k], m[:, j, j])
+    gimbal[:, j] = np.arctan2(-m[:, k, i], cy)
+    if parity:
+        gimbal = -gimbal
+    return np.where(regular[:, None], euler, gimbal)
+
+
+def rotations_to_euler_xyz(rotations: np.ndarray) -> np.ndarray:
+    return rotations_to_euler(rotations, "XYZ")
+
+
+def rotations_between(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """返回把单位向量 a 转到单位向量 b 的最小旋转矩阵，形状 (n, 3, 3)"""
+    axis = np.cross(a, b)
+    sin = np.linalg.norm(axis, axis=-1)
+    cos = np.einsum("ij,ij->i", a, b)
+
+    # Rodrigues 公式：R = I + [v]x + [v]x^2 / (1 + cos)，v = a x b
+    skew = np.zeros((len(a), 3, 3))
+    skew[:, 0, 1], skew[:, 0, 2] = -axis[:, 2], axis[:, 1]
+    skew[:, 1, 0], skew[:, 1, 2] = axis[:, 2], -axis[:, 0]
+    skew[:, 2, 0], skew[:, 2, 1] = -axis[:, 1], axis[:, 0]
+    scale = 1.0 / np.maximum(1.0 + cos, 1e-8)
+    rotations = np.eye(3) + skew + skew @ skew * scale[:, None, None]
+
+    # 方向几乎相反时公式退化，两向量此时也不会在单帧内出现，直接保持不动
+    rotations[(cos < -1.0 + 1e-6) & (sin < 1e-6)] = np.eye(3)
+    return rotations
+
+
+def matrices_to_quaternions(rotations: np.ndarray) -> np.ndarray:
+    """把 (n, 3, 3) 旋转矩阵转换为 (n, 4) 的 WXYZ 四元数，w 非负"""
+    m = rotations
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+    # 对每个矩阵选数值最稳定的分支：trace、或对角线上最大的分量
+    candidates = np.stack([trace, m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]], axis=-1)
+    branch = np.argmax(candidates, axis=-1)
+    q = np.empty((len(m), 4))
+
+    s = np.sqrt(np.maximum(1.0 + trace, 1e-12)) * 2
+    w_branch = np.stack(
+        [
+            0.25 * s,
+            (m[:, 2, 1] - m[:, 1, 2]) / s,
+            (m[:, 0, 2] - m[:, 2, 0]) / s,
+            (m[:, 1, 0] - m[:, 0, 1]) / s,
+        ],
+        axis=-1,
+    )
+    s = np.sqrt(np.maximum(1.0 + m[:, 0, 0] - m[:, 1, 1] - m[:, 2, 2], 1e-12)) * 2
+    x_branch = np.stack(
+        [
+            (m[:, 2, 1] - m[:, 1, 2]) / s,
+            0.25 * s,
+            (m[:, 0, 1] + m[:, 1, 0]) / s,
+            (m[:, 0, 2] + m[:, 2, 0]) / s,
+        ],
+        axis=-1,
+    )
+    s = np.sqrt(np.maximum(1.0 + m[:, 1, 1] - m[:, 0, 0] - m[:, 2, 2], 1e-12)) * 2
+    y_branch = np.stack(
+        [
+            (m[:, 0, 2] - m[:, 2, 0]) / s,
+            (m[:, 0, 1] + m[:, 1, 0]) / s,
+            0.25 * s,
+            (m[:, 1, 2] + m[:, 2, 1]) / s,
+        ],
+        axis=-1,
+    )
+    s = np.sqrt(np.maximum(1.0 + m[:, 2, 2] - m[:, 0, 0] - m[:, 1, 1], 1e-12)) * 2
+    z_branch = np.stack(
+        [
+            (m[:, 1, 0] - m[:, 0, 1]) / s,
+            (m[:, 0, 2] + m[:, 2, 0]) / s,
+            (m[:, 1, 2] + m[:, 2, 1]) / s,
+            0.25 * s,
+        ],
+        axis=-1,
+    )
+    for index, values in enumerate((w_branch, x_branch, y_branch, z_branch)):
+        q[branch == index] = values[branch == index]
+
+    q /= np.linalg.norm(q, axis=-1, keepdims=True)
+    return np.where(q[:, :1] < 0, -q, q)
+
+
+def continuous_quaternions(quaternions: np.ndarray) -> np.ndarray:
+    """沿第 0 轴（帧）翻转四元数符号，使相邻帧之间插值走最短路径
+
+    quaternions 形状为 (帧数, ..., 4)。
+    """
+    q = quaternions.copy()
+    for i in range(1, len(q)):
+        flip = np.sum(q[i] * q[i - 1], axis=-1) < 0
+        q[i][flip] *= -1
+    return q
+
+
+def quaternions_to_axis_angles(quaternions: np.ndarray) -> np.ndarray:
+    """把 (n, 4) 的 WXYZ 四元数转换为 (n, 4) 的 (角度, 轴 X, 轴 Y, 轴 Z)
+
+    不要求 w 非负，经过 continuous_quaternions 的输入得到连续的角度。
+    旋转为零时轴取 Blender 的默认值 Y。
+    """
+    w = np.clip(quaternions[:, 0], -1.0, 1.0)
+    xyz = quaternions[:, 1:]
+    sin = np.linalg.norm(xyz, axis=-1)
+    axis = np.where(
+        sin[:, None] > 1e-9,
+        xyz / np.maximum(sin, 1e-9)[:, None],
+        np.array([0.0, 1.0, 0.0]),
+    )
+    return np.column_stack((2.0 * np.arctan2(sin, w), axis))
+
+
+def rotation_channels(rotation_mode: str, rotations: np.ndarray) -> tuple:
+    """按骨骼的旋转模式把 (帧数, 3, 3) 旋转矩阵转换为关键帧通道
+
+    返回 (属性名, (帧数, 分量数) 的值)，相邻帧之间的值是连续的。
+    """
+    if rotation_mode in _EULER_ORDERS:
+        euler = rotations_to_euler(rotations, rotation_mode)
+        return "rotation_euler", np.unwrap(euler, axis=0)
+    quaternions = continuous_quaternions(matrices_to_quaternions(rotations))
+    if rotation_mode == "AXIS_ANGLE":
+        return "rotation_axis_angle", quaternions_to_axis_angles(quaternions)
+    return "rotation_quaternion", quaternions
@@ -0,0 +1,109 @@
+import numpy as np
+
+from .display_state import bone_names_hash
+from .pose_math import read_floats, write_floats
+
+# 命名姿态存放在骨架物体上（姿态属于物体而不是骨架数据）
+POSES_KEY = "uma_poses"
+
+# 每根姿态骨骼保存的通道及宽度，按顺序拼成一行
+POSE_CHANNELS = [
+    ("location", 3),
+    ("rotation_quaternion", 4),
+    ("rotation_euler", 3),
+    ("scale", 3),
+]
+_QUATERNION = slice(3, 7)
+
+
+def capture_pose(armature) -> np.ndarray:
+    """读取所有姿态骨骼的变换，返回 (骨骼数, 13) 的数组"""
+    pose_bones = armature.pose.bones
+    return np.hstack(
+        [read_floats(pose_bones, attr, width) for attr, width in POSE_CHANNELS]
+    )
+
+
+def write_pose(armature, pose: np.ndarray):
+    """每个通道一次 foreach_set 写回所有姿态骨骼"""
+    pose_bones = armature.pose.bones
+    column = 0
+    for attr, width in POSE_CHANNELS:
+        write_floats(pose_bones, attr, pose[:, column : column + width])
+        column += width
+    # foreach_set 不会触发 RNA 更新，手动标记以刷新视图
+    armature.update_tag()
+
+
+def blend_poses(a: np.ndarray, b: np.ndarray, factor: float) -> np.ndarray:
+    """位置、欧拉角和缩放线性插值，四元数沿最短路径归一化插值（nlerp）"""
+    result = a + (b - a) * factor
+    qa, qb = a[:, _QUATERNION], b[:, _QUATERNION]
+    qb = np.where((qa * qb).sum(axis=1, keepdims=True) < 0, -qb, qb)
+    q = qa + (qb - qa) * factor
+    norms = np.linalg.norm(q, axis=1, keepdims=True)
+    result[:, _QUATERNION] = np.where(norms > 1e-8, q / np.maximum(norms, 1e-8), qa)
+    return result
+
+
+def _encode(armature, pose: np.ndarray) -> dict:
+    # "data" 存为浮点 IDProperty 数组，可以在自定义属性面板中查看
+    return {
+        "names_hash": bone_names_hash(armature.pose.bones.keys()),
+        "count": len(pose),
+        "data": pose.astype(np.float32).ravel(),
+    }
+
+
+def _decode(armature, state) -> np.ndarray | None:
+    """骨骼名或数量与保存时不一致时返回 None"""
+    if state.get("names_hash") != bone_names_hash(armature.pose.bones.keys()):
+        return None
+    pose = np.asarray(state["data"], dtype=np.float32)
+    width = sum(width for _, width in POSE_CHANNELS)
+    if pose.size != int(state["count"]) * width:
+        return None
+    return pose.reshape(-1, width)
+
+
+def pose_names(armature) -> list[str]:
+    poses = armature.get(POSES_KEY)
+    return sorted(poses.keys()) if poses is not None else []
+
+
+def save_pose(armature, name: str):
+    if POSES_KEY not in armature:
+        armature[POSES_KEY] = {}
+    armature[POSES_KEY][name] = _encode(armature, capture_pose(armature))
+
+
+def load_pose(armature, name: str) -> np.ndarray | None:
+    poses = armature.get(POSES_KEY)
+    if poses is None or name not in poses:
+        return None
+    return _decode(armature, poses[name])
+
+
+def apply_pose(armature, name: str, blend_name: str = "", factor: float = 0.0) -> bool:
+    """应用命名姿态，给出 blend_name 时按 factor 与第二个姿态混合
+
+    姿态不存在或与当前骨骼不一致时不做修改并返回 False。
+    """
+    pose = load_pose(armature, name)
+    if pose is None:
+        return False
+    if blend_name:
+        other = load_pose(armature, blend_name)
+        if other is None:
+            return False
+        pose = blend_poses(pose, other, factor)
+    write_pose(armature, pose)
+    return True
+
+
+def remove_pose(armature, name: str) -> bool:
+    poses = armature.get(POSES_KEY)
+    if poses is None or name not in poses:
+        return False
+    del poses[name]
+    return True
@@ -0,0 +1,157 @@
+import cProfile
+import functools
+import json
+import os
+import tempfile
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+import bpy
+
+from ..config.settings import get_settings
+
+ProfilingOptions = namedtuple(
+    "ProfilingOptions",
+    [
+        "enabled",  # 是否报告各阶段耗时
+        "log_path",  # JSONL 日志文件，空字符串表示不写入
+        "use_cprofile",  # 是否用 cProfile 运行
+        "output_dir",  # .prof 文件保存目录
+    ],
+)
+
+# 后台批处理没有场景设置时，用这些环境变量打开分析
+ENV_ENABLED = "UMA_TOOLS_PROFILE"
+ENV_LOG_PATH = "UMA_TOOLS_PROFILE_LOG"
+ENV_CPROFILE_DIR = "UMA_TOOLS_CPROFILE_DIR"
+
+
+class PhaseTimer:
+    """按阶段累计耗时，同名阶段多次进入时累加"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.phases: dict[str, float] = {}
+        self.total = 0.0
+
+    def add(self, phase_name: str, seconds: float):
+        self.phases[phase_name] = self.phases.get(phase_name, 0.0) + seconds
+
+    def summary(self) -> str:
+        phases = "，".join(
+            f"{name} {seconds * 1000:.2f} ms" for name, seconds in self.phases.items()
+        )
+        text = f"{self.name} 共 {self.total * 1000:.2f} ms"
+        return f"{text}：{phases}" if phases else text
+
+    def record(self) -> dict:
+        return {
+            "operator": self.name,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "blend_file": bpy.data.filepath,
+            "total_ms": round(self.total * 1000, 4),
+            "phases_ms": {
+                name: round(seconds * 1000, 4) for name, seconds in self.phases.items()
+            },
+        }
+
+
+# 当前正在计时的操作符，嵌套调用时取最内层
+_active_timers: list[PhaseTimer] = []
+
+
+@contextmanager
+def phase(name: str):
+    """把代码块的耗时记到当前操作符的计时器上，没有计时器时不做任何事"""
+    if not _active_timers:
+        yield
+        return
+    timer = _active_timers[-1]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - start)
+
+
+@contextmanager
+def timing(name: str):
+    """在代码块内启用一个计时器，供没有操作符的场合（如后台批处理）使用"""
+    timer = PhaseTimer(name)
+    _active_timers.append(timer)
+    start = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        timer.total = time.perf_counter() - start
+        _active_timers.pop()
+
+
+def profiling_options(context) -> ProfilingOptions:
+    settings = get_settings(context)
+    if settings is not None and (
+        settings.profiling_enabled
+        or settings.profiling_log_path
+        or settings.profiling_use_cprofile
+    ):
+        return ProfilingOptions(
+            enabled=settings.profiling_enabled,
+            log_path=bpy.path.abspath(settings.profiling_log_path),
+            use_cprofile=settings.profiling_use_cprofile,
+            output_dir=bpy.path.abspath(settings.profiling_output_dir),
+        )
+    cprofile_dir = os.environ.get(ENV_CPROFILE_DIR, "")
+    return ProfilingOptions(
+        enabled=bool(os.environ.get(ENV_ENABLED)),
+        log_path=os.environ.get(ENV_LOG_PATH, ""),
+        use_cprofile=bool(cprofile_dir),
+        output_dir=cprofile_dir,
+    )
+
+
+def _append_log(log_path: str, record: dict):
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _dump_profile(profiler: cProfile.Profile, output_dir: str, name: str) -> str:
+    output_dir = output_dir or tempfile.gettempdir()
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    path = os.path.join(output_dir, f"{name.replace('.', '_')}_{stamp}.prof")
+    profiler.dump_stats(path)
+    return path
+
+
+def profiled(execute):
+    """装饰操作符的 execute，按设置记录各阶段耗时并可选地运行 cProfile"""
+
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        options = profiling_options(context)
+        if not (options.enabled or options.log_path or options.use_cprofile):
+            return execute(self, context)
+
+        profiler = cProfile.Profile() if options.use_cprofile else None
+
+        with timing(self.bl_idname) as timer:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                result = execute(self, context)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+
+        if options.enabled:
+            self.report({"INFO"}, timer.summary())
+        if options.log_path:
+            _append_log(options.log_path, timer.record())
+        if profiler is not None:
+            path = _dump_profile(profiler, options.output_dir, self.bl_idname)
+            self.report({"INFO"}, f"性能分析已保存到 {path}")
+        return result
+
+    return wrapper
@@ -0,0 +1,321 @@
+import math
+from collections import namedtuple
+
+import bpy
+import numpy as np
+
+from ..config.retarget_config import RETARGET_MAPS, RETARGET_ROOT_BONE
+from .bone_rules import SIDE_SUFFIX_ALIASES
+from .keyframes import (
+    INTERPOLATION_LINEAR,
+    get_or_create_fcurve,
+    reduce_keyframes,
+    write_keyframes,
+)
+from .pose_math import (
+    continuous_quaternions,
+    matrices_to_quaternions,
+    normalized_rotations,
+    read_matrices,
+)
+from .profiling import phase
+from .visual_bake import basis_offsets
+
+RetargetResult = namedtuple(
+    "RetargetResult",
+    [
+        "bones",  # 重定向的骨骼数量
+        "frames",  # 采样的帧数
+        "keys",  # 写入的关键帧数量
+        "missing",  # 映射表中在源或目标骨架里找不到的骨骼
+    ],
+)
+
+# 同一深度的目标骨骼，父骨骼都已在上一层求出世界矩阵
+_TargetLevel = namedtuple(
+    "_TargetLevel",
+    [
+        "columns",  # 在目标骨骼列表中的位置
+        "parent_columns",  # 父骨骼在目标骨骼列表中的位置，-1 表示没有父骨骼
+        "offsets",  # 父骨骼静止矩阵^-1 @ 骨骼静止矩阵，(k, 4, 4)
+        "mapped",  # 是否由源骨骼驱动
+        "sources",  # 驱动它的源骨骼在映射列表中的位置
+    ],
+)
+
+
+def _strip_prefix(name: str) -> str:
+    return name.rsplit(":", 1)[-1]
+
+
+def _resolve_target(bones, name: str) -> str | None:
+    if name in bones:
+        return name
+    for suffix, alias in SIDE_SUFFIX_ALIASES.items():
+        if name.endswith(suffix):
+            alias_name = name[: -len(suffix)] + alias
+            if alias_name in bones:
+                return alias_name
+    return None
+
+
+def resolve_mapping(source, target, preset: str):
+    """返回 [(源骨骼名, 目标骨骼名)] 以及找不到的映射项"""
+    source_names = {_strip_prefix(name): name for name in source.data.bones.keys()}
+    pairs = []
+    missing = []
+    for source_name, target_name in RETARGET_MAPS[preset].items():
+        actual_source = source_names.get(source_name)
+        actual_target = _resolve_target(target.data.bones, target_name)
+        if actual_source is None or actual_target is None:
+            missing.append(f"{source_name} -> {target_name}")
+            continue
+        pairs.append((actual_source, actual_target))
+    return pairs, missing
+
+
+def _target_levels(target, target_names):
+    """按深度把映射的目标骨骼及其所有祖先分层"""
+    bones = target.data.bones
+    involved = {}
+    for name in target_names:
+        bone = bones[name]
+        while bone is not None and bone.name not in involved:
+            involved[bone.name] = bone
+            bone = bone.parent
+
+    def depth(bone):
+        return 0 if bone.parent is None else depth(bone.parent) + 1
+
+    names = sorted(involved, key=lambda name: depth(involved[name]))
+    column = {name: i for i, name in enumerate(names)}
+    mapped = {name: i for i, name in enumerate(target_names)}
+
+    by_depth = {}
+    for name in names:
+        by_depth.setdefault(depth(involved[name]), []).append(name)
+
+    levels = []
+    for level_names in by_depth.values():
+        offsets = []
+        for name in level_names:
+            bone = involved[name]
+            rest = np.array(bone.matrix_local, dtype=np.float64)
+            if bone.parent is not None:
+                rest = np.linalg.inv(np.array(bone.parent.matrix_local)) @ rest
+            offsets.append(rest)
+        levels.append(
+            _TargetLevel(
+                columns=np.array([column[name] for name in level_names]),
+                parent_columns=np.array(
+                    [
+                        column[involved[name].parent.name]
+                        if involved[name].parent is not None
+                        else -1
+                        for name in level_names
+                    ]
+                ),
+                offsets=np.array(offsets),
+                mapped=np.array([name in mapped for name in level_names]),
+                sources=np.array([mapped.get(name, 0) for name in level_names]),
+            )
+        )
+    return names, levels
+
+
+def _sample(source, target, scene, source_names, target_names, unmapped, frames):
+    """逐帧读取源骨骼的世界矩阵和目标骨架中未映射骨骼的 matrix_basis
+
+    返回 (源世界矩阵 (帧, 源骨骼, 4, 4), 目标局部矩阵 (帧, 目标骨骼, 4, 4))；
+    目标局部矩阵只有 unmapped 中的骨骼有意义，其余为单位矩阵。
+    """
+    source_bones = source.pose.bones
+    source_index = {name: i for i, name in enumerate(source_bones.keys())}
+    source_rows = np.array([source_index[name] for name in source_names])
+
+    target_bones = target.pose.bones
+    target_index = {name: i for i, name in enumerate(target_bones.keys())}
+    unmapped_columns = np.array(
+        [target_names.index(name) for name in unmapped], dtype=int
+    )
+    unmapped_rows = np.array([target_index[name] for name in unmapped], dtype=int)
+    offsets, parents = basis_offsets(target, unmapped)
+    has_parent = parents >= 0
+
+    source_world = np.empty((len(frames), len(source_names), 4, 4))
+    target_basis = np.tile(np.eye(4), (len(frames), len(target_names), 1, 1))
+    original_frame = scene.frame_current
+    for f, frame in enumerate(frames):
+        scene.frame_set(int(frame))
+        world = np.array(source.matrix_world, dtype=np.float64)
+        source_world[f] = world @ read_matrices(source_bones)[source_rows]
+        if len(unmapped):
+            pose = read_matrices(target_bones).astype(np.float64)
+            local = pose[unmapped_rows]
+            local[has_parent] = (
+                np.linalg.inv(pose[parents[has_parent]]) @ local[has_parent]
+            )
+            target_basis[f, unmapped_columns] = offsets @ local
+    scene.frame_set(original_frame)
+    return source_world, target_basis
+
+
+def _solve_target(
+    target, pairs, source_world, source_rest, target_names, levels, target_basis
+):
+    """逐层批量求解所有帧的目标骨骼 matrix_basis，返回 (帧, 映射骨骼, 4, 4)
+
+    未映射的祖先骨骼使用 target_basis 中采样的姿态。
+    """
+    frame_count = len(source_world)
+    target_world_matrix = np.array(target.matrix_world, dtype=np.float64)
+    bones = target.data.bones
+    target_rest = np.array(
+        [target_world_matrix @ np.array(bones[t].matrix_local) for _, t in pairs]
+    )
+
+    # 静止姿态校正只计算一次：目标世界旋转 = 源世界旋转 @ 源静止旋转^-1 @ 目标静止旋转
+    corrections = normalized_rotations(source_rest).transpose(0, 2, 1) @ (
+        normalized_rotations(target_rest)
+    )
+    target_rotations = normalized_rotations(source_world) @ corrections
+
+    # 根骨骼位移：源根骨骼相对静止位置的位移按腿长（静止高度）比例缩放
+    root = next((i for i, (_, t) in enumerate(pairs) if t == RETARGET_ROOT_BONE), None)
+    root_positions = None
+    if root is not None:
+        source_height = max(source_rest[root, 2, 3], 1e-6)
+        scale = target_rest[root, 2, 3] / source_height
+        root_positions = (
+            target_rest[root, :3, 3]
+            + (source_world[:, root, :3, 3] - source_rest[root, :3, 3]) * scale
+        )
+
+    world = np.empty((frame_count, len(target_names), 4, 4))
+    basis = np.tile(np.eye(4), (frame_count, len(pairs), 1, 1))
+    for level in levels:
+        parent_world = np.empty((frame_count, len(level.columns), 4, 4))
+        has_parent = level.parent_columns >= 0
+        parent_world[:, has_parent] = world[:, level.parent_columns[has_parent]]
+        parent_world[:, ~has_parent] = target_world_matrix
+        # 旋转为单位时的世界矩阵
+        frame = parent_world @ level.offsets
+
+        local = target_basis[:, level.columns]
+        mapped = np.flatnonzero(level.mapped)
+        if len(mapped):
+            sources = level.sources[mapped]
+            rest_rotation = normalized_rotations(frame[:, mapped])
+            local[:, mapped, :3, :3] = (
+                rest_rotation.transpose(0, 1, 3, 2) @ target_rotations[:, sources]
+            )
+            if root is not None and root in sources:
+                at = mapped[list(sources).index(root)]
+                inverse = np.linalg.inv(frame[:, at])
+                local[:, at, :3, 3] = (inverse[:, :3, :3] @ root_positions[..., None])[
+                    ..., 0
+                ] + inverse[:, :3, 3]
+            basis[:, sources] = local[:, mapped]
+        world[:, level.columns] = frame @ local
+    return basis
+
+
+def retarget(
+    source,
+    target,
+    scene,
+    preset: str,
+    frame_start: int,
+    frame_end: int,
+    reduce: bool = True,
+    rotation_tolerance: float = math.radians(0.1),
+    location_tolerance: float = 1e-4,
+) -> RetargetResult:
+    """把源骨架的动作重定向到赛马娘骨架，写入目标骨架的动作
+
+    映射骨骼写入四元数旋转，根骨骼额外写入位置；reduce 时用误差受限的
+    简化去掉多余关键帧。
+    """
+    pairs, missing = resolve_mapping(source, target, preset)
+    if not pairs:
+        return RetargetResult(bones=0, frames=0, keys=0, missing=missing)
+
+    source_names = [s for s, _ in pairs]
+    target_names = [t for _, t in pairs]
+    frames = np.arange(frame_start, frame_end + 1)
+
+    with phase("采样"):
+        names, levels = _target_levels(target, target_names)
+        unmapped = [name for name in names if name not in target_names]
+        source_world_matrix = np.array(source.matrix_world, dtype=np.float64)
+        source_rest = np.array(
+            [
+                source_world_matrix @ np.array(source.data.bones[s].matrix_local)
+                for s in source_names
+            ]
+        )
+        source_world, target_basis = _sample(
+            source, target, scene, source_names, names, unmapped, frames
+        )
+
+    with phase("求解"):
+        basis = _solve_target(
+            target, pairs, source_world, source_rest, names, levels, target_basis
+        )
+        quaternions = continuous_quaternions(
+            matrices_to_quaternions(basis[..., :3, :3].reshape(-1, 3, 3)).reshape(
+                len(frames), len(pairs), 4
+            )
+        )
+
+    channels = []
+    for column, name in enumerate(target_names):
+        path = f'pose.bones["{bpy.utils.escape_identifier(name)}"]'
+        for axis in range(4):
+            channels.append(
+                (
+                    f"{path}.rotation_quaternion",
+                    axis,
+                    name,
+                    quaternions[:, column, axis],
+                )
+            )
+        if name == RETARGET_ROOT_BONE:
+            for axis in range(3):
+                channels.append(
+                    (f"{path}.location", axis, name, basis[:, column, axis, 3])
+                )
+    values = np.array([channel[3] for channel in channels])
+
+    with phase("简化"):
+        if reduce:
+            tolerance = np.array(
+                [
+                    location_tolerance
+                    if channel[0].endswith(".location")
+                    else rotation_tolerance / 2
+                    for channel in channels
+                ]
+            )
+            keep = reduce_keyframes(values, tolerance)
+        else:
+            keep = np.ones(values.shape, dtype=bool)
+
+    with phase("写入关键帧"):
+        for name in target_names:
+            target.pose.bones[name].rotation_mode = "QUATERNION"
+        keys = 0
+        for (data_path, index, name, channel_values), channel_keep in zip(
+            channels, keep
+        ):
+            fcurve = get_or_create_fcurve(target, data_path, index=index, group=name)
+            keys += write_keyframes(
+                fcurve,
+                frames[channel_keep],
+                channel_values[channel_keep],
+                INTERPOLATION_LINEAR,
+            )
+
+    return RetargetResult(
+        bones=len(pairs), frames=len(frames), keys=keys, missing=missing
+    )
@@ -0,0 +1,310 @@
+import re
+from collections import namedtuple
+from contextlib import contextmanager
+
+import bpy
+import numpy as np
+
+from ..config.bone_config import HIDDEN_BONE_SUFFIX
+from ..config.spring_config import SPRING_CONFIGS
+from .bone_rules import is_pattern, pattern_regex
+from .keyframes import INTERPOLATION_LINEAR, get_or_create_fcurve, write_keyframes
+from .profiling import phase
+from .pose_math import (
+    normalized_rotations,
+    read_matrices,
+    rotation_channels,
+    rotations_between,
+)
+
+_GRAVITY_DIRECTION = np.array([0.0, 0.0, -1.0])
+
+# 烘焙结果动作上指向输入动作的自定义属性
+SPRING_SOURCE_PROPERTY = "uma_spring_source"
+
+# 各旋转模式下表示无旋转的属性值
+_IDENTITY_ROTATIONS = {
+    "rotation_quaternion": (1.0, 0.0, 0.0, 0.0),
+    "rotation_axis_angle": (0.0, 0.0, 1.0, 0.0),
+    "rotation_euler": (0.0, 0.0, 0.0),
+}
+
+_SPRING_PATTERNS = [
+    (
+        re.compile(
+            pattern_regex(config.bone_name)
+            if is_pattern(config.bone_name)
+            else re.escape(config.bone_name)
+        ),
+        config,
+    )
+    for config in SPRING_CONFIGS
+]
+
+# 同一深度的动态骨骼，父骨骼都已在上一层求解，可以一次批量计算
+SpringLevel = namedtuple(
+    "SpringLevel",
+    [
+        "rows",  # 骨骼在 armature.data.bones 中的索引
+        "parent_rows",  # 父骨骼的索引
+        "rest_offsets",  # 父骨骼静止矩阵的逆 @ 骨骼静止矩阵，(k, 4, 4)
+        "lengths",  # 骨骼长度
+        "stiffness",
+        "drag",
+        "gravity",
+    ],
+)
+
+SpringBakeResult = namedtuple(
+    "SpringBakeResult",
+    [
+        "bones",
+        "frames",
+        "keys",
+        "action",  # 写入烘焙结果的动作
+    ],
+)
+
+
+def spring_config(bone_name: str):
+    """返回骨骼使用的动态骨骼参数，不是动态骨骼时返回 None"""
+    if bone_name.endswith(HIDDEN_BONE_SUFFIX):
+        return None
+    return next(
+        (
+            config
+            for pattern, config in _SPRING_PATTERNS
+            if pattern.fullmatch(bone_name)
+        ),
+        None,
+    )
+
+
+def spring_levels(armature) -> list:
+    """把骨架中的所有动态骨骼链按深度分层
+
+    第 0 层是父骨骼不是动态骨骼的链根，第 k 层是第 k-1 层的子骨骼。
+    """
+    bones = armature.data.bones
+    index = {name: i for i, name in enumerate(bones.keys())}
+    configs = {bone.name: spring_config(bone.name) for bone in bones}
+
+    depths = {}
+
+    def depth(bone):
+        if bone.name not in depths:
+            parent = bone.parent
+            if parent is None:
+                depths[bone.name] = None
+            elif configs[parent.name] is None:
+                depths[bone.name] = 0
+            else:
+                parent_depth = depth(parent)
+                depths[bone.name] = None if parent_depth is None else parent_depth + 1
+        return depths[bone.name]
+
+    by_depth = {}
+    for bone in bones:
+        if configs[bone.name] is not None and depth(bone) is not None:
+            by_depth.setdefault(depths[bone.name], []).append(bone)
+
+    rest = np.array([bone.matrix_local for bone in bones], dtype=np.float64)
+    levels = []
+    for level_depth in sorted(by_depth):
+        level_bones = by_depth[level_depth]
+        rows = np.array([index[bone.name] for bone in level_bones])
+        parent_rows = np.array([index[bone.parent.name] for bone in level_bones])
+        level_configs = [configs[bone.name] for bone in level_bones]
+        levels.append(
+            SpringLevel(
+                rows=rows,
+                parent_rows=parent_rows,
+                rest_offsets=np.linalg.inv(rest[parent_rows]) @ rest[rows],
+                lengths=np.array([bone.length for bone in level_bones]),
+                stiffness=np.array([config.stiffness for config in level_configs]),
+                drag=np.array([config.drag for config in level_configs]),
+                gravity=np.array([config.gravity for config in level_configs]),
+            )
+        )
+    return levels
+
+
+def _step_level(level, sampled, solved, state, dt):
+    """求解一层动态骨骼，返回其 matrix_basis 的旋转 (k, 3, 3)，并把姿态矩阵写回 solved
+
+    sampled 是动画给出的姿态矩阵，solved 中父骨骼已替换为模拟结果。
+    """
+    parents = solved[level.parent_rows]
+    # 目标姿态：骨骼自身的动画（相对父骨骼）叠加在模拟后的父骨骼上
+    animated_local = np.linalg.inv(sampled[level.parent_rows]) @ sampled[level.rows]
+    goal = parents @ animated_local
+    head = goal[:, :3, 3]
+    basis = normalized_rotations(goal)
+    goal_direction = basis[:, :, 1]
+    tail_length = np.linalg.norm(goal[:, :3, 1], axis=-1) * level.lengths
+    goal_tail = head + goal_direction * tail_length[:, None]
+
+    if state.get("current") is None:
+        state["current"] = state["previous"] = goal_tail
+    current, previous = state["current"], state["previous"]
+
+    # Verlet 积分：惯性 + 拉回目标尾端的弹簧 + 重力，然后约束到骨骼长度
+    tail = (
+        current
+        + (current - previous) * (1.0 - level.drag)[:, None]
+        + (goal_tail - current) * np.minimum(level.stiffness * dt, 1.0)[:, None]
+        + _GRAVITY_DIRECTION * (level.gravity * dt)[:, None]
+    )
+    direction = tail - head
+    norms = np.linalg.norm(direction, axis=-1, keepdims=True)
+    direction = np.where(
+        norms > 1e-9, direction / np.maximum(norms, 1e-9), goal_direction
+    )
+    state["previous"], state["current"] = (
+        current,
+        head + direction * tail_length[:, None],
+    )
+
+    # 世界空间的旋转换算到骨骼自身空间：basis^T @ R @ basis
+    local = (
+        basis.transpose(0, 2, 1) @ rotations_between(goal_direction, direction) @ basis
+    )
+    rotation = np.tile(np.eye(4), (len(local), 1, 1))
+    rotation[:, :3, :3] = local
+    solved[level.rows] = goal @ rotation
+
+    # 换算为 matrix_basis：(父骨骼姿态 @ 静止偏移)^-1 @ 姿态
+    matrix_basis = np.linalg.inv(parents @ level.rest_offsets) @ solved[level.rows]
+    return normalized_rotations(matrix_basis)
+
+
+def _rotation_property(pose_bone) -> str:
+    if pose_bone.rotation_mode == "QUATERNION":
+        return "rotation_quaternion"
+    if pose_bone.rotation_mode == "AXIS_ANGLE":
+        return "rotation_axis_angle"
+    return "rotation_euler"
+
+
+def _rotation_path(name: str, rotation_property: str) -> str:
+    return f'pose.bones["{bpy.utils.escape_identifier(name)}"].{rotation_property}'
+
+
+def spring_actions(armature):
+    """返回 (输入动作, 烘焙结果动作)
+
+    第一次烘焙时复制当前动作作为结果动作，原动作作为输入保留；当前动作已经是
+    烘焙结果时沿用它记录的输入动作。模拟总是以输入动作为目标姿态，重复烘焙
+    不会把上一次的结果当作骨骼自身的动画叠加上去。
+    """
+    animation_data = armature.animation_data or armature.animation_data_create()
+    action = animation_data.action
+    if action is not None:
+        source = action.get(SPRING_SOURCE_PROPERTY)
+        if source is not None:
+            return source, action
+    else:
+        action = bpy.data.actions.new(f"{armature.name}Action")
+
+    baked = action.copy()
+    baked.name = f"{action.name}_Spring"
+    baked[SPRING_SOURCE_PROPERTY] = action
+    return action, baked
+
+
+@contextmanager
+def _unanimated_at_rest(armature, source, names):
+    """输入动作中没有旋转动画的动态骨骼暂时以无旋转为目标姿态，退出时恢复
+
+    这些骨骼的旋转属性保留着上一次求值（例如上一次烘焙结果）的值，不能作为目标。
+    """
+    pose_bones = armature.pose.bones
+    saved = []
+    for name in names:
+        pose_bone = pose_bones[name]
+        rotation_property = _rotation_property(pose_bone)
+        path = _rotation_path(name, rotation_property)
+        if source.fcurves.find(path) is not None:
+            continue
+        saved.append(
+            (pose_bone, rotation_property, tuple(getattr(pose_bone, rotation_property)))
+        )
+        setattr(pose_bone, rotation_property, _IDENTITY_ROTATIONS[rotation_property])
+    try:
+        yield
+    finally:
+        for pose_bone, rotation_property, value in saved:
+            setattr(pose_bone, rotation_property, value)
+
+
+def _write_rotation_keys(armature, names, frames, rotations) -> int:
+    """按每根骨骼当前的旋转模式写入关键帧，只替换烘焙区间内的关键帧"""
+    keys = 0
+    pose_bones = armature.pose.bones
+    frame_range = (frames[0], frames[-1])
+    for column, name in enumerate(names):
+        rotation_property, values = rotation_channels(
+            pose_bones[name].rotation_mode, rotations[:, column]
+        )
+        data_path = _rotation_path(name, rotation_property)
+        for axis in range(values.shape[1]):
+            fcurve = get_or_create_fcurve(armature, data_path, index=axis, group=name)
+            keys += write_keyframes(
+                fcurve, frames, values[:, axis], INTERPOLATION_LINEAR, frame_range
+            )
+    return keys
+
+
+def bake_springs(armature, scene, frame_start: int, frame_end: int) -> SpringBakeResult:
+    """逐帧模拟所有 Sp_* 动态骨骼链，并把结果烘焙为旋转关键帧
+
+    每帧只读取一次所有姿态骨骼的矩阵，同一深度的骨骼用 NumPy 批量求解。
+    输入动作中动态骨骼自身的动画作为弹簧的目标姿态，结果按骨骼当前的旋转
+    模式写入单独的烘焙结果动作（见 spring_actions），只替换区间内的关键帧。
+    """
+    levels = spring_levels(armature)
+    if not levels:
+        return SpringBakeResult(bones=0, frames=0, keys=0, action=None)
+
+    bone_names = armature.data.bones.keys()
+    names = [bone_names[row] for level in levels for row in level.rows]
+    frames = np.arange(frame_start, frame_end + 1)
+    rotations = np.empty((len(frames), len(names), 3, 3))
+    states = [{} for _ in levels]
+    dt = scene.render.fps_base / scene.render.fps
+    pose_bones = armature.pose.bones
+    # 姿态骨骼的顺序不一定与数据骨骼相同，按数据骨骼的索引重新排列
+    pose_index = {name: i for i, name in enumerate(pose_bones.keys())}
+    pose_order = np.array([pose_index[name] for name in bone_names])
+
+    animation_data = armature.animation_data or armature.animation_data_create()
+    original_action = animation_data.action
+    source, baked = spring_actions(armature)
+    original_frame = scene.frame_current
+    with phase("模拟"):
+        animation_data.action = source
+        try:
+            with _unanimated_at_rest(armature, source, names):
+                for f, frame in enumerate(frames):
+                    scene.frame_set(int(frame))
+                    world = np.array(armature.matrix_world, dtype=np.float64)
+                    sampled = world @ read_matrices(pose_bones)[pose_order].astype(
+                        np.float64
+                    )
+                    solved = sampled.copy()
+
+                    column = 0
+                    for level, state in zip(levels, states):
+                        local = _step_level(level, sampled, solved, state, dt)
+                        rotations[f, column : column + len(local)] = local
+                        column += len(local)
+        finally:
+            animation_data.action = original_action
+        animation_data.action = baked
+
+    with phase("写入关键帧"):
+        keys = _write_rotation_keys(armature, names, frames, rotations)
+    scene.frame_set(original_frame)
+    return SpringBakeResult(
+        bones=len(names), frames=len(frames), keys=keys, action=baked
+    )
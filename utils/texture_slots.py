@@ -0,0 +1,69 @@
+import re
+from collections import namedtuple
+
+from ..config.node_groups import FACE_TEXTURE_SLOTS
+
+# 插入的位置节点组节点上记录贴图槽位的属性名
+SLOT_KEY = "uma_slot"
+
+# 关键字必须是名称中的独立片段：前后为开头/结尾或 _ - . 空格，
+# 例如 tex_chr1001_00_eye0_all 中的 eye0；eyebrow、eyehi00（高光）不会匹配
+_TOKEN_FORMAT = r"(?<![^_\-. ])(?:{})(?![^_\-. ])"
+
+TextureSlot = namedtuple(
+    "TextureSlot",
+    [
+        "slot",  # "EYELASH"、"EYE" 或 "MOUTH"
+        "group_name",  # 应插入的位置节点组名
+    ],
+)
+
+
+class TextureSlotIndex:
+    """把图像纹理节点映射到面部贴图槽的预编译索引
+
+    每个槽位的关键字（正则表达式）合并成一个不区分大小写、只匹配独立名称片段
+    的正则，按配置顺序依次匹配；
+    查询结果按名称缓存，同一张贴图在多个材质中只需匹配一次。
+    """
+
+    def __init__(self, slots):
+        self._slots = [
+            (
+                TextureSlot(slot, group_name),
+                re.compile(_TOKEN_FORMAT.format("|".join(keywords)), re.IGNORECASE),
+            )
+            for slot, group_name, keywords in slots
+        ]
+        self._cache: dict[str, TextureSlot | None] = {}
+
+    def lookup(self, name: str) -> TextureSlot | None:
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+        result = next(
+            (slot for slot, pattern in self._slots if pattern.search(name)), None
+        )
+        self._cache[name] = result
+        return result
+
+    def classify_node(self, node) -> TextureSlot | None:
+        """依次按图像名、图像文件名、节点标签和节点名识别图像纹理节点"""
+        image = node.image
+        names = [node.label, node.name]
+        if image is not None:
+            names[:0] = [
+                image.name,
+                image.filepath.replace("\\", "/").rsplit("/", 1)[-1],
+            ]
+        for name in names:
+            if name:
+                slot = self.lookup(name)
+                if slot is not None:
+                    return slot
+        return None
+
+
+# 导入时编译一次
+TEXTURE_SLOT_INDEX = TextureSlotIndex(FACE_TEXTURE_SLOTS)
@@ -0,0 +1,199 @@
+import math
+from collections import namedtuple
+
+import bpy
+import numpy as np
+
+from .keyframes import (
+    INTERPOLATION_LINEAR,
+    get_or_create_fcurve,
+    reduce_keyframes,
+    write_keyframes,
+)
+from .pose_math import (
+    normalized_rotations,
+    read_matrices,
+    rotation_channels,
+)
+from .profiling import phase
+
+VisualBakeResult = namedtuple(
+    "VisualBakeResult",
+    [
+        "bones",  # 烘焙的骨骼数量
+        "frames",  # 采样的帧数
+        "keys_before",  # 逐帧烘焙会产生的关键帧数量
+        "keys_after",  # 简化后写入的关键帧数量
+        "skipped",  # 继承方式不受支持而跳过的骨骼名
+    ],
+)
+
+
+def supports_basis_bake(bone) -> bool:
+    """sample_pose_basis 假设完全继承父骨骼的旋转和缩放并使用局部位置"""
+    return (
+        bone.inherit_scale == "FULL"
+        and bone.use_inherit_rotation
+        and bone.use_local_location
+    )
+
+
+def basis_offsets(armature, names):
+    """每根骨骼的 (父骨骼静止矩阵^-1 @ 骨骼静止矩阵)^-1 以及父骨骼索引
+
+    pose = parent_pose @ offset @ basis，因此 basis = offset^-1 @ parent_pose^-1 @ pose。
+    没有父骨骼时 parent_pose 取单位矩阵，父骨骼索引为 -1。
+    """
+    bones = armature.data.bones
+    pose_index = {name: i for i, name in enumerate(armature.pose.bones.keys())}
+    offsets = []
+    parents = []
+    for name in names:
+        bone = bones[name]
+        rest = np.array(bone.matrix_local, dtype=np.float64)
+        if bone.parent is None:
+            offsets.append(np.linalg.inv(rest))
+            parents.append(-1)
+        else:
+            parent_rest = np.array(bone.parent.matrix_local, dtype=np.float64)
+            offsets.append(np.linalg.inv(rest) @ parent_rest)
+            parents.append(pose_index[bone.parent.name])
+    return np.array(offsets), np.array(parents)
+
+
+def sample_pose_basis(armature, scene, names, frames) -> np.ndarray:
+    """逐帧读取所有姿态骨骼矩阵，换算为 names 中骨骼的 matrix_basis，形状 (帧, 骨骼, 4, 4)"""
+    pose_bones = armature.pose.bones
+    pose_index = {name: i for i, name in enumerate(pose_bones.keys())}
+    rows = np.array([pose_index[name] for name in names])
+    offsets, parents = basis_offsets(armature, names)
+    has_parent = parents >= 0
+
+    # 长动画的数据量较大，逐帧用 float64 计算、用 float32 保存
+    basis = np.empty((len(frames), len(names), 4, 4), dtype=np.float32)
+    original_frame = scene.frame_current
+    for f, frame in enumerate(frames):
+        scene.frame_set(int(frame))
+        pose = read_matrices(pose_bones).astype(np.float64)
+        local = pose[rows]
+        local[has_parent] = np.linalg.inv(pose[parents[has_parent]]) @ local[has_parent]
+        basis[f] = offsets @ local
+    scene.frame_set(original_frame)
+    return basis
+
+
+def _channels(armature, names, basis):
+    """把 matrix_basis 分解为 (数据路径, 索引, 骨骼名, 每帧的值) 列表"""
+    pose_bones = armature.pose.bones
+    frame_count = len(basis)
+    flat = basis.reshape(-1, 4, 4)
+    locations = flat[:, :3, 3].reshape(frame_count, len(names), 3)
+    scales = np.linalg.norm(flat[:, :3, :3], axis=-2).reshape(
+        frame_count, len(names), 3
+    )
+    rotations = normalized_rotations(flat).reshape(frame_count, len(names), 3, 3)
+
+    channels = []
+    for column, name in enumerate(names):
+        path = f'pose.bones["{bpy.utils.escape_identifier(name)}"]'
+        for axis in range(3):
+            channels.append(
+                (f"{path}.location", axis, name, locations[:, column, axis])
+            )
+
+        # 按骨骼当前的旋转模式烘焙，不改变旋转模式
+        rotation_property, rotation_values = rotation_channels(
+            pose_bones[name].rotation_mode, rotations[:, column]
+        )
+        for axis in range(rotation_values.shape[1]):
+            channels.append(
+                (
+                    f"{path}.{rotation_property}",
+                    axis,
+                    name,
+                    rotation_values[:, axis],
+                )
+            )
+
+        for axis in range(3):
+            channels.append((f"{path}.scale", axis, name, scales[:, column, axis]))
+    return channels
+
+
+def _channel_tolerance(data_path: str, location: float, rotation: float, scale: float):
+    if data_path.endswith(".location"):
+        return location
+    if data_path.endswith((".rotation_euler", ".rotation_axis_angle")):
+        return rotation
+    if data_path.endswith(".rotation_quaternion"):
+        # 四元数分量的误差约为旋转角误差的一半
+        return rotation / 2
+    return scale
+
+
+def visual_bake(
+    armature,
+    scene,
+    names,
+    frame_start: int,
+    frame_end: int,
+    location_tolerance: float = 1e-4,
+    rotation_tolerance: float = math.radians(0.1),
+    scale_tolerance: float = 1e-4,
+) -> VisualBakeResult:
+    """把骨骼的最终姿态（包括约束）烘焙为简化后的 LINEAR 关键帧
+
+    rotation_tolerance 以弧度为单位。写入的通道只替换区间内的原有关键帧，
+    旋转按骨骼当前的旋转模式写入。
+    不完全继承父骨骼变换的骨骼无法正确换算为 matrix_basis，会被跳过。
+    """
+    bones = armature.data.bones
+    skipped = [name for name in names if not supports_basis_bake(bones[name])]
+    names = [name for name in names if supports_basis_bake(bones[name])]
+    frames = np.arange(frame_start, frame_end + 1)
+    if not names:
+        return VisualBakeResult(
+            bones=0, frames=len(frames), keys_before=0, keys_after=0, skipped=skipped
+        )
+
+    with phase("采样"):
+        basis = sample_pose_basis(armature, scene, names, frames)
+
+    with phase("分解"):
+        channels = _channels(armature, names, basis)
+        values = np.array([channel[3] for channel in channels])
+        tolerance = np.array(
+            [
+                _channel_tolerance(
+                    channel[0], location_tolerance, rotation_tolerance, scale_tolerance
+                )
+                for channel in channels
+            ]
+        )
+
+    with phase("简化"):
+        keep = reduce_keyframes(values, tolerance)
+        # 区间之后可能还有原有关键帧，保留最后一帧使区间内的曲线不会插值到它们
+        keep[:, -1] = True
+
+    with phase("写入关键帧"):
+        keys = 0
+        for (data_path, index, name, channel_values), channel_keep in zip(
+            channels, keep
+        ):
+            fcurve = get_or_create_fcurve(armature, data_path, index=index, group=name)
+            keys += write_keyframes(
+                fcurve,
+                frames[channel_keep],
+                channel_values[channel_keep],
+                INTERPOLATION_LINEAR,
+                (frame_start, frame_end),
+            )
+
+    return VisualBakeResult(
+        bones=len(names),
+        frames=len(frames),
+        keys_before=values.size,
+        keys_after=keys,
+        skipped=skipped,
+    )